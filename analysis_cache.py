@@ -0,0 +1,139 @@
+"""
+Кэш анализа и подсчета игр по отпечатку содержимого
+
+Одна и та же игра часто считается повторно: ее вводит второй судья, она
+повторно импортируется из таблицы или заново выводится в отчет. Кэш хранит
+GameAnalysis и баллы мест (маска сработавших правил и итог) по отпечатку игры - имена, роли,
+моменты убийства и проверки Шерифа с нормализованным порядком мест.
+
+Кэш в памяти ограничен по размеру и вытесняет давно не использованные
+игры (LRU). Необязательный дисковый уровень (shelve) переживает перезапуск.
+"""
+import hashlib
+import json
+import shelve
+from collections import OrderedDict
+from dataclasses import replace
+from typing import List, Optional, Tuple, Union
+
+from models import Player, GameAnalysis, RatingResult
+from compact_game import CompactGame
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from scoring_rules import RuleSet, default_rules
+
+# Анализ и (маска правил, итог) по местам в нормализованном порядке
+CachedGame = Tuple[GameAnalysis, List[Tuple[int, int]]]
+
+# Формат записей кэша - входит в отпечаток, чтобы не читать старый дисковый кэш
+CACHE_FORMAT = 2
+
+
+def _seat_tuple(player) -> tuple:
+    killed_when = player.killed_when.strip().upper() or "0"
+    checks = sorted(name.strip() for name in player.checked_players)
+    return (player.name, player.role.value, killed_when, checks)
+
+
+class AnalysisCache:
+    """LRU-кэш результатов GameAnalyzer и RatingCalculator"""
+
+    def __init__(self, max_size: int = 10000, disk_path: Optional[str] = None, rules: Optional[RuleSet] = None):
+        self.max_size = max_size
+        self.rules = rules or default_rules()
+        self._memory: "OrderedDict[str, CachedGame]" = OrderedDict()
+        self._disk = shelve.open(disk_path) if disk_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def close(self):
+        """Закрыть дисковый уровень"""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def fingerprint(self, players: List[Player]) -> Tuple[str, List[int]]:
+        """
+        Отпечаток игры и порядок мест
+
+        Returns:
+            (отпечаток, номера мест в нормализованном порядке)
+        """
+        seats = [_seat_tuple(p) for p in players]
+        order = sorted(range(len(seats)), key=seats.__getitem__)
+        canonical = [CACHE_FORMAT, self.rules.digest, [seats[i] for i in order]]
+        payload = json.dumps(canonical, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest(), order
+
+    def score(self, players: Union[List[Player], CompactGame]) -> Tuple[GameAnalysis, List[RatingResult]]:
+        """Анализ и баллы игры - из кэша или с подсчетом"""
+        if isinstance(players, CompactGame):
+            players = players.seats()
+
+        key, order = self.fingerprint(players)
+        cached = self._get(key)
+
+        if cached is None:
+            self.misses += 1
+            analyzer = GameAnalyzer(players)
+            analysis = analyzer.analyze()
+            results = RatingCalculator(players, analysis, analyzer, self.rules).calculate_all()
+            self._put(key, (analysis, [(results[i].rule_mask, results[i].total_points) for i in order]))
+            return analysis, results
+
+        analysis, seats = cached
+        results: List[Optional[RatingResult]] = [None] * len(players)
+        for canonical_index, seat in enumerate(order):
+            mask, total = seats[canonical_index]
+            results[seat] = RatingResult(player=players[seat], rule_mask=mask, total_points=total, rules=self.rules)
+
+        # Участники угадайки - в порядке мест текущей игры
+        guessing = set(analysis.guessing_players)
+        analysis = replace(analysis, guessing_players=[p.name for p in players if p.name in guessing])
+        return analysis, results
+
+    def _get(self, key: str) -> Optional[CachedGame]:
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        if self._disk is not None:
+            cached = self._disk.get(key)
+            if cached is not None:
+                self.disk_hits += 1
+                self._remember(key, cached)
+                return cached
+        return None
+
+    def _put(self, key: str, value: CachedGame):
+        self._remember(key, value)
+        if self._disk is not None:
+            self._disk[key] = value
+
+    def _remember(self, key: str, value: CachedGame):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def stats(self) -> dict:
+        """Счетчики попаданий и промахов"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._memory),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
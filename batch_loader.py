@@ -0,0 +1,294 @@
+"""
+Пакетный импорт игр из архивов JSONL/CSV без интерактивного ввода
+
+Форматы:
+
+JSONL - одна игра на строку:
+    {"game": "2019-03-02/1", "players": [
+        {"name": "Иван", "role": "Мирный", "killed_when": "0"},
+        {"name": "Петр", "role": "Шериф", "killed_when": "2N", "checks": [2, 5, 7]},
+        ...
+    ]}
+
+CSV - один игрок на строку, строки одной игры идут подряд:
+    game,name,role,killed_when,checks
+    1,Иван,Мирный,0,
+    1,Петр,Шериф,2N,"2,5,7"
+
+Проверки Шерифа задаются номерами мест (1-10, как в интерактивном вводе)
+или именами игроков. Необязательное поле (колонка) winner - записанный
+победитель; его сверяет с исходом игры game_validator. Необязательное поле
+(колонка) date - день игры ГГГГ-ММ-ДД; с ним игра попадает в журнал сезона
+под своей датой, а не под днем импорта.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from models import Player, Role, GameAnalysis, RatingResult
+from input_handler import InputHandler
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+
+
+REQUIRED_PLAYERS = 10
+CSV_FIELDS = ("game", "name", "role", "killed_when", "checks", "winner", "date")
+
+
+class RowError(ValueError):
+    """Ошибка в строке архива (seat - номер места с ошибкой, с 1, если она в одном месте)"""
+
+    def __init__(self, message: str, seat: Optional[int] = None):
+        super().__init__(message)
+        self.seat = seat
+
+
+@dataclass
+class ImportIssue:
+    """Некорректная запись архива"""
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"строка {self.line}: {self.message}"
+
+
+@dataclass
+class ImportedGame:
+    """Игра, прочитанная из архива"""
+    line: int  # Номер строки, с которой начинается игра
+    game_id: str
+    players: List[Player] = field(default_factory=list)
+    winner: Optional[str] = None  # Победитель, если указан в архиве (поле/колонка winner)
+    game_date: Optional[date] = None  # День игры, если указан в архиве (поле/колонка date)
+
+
+class BatchLoader:
+    """
+    Потоковое чтение игр из архива
+
+    Игры читаются генератором по одной, поэтому память не зависит от размера
+    архива. Некорректные записи пропускаются и попадают в self.issues.
+    """
+
+    def __init__(self, source: TextIO, fmt: str = "jsonl", first_line: int = 1, strict: bool = True):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Неизвестный формат: {fmt}")
+        self.source = source
+        self.fmt = fmt
+        self.first_line = first_line  # Номер первой строки source в исходном файле
+        self.strict = strict          # False - не проверять состав (для game_validator)
+        self.issues: List[ImportIssue] = []
+        self.games_read = 0
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        """Определить формат по расширению файла"""
+        return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    def games(self) -> Iterator[ImportedGame]:
+        """Прочитать все корректные игры архива"""
+        reader = self._read_jsonl() if self.fmt == "jsonl" else self._read_csv()
+        for game in reader:
+            self.games_read += 1
+            yield game
+
+    def _report(self, line: int, message: str):
+        self.issues.append(ImportIssue(line, message))
+
+    def _read_jsonl(self) -> Iterator[ImportedGame]:
+        for line_num, line in enumerate(self.source, self.first_line):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                players = parse_game_record(record, self.strict)
+                game_date = parse_game_date(record.get("date"))
+            except json.JSONDecodeError as e:
+                self._report(line_num, f"некорректный JSON ({e.msg})")
+                continue
+            except RowError as e:
+                self._report(line_num, str(e))
+                continue
+            winner = record.get("winner")
+            yield ImportedGame(line_num, str(record.get("game", line_num)), players,
+                               None if winner is None else str(winner), game_date)
+
+    def _read_csv(self) -> Iterator[ImportedGame]:
+        reader = csv.reader(self.source)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [h.strip().lower() for h in header]
+        missing = [name for name in CSV_FIELDS[:4] if name not in columns]
+        if missing:
+            self._report(reader.line_num + self.first_line - 1, f"нет колонок: {', '.join(missing)}")
+            return
+        index = {name: columns.index(name) for name in CSV_FIELDS if name in columns}
+
+        current_id: Optional[str] = None
+        start_line = 0
+        seats: List[tuple] = []
+        seat_lines: List[int] = []  # Строка файла каждого места игры
+        winner: Optional[str] = None
+        game_date: Optional[str] = None
+
+        def flush() -> Optional[ImportedGame]:
+            if current_id is None:
+                return None
+            try:
+                return ImportedGame(start_line, current_id, build_players(seats, self.strict), winner,
+                                    parse_game_date(game_date))
+            except RowError as e:
+                # Ошибка места - на его строке, ошибка состава - на первой строке игры
+                line = seat_lines[e.seat - 1] if e.seat else start_line
+                self._report(line, f"игра {current_id}: {e}")
+                return None
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            line_num = reader.line_num + self.first_line - 1
+            if len(row) < len(columns):
+                row = row + [""] * (len(columns) - len(row))
+            game_id = row[index["game"]].strip()
+
+            if game_id != current_id:
+                game = flush()
+                if game:
+                    yield game
+                current_id, start_line, seats, seat_lines = game_id, line_num, [], []
+                winner = game_date = None
+
+            checks = row[index["checks"]] if "checks" in index else ""
+            checks = [c.strip() for c in checks.replace(";", ",").split(",") if c.strip()]
+            seats.append((row[index["name"]], row[index["role"]], row[index["killed_when"]], checks))
+            seat_lines.append(line_num)
+            if "winner" in index and row[index["winner"]].strip():
+                winner = row[index["winner"]].strip()
+            if "date" in index and row[index["date"]].strip():
+                game_date = row[index["date"]].strip()
+
+        game = flush()
+        if game:
+            yield game
+
+
+def parse_game_record(record, strict: bool = True) -> List[Player]:
+    """
+    Собрать состав игры из записи JSON: {"players": [{name, role, killed_when, checks}]}
+
+    strict=False - без проверки состава, см. build_players
+
+    Raises:
+        RowError: если запись некорректна
+    """
+    if not isinstance(record, dict) or not isinstance(record.get("players"), list):
+        raise RowError("ожидается объект с полем players")
+    seats = []
+    for seat in record["players"]:
+        if not isinstance(seat, dict):
+            raise RowError("игрок должен быть объектом")
+        seats.append((seat.get("name"), seat.get("role"),
+                      seat.get("killed_when", "0"), seat.get("checks", [])))
+    return build_players(seats, strict)
+
+
+def parse_game_date(value) -> Optional[date]:
+    """
+    День игры из поля date (ГГГГ-ММ-ДД); None - дата не указана
+
+    Raises:
+        RowError: если дата некорректна
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise RowError(f"некорректная дата {value!r} (ожидается ГГГГ-ММ-ДД)") from None
+
+
+def build_players(seats: Iterable[tuple], strict: bool = True) -> List[Player]:
+    """
+    Собрать состав игры из сырых значений (имя, роль, когда убит, проверки)
+
+    strict=False - не проверять число игроков, Шерифов и Донов, а номера
+    проверок вне стола оставлять как есть (их находит game_validator)
+
+    Raises:
+        RowError: если состав некорректен
+    """
+    players = []
+    raw_checks = []
+    for seat_num, (name, role, killed_when, checks) in enumerate(seats, 1):
+        name = str(name or "").strip()
+        if not name:
+            raise RowError(f"игрок {seat_num}: пустое имя", seat_num)
+
+        role_key = str(role or "").strip().lower()
+        if role_key not in InputHandler.ROLE_MAP:
+            raise RowError(f"игрок {seat_num}: неизвестная роль '{role}'", seat_num)
+
+        killed = InputHandler.parse_killed_when(str(killed_when or "0"))
+        if killed is None:
+            raise RowError(f"игрок {seat_num}: неверный формат убийства '{killed_when}'", seat_num)
+
+        if not isinstance(checks, list):
+            raise RowError(f"игрок {seat_num}: проверки должны быть списком", seat_num)
+
+        players.append(Player(name=name, role=InputHandler.ROLE_MAP[role_key], killed_when=killed))
+        raw_checks.append(checks)
+
+    if strict:
+        if len(players) != REQUIRED_PLAYERS:
+            raise RowError(f"ожидается {REQUIRED_PLAYERS} игроков, указано {len(players)}")
+
+        sheriffs = sum(1 for p in players if p.role == Role.SHERIFF)
+        dons = sum(1 for p in players if p.role == Role.DON)
+        if sheriffs != 1:
+            raise RowError(f"Шерифов должно быть 1, а указано {sheriffs}")
+        if dons != 1:
+            raise RowError(f"Донов должно быть 1, а указано {dons}")
+
+    # Проверки: номера мест конвертируем в имена, как в интерактивном вводе
+    for seat_num, (player, checks) in enumerate(zip(players, raw_checks), 1):
+        for check in checks:
+            check = str(check).strip()
+            if check.isdigit():
+                num = int(check)
+                if 1 <= num <= len(players):
+                    player.checked_players.append(players[num - 1].name)
+                elif strict:
+                    raise RowError(f"проверка {num} вне диапазона (1-{len(players)})", seat_num)
+                else:
+                    player.checked_players.append(check)
+            elif check:
+                player.checked_players.append(check)
+
+    return players
+
+
+def score_game(players: List[Player], cache=None) -> Tuple[GameAnalysis, List[RatingResult]]:
+    """Проанализировать игру и рассчитать рейтинг без вывода на экран"""
+    if cache is not None:
+        return cache.score(players)
+    analyzer = GameAnalyzer(players)
+    analysis = analyzer.analyze()
+    results = RatingCalculator(players, analysis, analyzer).calculate_all()
+    return analysis, results
+
+
+def score_games(games: Iterable[ImportedGame], cache=None
+                ) -> Iterator[Tuple[ImportedGame, GameAnalysis, List[RatingResult]]]:
+    """
+    Потоково рассчитать рейтинг для всех игр архива
+
+    cache - AnalysisCache: повторяющиеся игры берутся из кэша без пересчета
+    """
+    for game in games:
+        analysis, results = score_game(game.players, cache)
+        yield game, analysis, results
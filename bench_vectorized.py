@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: векторизованный подсчет против RatingCalculator
+
+По умолчанию векторизованный движок считает 10^6 игр, а обычный калькулятор -
+выборку из первых игр (время на весь архив экстраполируется). Баллы на
+выборке сверяются место в место.
+"""
+import argparse
+import time
+
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from vectorized_engine import random_columns, score_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1_000_000, help="число игр")
+    parser.add_argument("--scalar-sample", type=int, default=20_000,
+                        help="сколько игр считать обычным калькулятором (0 - все)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    columns = random_columns(args.games, args.seed)
+
+    start = time.perf_counter()
+    scores = score_columns(columns)
+    vector_time = time.perf_counter() - start
+
+    sample = args.scalar_sample or args.games
+    sample = min(sample, args.games)
+    games = [columns.to_players(g) for g in range(sample)]
+
+    start = time.perf_counter()
+    mismatches = 0
+    for g, players in enumerate(games):
+        analyzer = GameAnalyzer(players)
+        analysis = analyzer.analyze()
+        results = RatingCalculator(players, analysis, analyzer).calculate_all()
+        if [r.total_points for r in results] != scores.points[g].tolist():
+            mismatches += 1
+    scalar_time = time.perf_counter() - start
+    scalar_total = scalar_time * args.games / sample
+
+    print(f"Игр: {args.games:,}")
+    print(f"Векторизованный движок: {vector_time:.3f} с ({args.games / vector_time:,.0f} игр/с)")
+    print(f"RatingCalculator: {scalar_time:.3f} с на {sample:,} игр, "
+          f"~{scalar_total:.1f} с на весь архив ({sample / scalar_time:,.0f} игр/с)")
+    print(f"Ускорение: x{scalar_total / vector_time:.0f}")
+    print(f"Расхождений в баллах: {mismatches} из {sample:,}")
+
+
+if __name__ == "__main__":
+    main()
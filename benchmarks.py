@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки конвейера подсчета рейтинга
+
+Для каждого размера архива (по умолчанию 10^3, 10^4, 10^5 игр, можно до
+10^7) игры генерируются пачками GameGenerator и проходят этапы:
+
+    generate  - генерация игры
+    analyze   - GameAnalyzer.analyze
+    calculate - RatingCalculator.calculate_all
+    session   - SessionManager.add_game_results
+    format    - OutputFormatter.print_results (в буфер)
+    final     - SessionOutputFormatter.format_final_rating (в буфер, один раз)
+
+Для каждого этапа считаются пропускная способность, перцентили задержки
+одного вызова и пиковая память (tracemalloc, на отдельном проходе по
+первым --memory-games играм). Результаты пишутся в JSON, чтобы сравнивать
+коммиты: python3 benchmarks.py --compare old.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Dict, List, Optional
+
+from game_generator import GameGenerator
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from output_formatter import OutputFormatter
+from session_manager import SessionManager
+from session_output import SessionOutputFormatter
+
+
+STAGES = ("generate", "analyze", "calculate", "session", "format", "final")
+BATCH_SIZE = 10_000
+
+
+class StageTimer:
+    """Накопитель длительностей вызовов одного этапа (в наносекундах)"""
+
+    def __init__(self):
+        self.samples = array("q")
+        self.peak_bytes = 0
+
+    def add(self, duration_ns: int):
+        self.samples.append(duration_ns)
+
+    def summary(self) -> Dict[str, float]:
+        samples = sorted(self.samples)
+        total_ns = sum(samples)
+        count = len(samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(count - 1, int(p / 100 * count))] / 1000
+
+        return {
+            "calls": count,
+            "total_s": total_ns / 1e9,
+            "throughput_per_s": count / (total_ns / 1e9) if total_ns else 0.0,
+            "p50_us": percentile(50),
+            "p90_us": percentile(90),
+            "p99_us": percentile(99),
+            "max_us": samples[-1] / 1000 if samples else 0.0,
+            "peak_kib": self.peak_bytes / 1024,
+        }
+
+
+def _run(games: int, seed: int, timers: Optional[Dict[str, StageTimer]], track_memory: bool) -> Dict[str, int]:
+    """
+    Прогнать games игр через все этапы
+
+    Returns:
+        пиковая память по этапам (если track_memory)
+    """
+    clock = time.perf_counter_ns
+    generator = GameGenerator(seed)
+    session = SessionManager(games)
+    formatter = OutputFormatter()
+    peaks = {stage: 0 for stage in STAGES}
+    sink = io.StringIO()
+
+    def measure(stage: str, fn, *args):
+        if track_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = clock()
+        value = fn(*args)
+        if timers is not None:
+            timers[stage].add(clock() - start)
+        if track_memory:
+            peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - base)
+        return value
+
+    def analyze(players):
+        analyzer = GameAnalyzer(players)
+        return analyzer, analyzer.analyze()
+
+    def calculate(players, analyzer, analysis):
+        return RatingCalculator(players, analysis, analyzer).calculate_all()
+
+    remaining = games
+    with contextlib.redirect_stdout(sink):
+        while remaining:
+            batch = min(remaining, BATCH_SIZE)
+            remaining -= batch
+            for _ in range(batch):
+                players = measure("generate", generator.generate)
+                analyzer, analysis = measure("analyze", analyze, players)
+                results = measure("calculate", calculate, players, analyzer, analysis)
+                measure("session", session.add_game_results, results, analysis)
+                measure("format", formatter.print_results, results, analysis)
+            sink.seek(0)
+            sink.truncate()
+        measure("final", SessionOutputFormatter().format_final_rating, session)
+
+    return peaks
+
+
+def benchmark(games: int, seed: int, memory_games: int) -> List[dict]:
+    """Замерить все этапы на архиве из games игр"""
+    timers = {stage: StageTimer() for stage in STAGES}
+    _run(games, seed, timers, track_memory=False)
+
+    if memory_games:
+        tracemalloc.start()
+        try:
+            peaks = _run(min(games, memory_games), seed, None, track_memory=True)
+        finally:
+            tracemalloc.stop()
+        for stage, peak in peaks.items():
+            timers[stage].peak_bytes = peak
+
+    return [{"games": games, "stage": stage, **timers[stage].summary()} for stage in STAGES]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(rows: List[dict], baseline: Optional[Dict[tuple, dict]] = None):
+    """Вывести результаты таблицей (и отношение к прошлому прогону)"""
+    header = f"{'Игр':>10} {'Этап':<10} {'Вызовов/с':>12} {'p50 мкс':>9} {'p99 мкс':>9} {'Пик КиБ':>9}"
+    if baseline:
+        header += f" {'Было/с':>12} {'Изм.':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        line = (f"{row['games']:>10,} {row['stage']:<10} {row['throughput_per_s']:>12,.0f} "
+                f"{row['p50_us']:>9.1f} {row['p99_us']:>9.1f} {row['peak_kib']:>9.1f}")
+        old = baseline.get((row["games"], row["stage"])) if baseline else None
+        if old:
+            change = row["throughput_per_s"] / old["throughput_per_s"] - 1 if old["throughput_per_s"] else 0.0
+            line += f" {old['throughput_per_s']:>12,.0f} {change:>+7.1%}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки конвейера подсчета рейтинга")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="размеры архива (игр)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory-games", type=int, default=10_000,
+                        help="сколько игр прогнать под tracemalloc (0 - не мерить память)")
+    parser.add_argument("--output", default="bench_results.json", help="файл результатов (JSON)")
+    parser.add_argument("--compare", metavar="FILE", help="сравнить с результатами прошлого прогона")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in args.sizes:
+        rows.extend(benchmark(size, args.seed, args.memory_games))
+
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": rows,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {(r["games"], r["stage"]): r for r in json.load(f)["results"]}
+
+    print_table(rows, baseline)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
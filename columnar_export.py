@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Колоночная выгрузка игр и результатов в Parquet или Arrow IPC
+
+Для ноутбуков аналитиков: вместо разбора вывода OutputFormatter - файл,
+который читается pandas/polars/DuckDB напрямую. Одна строка - одно
+занятое место:
+
+    game i64, seat u8, player (словарь имен), role (словарь ролей),
+    kill_day i16, kill_phase i8 (PHASE_*), checked i8 (сколько раз место
+    проверил Шериф), mafia_won, clean_win, dry_win, guessing_game (флаги
+    GameAnalysis игры), won, guessing (флаги места), points i16,
+    rule_mask u32 (биты сработавших правил, как RatingResult.rule_mask)
+
+id правил по номерам битов и версия правил лежат в метаданных схемы.
+Игры пишутся блоками (блок - группа строк Parquet или батч Arrow) и
+считаются векторизованным движком, поэтому память ограничена размером
+блока. Имена - словарь: в Arrow IPC общий для файла (новые имена
+дописываются дельтами словаря), в Parquet у каждой группы строк свой -
+только из игроков этой группы, иначе каждая группа хранила бы все имена.
+
+ColumnarReader читает файл обратно блоками колонок (для StatsCube,
+WhatIfIndex) или играми (для SessionManager и main.py --import).
+
+Нужен pyarrow (необязательная зависимость): pip install pyarrow
+
+    python3 columnar_export.py games.mga season.parquet
+    python3 columnar_export.py games.jsonl season.arrow --chunk 100000
+"""
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Нужен только для этого модуля
+    pa = pq = None
+
+from batch_loader import ImportedGame
+from models import Player, Role, ROLE_CODES, ROLES_BY_CODE, NO_ROLE
+from scoring_rules import RuleSet, default_rules
+from vectorized_engine import SEATS, MAFIA, DON, GameColumns, score_columns
+
+DEFAULT_CHUNK = 65536  # Игр в одном блоке
+FORMATS = ("parquet", "arrow")
+_ROLE_NAMES = [ROLES_BY_CODE[code].value for code in range(len(ROLE_CODES))]
+
+
+def _require_arrow():
+    if pa is None:
+        raise ImportError("для выгрузки в Parquet/Arrow нужен pyarrow: pip install pyarrow")
+
+
+def detect_format(path: str) -> str:
+    """Формат по расширению: .arrow/.feather/.ipc - Arrow IPC, иначе Parquet"""
+    return "arrow" if path.lower().endswith((".arrow", ".feather", ".ipc")) else "parquet"
+
+
+def is_columnar(path: str) -> bool:
+    """Файл выгрузки по расширению (те же, что у main.detect_import_format)"""
+    return path.lower().endswith((".parquet", ".arrow", ".feather", ".ipc"))
+
+
+def export_schema(rules: RuleSet) -> "pa.Schema":
+    """Схема выгрузки для набора правил"""
+    _require_arrow()
+    metadata = {
+        "rules_version": rules.version,
+        "rule_ids": json.dumps([rule.rule_id for rule in rules.rules]),
+    }
+    return pa.schema([
+        ("game", pa.int64()),
+        ("seat", pa.uint8()),
+        ("player", pa.dictionary(pa.int32(), pa.string())),
+        ("role", pa.dictionary(pa.int8(), pa.string())),
+        ("kill_day", pa.int16()),
+        ("kill_phase", pa.int8()),
+        ("checked", pa.int8()),
+        ("mafia_won", pa.bool_()),
+        ("clean_win", pa.bool_()),
+        ("dry_win", pa.bool_()),
+        ("guessing_game", pa.bool_()),
+        ("won", pa.bool_()),
+        ("guessing", pa.bool_()),
+        ("points", pa.int16()),
+        ("rule_mask", pa.uint32() if len(rules.rules) <= 32 else pa.uint64()),
+    ], metadata=metadata)
+
+
+class ColumnarWriter:
+    """Потоковая запись игр в Parquet или Arrow IPC"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None, rules: Optional[RuleSet] = None):
+        _require_arrow()
+        self.path = path
+        self.format = fmt or detect_format(path)
+        if self.format not in FORMATS:
+            raise ValueError(f"Неизвестный формат выгрузки: {self.format}")
+        self.rules = rules or default_rules()
+        self.schema = export_schema(self.rules)
+        self.games_written = 0
+        self.rows_written = 0
+        # Словарь имен файла: растет по мере появления игроков, номера не меняются
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._roles = pa.array(_ROLE_NAMES, pa.string())
+
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema)
+            self._sink = None
+        else:
+            # Батчи добавляют новые имена в конец словаря - это дельты словаря
+            self._sink = pa.OSFile(path, "wb")
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(self._sink, self.schema, options=options)
+
+    def _intern(self, name: str) -> int:
+        player_id = self._ids.get(name)
+        if player_id is None:
+            player_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return player_id
+
+    def write_columns(self, columns: GameColumns, player_ids: np.ndarray, names: Sequence[str]):
+        """
+        Записать блок игр в колоночном виде
+
+        Args:
+            player_ids: int (n, seats) - номер игрока места в names
+        """
+        if len(columns) == 0:
+            return
+        present = columns.role != NO_ROLE
+        game, seat = np.nonzero(present)  # Строки по порядку игр и мест
+
+        # Номера имен блока -> номера словаря файла
+        unique, local = np.unique(player_ids[present], return_inverse=True)
+        remap = np.array([self._intern(names[int(i)]) for i in unique], dtype=np.int32)
+        if self.format == "parquet":
+            # Словарь группы строк - только имена блока
+            block_names = pa.array([self.names[i] for i in remap.tolist()], pa.string())
+            players = pa.DictionaryArray.from_arrays(pa.array(local.astype(np.int32)), block_names)
+        else:
+            players = pa.DictionaryArray.from_arrays(pa.array(remap[local]), pa.array(self.names, pa.string()))
+
+        scores = score_columns(columns, self.rules)
+        role = columns.role[present]
+        mafia_won = scores.mafia_won[game]
+        batch = pa.RecordBatch.from_arrays([
+            pa.array(self.games_written + game, pa.int64()),
+            pa.array(seat.astype(np.uint8)),
+            players,
+            pa.DictionaryArray.from_arrays(pa.array(role.astype(np.int8)), self._roles),
+            pa.array(columns.kill_day[present].astype(np.int16)),
+            pa.array(columns.kill_phase[present].astype(np.int8)),
+            pa.array(columns.checks[present].astype(np.int8)),
+            pa.array(mafia_won),
+            pa.array(scores.clean_civilian_win[game]),
+            pa.array(scores.dry_mafia_win[game]),
+            pa.array(scores.is_guessing[game]),
+            pa.array(((role == MAFIA) | (role == DON)) == mafia_won),
+            pa.array(scores.guessing_seats[present]),
+            pa.array(scores.points[present]),
+            pa.array(scores.rule_mask[present]),
+        ], schema=self.schema)
+
+        if self.format == "parquet":
+            self._writer.write_table(pa.Table.from_batches([batch]), row_group_size=batch.num_rows)
+        else:
+            self._writer.write_batch(batch)
+        self.games_written += len(columns)
+        self.rows_written += batch.num_rows
+
+    def write_games(self, games: Iterable[List[Player]], chunk: int = DEFAULT_CHUNK):
+        """Записать игры (списки игроков) блоками по chunk"""
+        block: List[List[Player]] = []
+        for players in games:
+            block.append(players)
+            if len(block) == chunk:
+                self._write_block(block)
+                block = []
+        if block:
+            self._write_block(block)
+
+    def _write_block(self, games: List[List[Player]]):
+        columns = GameColumns.from_games(games)
+        player_ids = np.zeros(columns.role.shape, dtype=np.int64)
+        for g, players in enumerate(games):
+            for seat, p in enumerate(players):
+                player_ids[g, seat] = self._intern(p.name)
+        self.write_columns(columns, player_ids, self.names)
+
+    def write_archive(self, archive, chunk: int = DEFAULT_CHUNK):
+        """Записать бинарный архив (GameArchive) блоками - без разбора игр по одной"""
+        for start, columns in archive.chunks(chunk):
+            self.write_columns(columns, archive.player_ids(start, start + len(columns)), archive.names)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class ColumnarBlock:
+    """Блок игр, прочитанный из выгрузки"""
+    start: int                # Номер первой игры блока
+    columns: GameColumns
+    player_ids: np.ndarray    # int (n, seats): номер игрока в ColumnarReader.names, -1 - пустое место
+    points: np.ndarray        # int16 (n, seats): баллы из выгрузки
+    rule_mask: np.ndarray     # (n, seats): маски правил из выгрузки
+
+
+class ColumnarReader:
+    """Чтение выгрузки обратно - блоками колонок или играми"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        _require_arrow()
+        self.path = path
+        self.format = fmt or detect_format(path)
+        if self.format == "parquet":
+            self._file = pq.ParquetFile(path)
+            schema = self._file.schema_arrow
+        else:
+            self._file = pa.ipc.open_file(pa.memory_map(path, "r"))
+            schema = self._file.schema
+        metadata = schema.metadata or {}
+        self.rules_version = metadata.get(b"rules_version", b"").decode("utf-8")
+        self.rule_ids = json.loads(metadata.get(b"rule_ids", b"[]"))
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def batches(self) -> Iterator["pa.RecordBatch"]:
+        """Записанные блоки как RecordBatch"""
+        if self.format == "parquet":
+            for i in range(self._file.num_row_groups):
+                yield from self._file.read_row_group(i).to_batches()
+        else:
+            for i in range(self._file.num_record_batches):
+                yield self._file.get_batch(i)
+
+    def _dictionary_ids(self, column) -> np.ndarray:
+        """Номера имен столбца player в общем списке names читателя"""
+        remap = np.empty(len(column.dictionary), dtype=np.int64)
+        for i, name in enumerate(column.dictionary.to_pylist()):
+            player_id = self._ids.get(name)
+            if player_id is None:
+                player_id = self._ids[name] = len(self.names)
+                self.names.append(name)
+            remap[i] = player_id
+        return remap[column.indices.to_numpy(zero_copy_only=False)]
+
+    def blocks(self) -> Iterator[ColumnarBlock]:
+        """Блоки игр в колоночном виде"""
+        role_codes = {role.value: ROLE_CODES[role] for role in Role}
+        for batch in self.batches():
+            if batch.num_rows == 0:
+                continue
+            game_numbers = batch.column("game").to_numpy()
+            start = int(game_numbers.min())
+            game = game_numbers - start
+            seat = batch.column("seat").to_numpy().astype(np.int64)
+            n_games = int(game.max()) + 1
+
+            columns = GameColumns.empty(n_games)
+            role = batch.column("role")
+            codes = np.array([role_codes[value] for value in role.dictionary.to_pylist()], dtype=np.int8)
+            columns.role[game, seat] = codes[role.indices.to_numpy(zero_copy_only=False)]
+            columns.kill_day[game, seat] = batch.column("kill_day").to_numpy()
+            columns.kill_phase[game, seat] = batch.column("kill_phase").to_numpy()
+            columns.checks[game, seat] = batch.column("checked").to_numpy()
+
+            player_ids = np.full(columns.role.shape, -1, dtype=np.int64)
+            player_ids[game, seat] = self._dictionary_ids(batch.column("player"))
+            points = np.zeros(columns.role.shape, dtype=np.int16)
+            points[game, seat] = batch.column("points").to_numpy()
+            rule_mask_column = batch.column("rule_mask").to_numpy()
+            rule_mask = np.zeros(columns.role.shape, dtype=rule_mask_column.dtype)
+            rule_mask[game, seat] = rule_mask_column
+            yield ColumnarBlock(start, columns, player_ids, points, rule_mask)
+
+    def games(self) -> Iterator[List[Player]]:
+        """Игры списками игроков - для RatingCalculator и SessionManager"""
+        for block in self.blocks():
+            names = self.names
+            for g in range(len(block.columns)):
+                seat_names = [names[i] if i >= 0 else "" for i in block.player_ids[g].tolist()]
+                yield block.columns.to_players(g, seat_names)
+
+    def imported_games(self) -> Iterator[ImportedGame]:
+        """Игры как из BatchLoader - для импорта в main.py"""
+        for index, players in enumerate(self.games()):
+            yield ImportedGame(line=index + 1, game_id=str(index + 1), players=players)
+
+
+def export_file(source: str, target: str, fmt: Optional[str] = None, rules: Optional[RuleSet] = None,
+                chunk: int = DEFAULT_CHUNK) -> ColumnarWriter:
+    """Выгрузить архив (JSONL, CSV или бинарный) в Parquet/Arrow"""
+    from batch_loader import BatchLoader
+    from game_archive import GameArchive, is_archive
+
+    with ColumnarWriter(target, fmt, rules) as writer:
+        if is_archive(source):
+            with GameArchive(source) as archive:
+                writer.write_archive(archive, chunk)
+        else:
+            with open(source, encoding="utf-8", newline="") as f:
+                loader = BatchLoader(f, BatchLoader.detect_format(source))
+                writer.write_games((game.players for game in loader.games()), chunk)
+    return writer
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Выгрузка игр и результатов в Parquet или Arrow IPC")
+    parser.add_argument("source", help="архив игр (JSONL, CSV или бинарный архив)")
+    parser.add_argument("target", help="файл выгрузки (.parquet или .arrow)")
+    parser.add_argument("--format", choices=FORMATS, help="формат (по умолчанию - по расширению)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="игр в одной группе строк")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    writer = export_file(args.source, args.target, args.format, chunk=args.chunk)
+    elapsed = time.perf_counter() - started
+    print(f"Выгружено игр: {writer.games_written}, мест: {writer.rows_written}, "
+          f"игроков: {len(writer.names)} за {elapsed:.2f} с -> {args.target}")
+
+
+if __name__ == "__main__":
+    main()
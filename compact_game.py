@@ -0,0 +1,184 @@
+"""
+Компактное представление игры
+
+Момент убийства разбирается один раз при создании записи: день хранится
+числом, фаза - кодом PHASE_*, роль - кодом ROLE_CODES. Вся игра упакована
+в один объект bytes:
+
+    [n] [роли × n] [фазы × n] [дни × n, по 2 байта LE] [id имен × n, по 2 байта LE] [проверки Шерифа]
+
+День убийства хранится как записан, до MAX_KILL_DAY; игра с большим днем
+не упаковывается (ValueError).
+
+Имена хранятся один раз в общем реестре игроков, игра ссылается на них номерами.
+GameAnalyzer и RatingCalculator принимают CompactGame напрямую - вместо
+Player они работают с легкими представлениями мест (Seat).
+"""
+from typing import Iterator, List, Sequence
+
+from models import (
+    Player, Role, Team, ROLE_CODES, ROLES_BY_CODE,
+    PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT,
+)
+from player_registry import registry
+
+_MAFIA_CODES = (ROLE_CODES[Role.MAFIA], ROLE_CODES[Role.DON])
+_SHERIFF_CODE = ROLE_CODES[Role.SHERIFF]
+_PHASE_LETTERS = {PHASE_DAY: "D", PHASE_NIGHT: "N"}
+MAX_KILL_DAY = 0xFFFF  # Наибольший хранимый день убийства
+
+
+class CompactGame:
+    """Игра в компактном виде: коды ролей, дни и фазы убийств по местам"""
+    __slots__ = ("data",)
+
+    name_table = registry  # Общий реестр игроков: номера имен
+
+    def __init__(self, names: Sequence[str], roles: bytes, days: Sequence[int], phases: bytes, checks: bytes = b""):
+        n = len(names)
+        if not (len(roles) == len(days) == len(phases) == n):
+            raise ValueError("Колонки игры должны быть одной длины")
+        day_bytes = bytearray()
+        for day in days:
+            if not 0 <= day <= MAX_KILL_DAY:
+                raise ValueError(f"День убийства {day} вне диапазона 0..{MAX_KILL_DAY}")
+            day_bytes += day.to_bytes(2, "little")
+        name_ids = bytearray()
+        for name in names:
+            name_id = self.name_table.intern(name)
+            if name_id > 0xFFFF:
+                raise ValueError("Слишком много разных имен для CompactGame")
+            name_ids += name_id.to_bytes(2, "little")
+        self.data = bytes([n]) + bytes(roles) + bytes(phases) + bytes(day_bytes) + bytes(name_ids) + bytes(checks)
+
+    @classmethod
+    def from_players(cls, players: List[Player]) -> "CompactGame":
+        """Упаковать список игроков"""
+        seat_by_name = {p.name: i for i, p in enumerate(players)}
+        checks = bytearray()
+        for p in players:
+            if p.role == Role.SHERIFF:
+                for checked_name in p.checked_players:
+                    seat = seat_by_name.get(checked_name.strip())
+                    if seat is not None:
+                        checks.append(seat)
+
+        return cls(
+            names=[p.name for p in players],
+            roles=bytes(ROLE_CODES[p.role] for p in players),
+            days=[p.get_kill_day() for p in players],
+            phases=bytes(p.get_kill_phase() for p in players),
+            checks=bytes(checks),
+        )
+
+    def to_players(self) -> List[Player]:
+        """Распаковать в список Player"""
+        return [Player(s.name, s.role, s.killed_when, s.checked_players) for s in self.seats()]
+
+    def __len__(self) -> int:
+        return self.data[0]
+
+    @property
+    def roles(self) -> bytes:
+        n = self.data[0]
+        return self.data[1:1 + n]
+
+    @property
+    def days(self) -> List[int]:
+        data = self.data
+        offset = 1 + 2 * data[0]
+        return [data[i] | (data[i + 1] << 8) for i in range(offset, offset + 2 * data[0], 2)]
+
+    @property
+    def phases(self) -> bytes:
+        n = self.data[0]
+        return self.data[1 + n:1 + 2 * n]
+
+    @property
+    def names(self) -> List[str]:
+        data = self.data
+        offset = 1 + 4 * data[0]
+        table = self.name_table.names
+        return [table[data[i] | (data[i + 1] << 8)] for i in range(offset, offset + 2 * data[0], 2)]
+
+    @property
+    def checks(self) -> bytes:
+        """Номера мест (с 0), проверенных Шерифом"""
+        return self.data[1 + 6 * self.data[0]:]
+
+    def seats(self) -> List["Seat"]:
+        """Представления мест для анализатора и калькулятора"""
+        return [Seat(self, i) for i in range(self.data[0])]
+
+    def __iter__(self) -> Iterator["Seat"]:
+        return iter(self.seats())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactGame):
+            return NotImplemented
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __repr__(self) -> str:
+        return f"CompactGame({', '.join(f'{s.name}:{s.role.value}:{s.killed_when}' for s in self)})"
+
+
+class Seat:
+    """Место в CompactGame с тем же интерфейсом, что у Player"""
+    __slots__ = ("game", "index", "_n")
+
+    def __init__(self, game: CompactGame, index: int):
+        self.game = game
+        self.index = index
+        self._n = game.data[0]
+
+    @property
+    def name(self) -> str:
+        offset = 1 + 4 * self._n + 2 * self.index
+        data = self.game.data
+        return CompactGame.name_table.names[data[offset] | (data[offset + 1] << 8)]
+
+    @property
+    def role(self) -> Role:
+        return ROLES_BY_CODE[self.game.data[1 + self.index]]
+
+    @property
+    def killed_when(self) -> str:
+        phase = self.get_kill_phase()
+        if phase == PHASE_ALIVE:
+            return "0"
+        return f"{self.get_kill_day()}{_PHASE_LETTERS.get(phase, '')}"
+
+    @property
+    def checked_players(self) -> List[str]:
+        if self.game.data[1 + self.index] != _SHERIFF_CODE:
+            return []
+        names = self.game.names
+        return [names[seat] for seat in self.game.checks]
+
+    def is_alive(self) -> bool:
+        return self.game.data[1 + self._n + self.index] == PHASE_ALIVE
+
+    def killed_by_vote(self) -> bool:
+        return self.game.data[1 + self._n + self.index] == PHASE_DAY
+
+    def killed_at_night(self) -> bool:
+        return self.game.data[1 + self._n + self.index] == PHASE_NIGHT
+
+    def get_kill_day(self) -> int:
+        offset = 1 + 2 * self._n + 2 * self.index
+        data = self.game.data
+        return data[offset] | (data[offset + 1] << 8)
+
+    def get_kill_phase(self) -> int:
+        return self.game.data[1 + self._n + self.index]
+
+    def get_team(self) -> Team:
+        if self.game.data[1 + self.index] in _MAFIA_CODES:
+            return Team.MAFIA
+        return Team.CIVILIANS
+
+    def __repr__(self) -> str:
+        return f"Seat({self.name}, {self.role.value}, {self.killed_when})"
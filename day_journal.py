@@ -0,0 +1,261 @@
+"""
+Журнал игрового дня (write-ahead) и восстановление сессии
+
+Каждое введенное место и каждая законченная игра дописываются в файл
+строкой JSON до того, как игра попадет в SessionManager. Строка сразу
+уходит в ОС (flush), поэтому Ctrl+C или исключение ее не теряют; fsync
+для защиты от отключения питания делается пачкой - фоновым потоком не
+чаще раза в sync_interval секунд, так что запись не задерживает ввод.
+
+    {"type": "day", "total_games": 5, "rules": "2", "rules_digest": "..."}
+    {"type": "seat", "game": 1, "seat": 1, "name": "Иван", "role": "Мирный", "killed_when": "0"}
+    {"type": "game", "game": 1, "players": [...], "points": [...], "masks": [...]}
+    {"type": "end"}
+
+Один файл можно вести несколько дней подряд: запись "day" начинает новый
+день, восстанавливается последний.
+
+Запись игры - состав в формате архива JSONL плюс баллы и маски правил
+мест. При восстановлении (main.py --resume) игры не пересчитываются,
+если совпадает отпечаток содержимого правил (RuleSet.digest), поэтому день из сотен игр поднимается за
+миллисекунды. Недописанная последняя строка (сбой во время записи)
+отбрасывается.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from game_analyzer import GameAnalyzer
+from models import Player, RatingResult, Role
+from rating_calculator import RatingCalculator
+from player_registry import PlayerRegistry
+from scoring_rules import RuleSet, default_rules
+from session_manager import PlayerStats, SessionManager
+
+
+class JournalError(ValueError):
+    """Журнал поврежден"""
+
+
+_ROLES = {role.value: role for role in Role}
+
+
+def _player_record(player: Player) -> dict:
+    return {"name": player.name, "role": player.role.value, "killed_when": player.killed_when}
+
+
+def game_record(players: List[Player]) -> dict:
+    """Состав игры в формате архива JSONL (проверки - номерами мест)"""
+    seat_by_name = {p.name: str(i) for i, p in enumerate(players, 1)}
+    seats = []
+    for player in players:
+        seat = _player_record(player)
+        if player.checked_players:
+            seat["checks"] = [seat_by_name.get(name.strip(), name) for name in player.checked_players]
+        seats.append(seat)
+    return {"players": seats}
+
+
+def _players(seats: List[dict]) -> List[Player]:
+    """Состав из записей журнала (их пишет сам журнал, поэтому без проверок состава)"""
+    players = [Player(seat["name"], _ROLES[seat["role"]], seat.get("killed_when", "0")) for seat in seats]
+    for player, seat in zip(players, seats):
+        for check in seat.get("checks", ()):
+            num = int(check) if check.isdigit() else 0
+            player.checked_players.append(players[num - 1].name if 1 <= num <= len(players) else check)
+    return players
+
+
+def _drop_torn_tail(path: str):
+    """Отрезать недописанную последнюю строку, чтобы новые записи начинались с новой строки"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class DayJournal:
+    """Дописываемый журнал игрового дня"""
+
+    def __init__(self, path: str, sync_interval: float = 1.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        _drop_torn_tail(path)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.syncs = 0
+        self._stop = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_loop, name="journal-sync", daemon=True)
+        self._syncer.start()
+
+    def _append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._dirty = True
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        """Сбросить записанное на диск (fsync), если есть новые строки"""
+        with self._lock:
+            if not self._dirty or self._file.closed:
+                return
+            self._dirty = False
+            fd = self._file.fileno()
+        os.fsync(fd)
+        self.syncs += 1
+
+    # --- записи ---
+
+    def start_day(self, total_games: int, rules: Optional[RuleSet] = None):
+        rules = rules or default_rules()
+        self._append({"type": "day", "total_games": total_games,
+                      "rules": rules.version, "rules_digest": rules.digest})
+
+    def log_seat(self, game: int, seat: int, player: Player):
+        """Место, введенное в игре game (номера с 1)"""
+        self._append({"type": "seat", "game": game, "seat": seat, **_player_record(player)})
+
+    def log_game(self, game: int, results: List[RatingResult]):
+        """Законченная игра с баллами мест"""
+        record = {"type": "game", "game": game, **game_record([r.player for r in results])}
+        record["points"] = [r.total_points for r in results]
+        record["masks"] = [r.rule_mask for r in results]
+        self._append(record)
+
+    def end_day(self):
+        self._append({"type": "end"})
+        self.sync()
+
+    def close(self):
+        """Остановить фоновый fsync, сбросить остаток и закрыть файл"""
+        self._stop.set()
+        self._syncer.join()
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "DayJournal":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class JournalState:
+    """Игровой день, прочитанный из журнала"""
+    total_games: int = 0
+    rules_version: str = ""
+    rules_digest: str = ""  # Отпечаток правил, по которым посчитаны баллы записей
+    games: List[dict] = field(default_factory=list)     # Записи законченных игр по порядку
+    pending: List[Player] = field(default_factory=list)  # Введенные места незаконченной игры
+    finished: bool = False
+    torn: bool = False  # Последняя строка недописана и отброшена
+
+    @property
+    def games_played(self) -> int:
+        return len(self.games)
+
+    def session(self, skill=None, registry: PlayerRegistry = None,
+                rules: Optional[RuleSet] = None) -> SessionManager:
+        """
+        Восстановить SessionManager по законченным играм
+
+        Журнал сезона сюда не передается: игры в нем уже записаны во
+        время дня, повторная запись их удвоила бы.
+        """
+        rules = rules or default_rules()
+        reuse = self.rules_digest == rules.digest
+        session = SessionManager(self.total_games, skill=skill, registry=registry)
+        # Итоги игроков собираются целиком и сливаются в таблицу по одному разу в
+        # порядке появления - места и равенства те же, что при добавлении по играм
+        resolve, name = session.registry.resolve, session.registry.name
+        partial: Dict[int, PlayerStats] = {}
+        for record in self.games:
+            results = _results(record, rules, reuse)
+            if skill is not None:
+                skill.update(results)
+            for result in results:
+                pid = resolve(result.player.name)
+                stats = partial.get(pid)
+                if stats is None:
+                    stats = partial[pid] = PlayerStats(name(pid))
+                stats.add_game_result(result.total_points)
+        for stats in partial.values():
+            session.merge_player_stats(stats)
+        session.current_game = len(self.games)
+        return session
+
+
+def _results(record: dict, rules: RuleSet, reuse: bool) -> List[RatingResult]:
+    try:
+        players = _players(record["players"])
+    except (KeyError, TypeError, AttributeError) as e:
+        raise JournalError(f"игра {record.get('game')}: неверная запись ({e})") from None
+    points, masks = record.get("points"), record.get("masks")
+    if reuse and points is not None and masks is not None and len(points) == len(masks) == len(players):
+        return [RatingResult(player=p, rule_mask=mask, total_points=total, rules=rules)
+                for p, total, mask in zip(players, points, masks)]
+    # Другие правила - пересчитать
+    analyzer = GameAnalyzer(players)
+    return RatingCalculator(players, analyzer.analyze(), analyzer, rules).calculate_all()
+
+
+def read_journal(path: str) -> JournalState:
+    """Прочитать журнал игрового дня"""
+    state = JournalState()
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    # После последнего "\n" - пусто или недописанная строка (возможно, с обрезанным символом)
+    if lines[-1]:
+        state.torn = True
+    lines.pop()
+
+    seats: dict = {}
+    for line_num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            kind = record["type"]
+        except (ValueError, KeyError, TypeError):
+            raise JournalError(f"{path}:{line_num}: поврежденная запись") from None
+
+        if kind == "day":
+            # Тот же файл на новый день: предыдущие дни остаются в файле, но не восстанавливаются
+            state.total_games = int(record.get("total_games", 0))
+            state.rules_version = str(record.get("rules", ""))
+            state.rules_digest = str(record.get("rules_digest", ""))
+            state.games = []
+            state.finished = False
+            seats = {}
+        elif kind == "seat":
+            if record.get("game") == len(state.games) + 1:
+                seats[int(record["seat"])] = record
+        elif kind == "game":
+            if record.get("game") != len(state.games) + 1:
+                raise JournalError(f"{path}:{line_num}: игра {record.get('game')} не по порядку")
+            state.games.append(record)
+            seats = {}
+        elif kind == "end":
+            state.finished = True
+
+    # Места незаконченной игры - подряд с первого
+    for seat in range(1, len(seats) + 2):
+        record = seats.get(seat)
+        if record is None:
+            break
+        try:
+            state.pending.extend(_players([record]))
+        except (KeyError, TypeError):
+            break
+    return state
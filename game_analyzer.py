@@ -1,15 +1,32 @@
 """
 Анализатор игры - определяет победителя, угадайку, особые условия
 """
-from typing import List
+from typing import Dict, List, Optional, Union
 from models import Player, GameAnalysis, Team, Role
+from compact_game import CompactGame
 
 
 class GameAnalyzer:
     """Анализирует результаты игры"""
 
-    def __init__(self, players: List[Player]):
+    def __init__(self, players: Union[List[Player], CompactGame]):
+        # CompactGame анализируется через представления мест без разбора строк
+        if isinstance(players, CompactGame):
+            players = players.seats()
         self.players = players
+        # Номер места по имени и маска мест мафии - строятся один раз на игру
+        self._seat_by_name: Optional[Dict[str, int]] = None
+        self._mafia_mask = 0
+
+    def _build_seat_index(self):
+        seat_by_name = {}
+        mafia_mask = 0
+        for seat, p in enumerate(self.players):
+            seat_by_name[p.name] = seat
+            if p.get_team() == Team.MAFIA:
+                mafia_mask |= 1 << seat
+        self._seat_by_name = seat_by_name
+        self._mafia_mask = mafia_mask
 
     def analyze(self) -> GameAnalysis:
         """Провести полный анализ игры"""
@@ -61,32 +78,33 @@ class GameAnalyzer:
         Returns:
             (была_угадайка, список_имен_участников)
         """
-        # Находим последний день голосования (максимальный день среди убитых днем)
+        # Один проход: день ухода каждого места и последний день голосования
         last_vote_day = 0
+        kill_days = []
         for p in self.players:
-            if p.killed_by_vote():
-                day = p.get_kill_day()
-                if day and day > last_vote_day:
-                    last_vote_day = day
+            if p.is_alive():
+                kill_days.append(None)
+                continue
+            day = p.get_kill_day()
+            kill_days.append(day)
+            if day and day > last_vote_day and p.killed_by_vote():
+                last_vote_day = day
 
         if last_vote_day == 0:
             return (False, [])  # Не было голосований
 
-        # Находим игроков, которые были живы ПЕРЕД последним днем голосования
-        # Живы те, кто: жив сейчас ИЛИ убит в день >= last_vote_day
-        guessing_players = []
-        for p in self.players:
-            if p.is_alive():
-                # Игрок жив в конце - был жив перед последним голосованием
-                guessing_players.append(p.name)
-            else:
-                kill_day = p.get_kill_day()
-                if kill_day and kill_day >= last_vote_day:
-                    # Убит в последний день голосования или позже - был жив перед ним
-                    guessing_players.append(p.name)
+        # Участники - места, живые ПЕРЕД последним днем голосования:
+        # живы сейчас ИЛИ убиты в день >= last_vote_day
+        guessing_mask = 0
+        count = 0
+        for seat, day in enumerate(kill_days):
+            if day is None or (day and day >= last_vote_day):
+                guessing_mask |= 1 << seat
+                count += 1
 
-        is_guessing = len(guessing_players) == 3
-        return (is_guessing, guessing_players if is_guessing else [])
+        if count != 3:
+            return (False, [])
+        return (True, [p.name for seat, p in enumerate(self.players) if guessing_mask >> seat & 1])
 
     def _check_clean_civilian_win(self, winner: Team) -> bool:
         """
@@ -133,17 +151,17 @@ class GameAnalyzer:
         if sheriff.role != Role.SHERIFF:
             return (0, 0)
 
+        if self._seat_by_name is None:
+            self._build_seat_index()
+        seat_by_name = self._seat_by_name
+        mafia_mask = self._mafia_mask
+
         black_checks = 0  # Правильно нашел мафию
         red_checks = 0    # Проверил мирного
-
-        # Создаем словарь игроков для быстрого поиска
-        players_dict = {p.name: p for p in self.players}
-
         for checked_name in sheriff.checked_players:
-            checked_name = checked_name.strip()
-            if checked_name in players_dict:
-                checked_player = players_dict[checked_name]
-                if checked_player.get_team() == Team.MAFIA:
+            seat = seat_by_name.get(checked_name.strip())
+            if seat is not None:
+                if mafia_mask >> seat & 1:
                     black_checks += 1
                 else:
                     red_checks += 1
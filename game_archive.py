@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Бинарный архив игр с записями фиксированной длины
+
+Файл читается через mmap без разбора текста и без копирования: записи -
+структурированный массив NumPy поверх отображенного файла, поэтому
+открытие архива на 10 млн игр мгновенно, а память не растет с его размером.
+
+Формат (все числа little-endian):
+
+    заголовок (32 байта):
+        magic "MAFARC\\0\\0", версия u16, мест u16, число игр u64,
+        смещение таблицы имен u64, число имен u32
+    записи игр (по RECORD_DTYPE.itemsize байт):
+        n u1, роли i1 × 10, дни убийства i2 × 10, фазы i1 × 10,
+        номера имен u4 × 10, число проверок u1, места проверок u1 × 10
+    таблица имен:
+        смещения u4 × (число имен + 1), затем имена в UTF-8 подряд
+
+Пустые места стола: роль NO_ROLE, номер имени EMPTY_NAME. Проверки
+Шерифа хранятся номерами мест по порядку; проверки неизвестных игроков
+отбрасываются, как и в CompactGame.
+
+    python3 game_archive.py pack games.jsonl games.mga
+    python3 game_archive.py info games.mga
+"""
+import argparse
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from batch_loader import ImportedGame
+from compact_game import CompactGame
+from models import Player, Role, ROLE_CODES, ROLES_BY_CODE, NO_ROLE, PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT
+from scoring_rules import RuleSet
+from vectorized_engine import SEATS, GameColumns, VectorizedScores, score_columns
+
+
+MAGIC = b"MAFARC\0\0"
+FORMAT_VERSION = 1
+ARCHIVE_SUFFIX = ".mga"
+MAX_CHECKS = 10
+MAX_DAY = 0x7FFF  # День убийства хранится в int16
+EMPTY_NAME = 0xFFFFFFFF
+DEFAULT_CHUNK = 65536  # Игр в одном блоке колонок при обходе архива
+
+_HEADER = struct.Struct("<8sHHQQI")
+HEADER_SIZE = _HEADER.size
+
+RECORD_DTYPE = np.dtype([
+    ("n", "u1"),
+    ("role", "i1", (SEATS,)),
+    ("kill_day", "<i2", (SEATS,)),
+    ("kill_phase", "i1", (SEATS,)),
+    ("name_id", "<u4", (SEATS,)),
+    ("check_count", "u1"),
+    ("check_seat", "u1", (MAX_CHECKS,)),
+])
+_RECORD = struct.Struct(f"<B{SEATS}b{SEATS}h{SEATS}b{SEATS}IB{MAX_CHECKS}B")
+assert _RECORD.size == RECORD_DTYPE.itemsize
+
+_SHERIFF_CODE = ROLE_CODES[Role.SHERIFF]
+_PHASE_LETTERS = {PHASE_DAY: "D", PHASE_NIGHT: "N"}
+
+
+class ArchiveError(ValueError):
+    """Файл не является корректным архивом игр"""
+
+
+def is_archive(path: str) -> bool:
+    """Начинается ли файл с сигнатуры архива"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class ArchiveWriter:
+    """Последовательная запись игр в архив"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: BinaryIO = open(path, "wb", buffering=1 << 20)
+        self._file.write(bytes(HEADER_SIZE))  # Заголовок пишется при закрытии
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self.games_written = 0
+
+    def _name_id(self, name: str) -> int:
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return name_id
+
+    def _write(self, names: Sequence[str], roles: Sequence[int], days: Sequence[int],
+               phases: Sequence[int], checks: Sequence[int]):
+        n = len(names)
+        if n > SEATS:
+            raise ArchiveError(f"в игре больше {SEATS} игроков")
+        if len(checks) > MAX_CHECKS:
+            raise ArchiveError(f"больше {MAX_CHECKS} проверок Шерифа")
+        if any(not 0 <= day <= MAX_DAY for day in days):
+            raise ArchiveError(f"день убийства вне диапазона 0..{MAX_DAY}")
+        pad = SEATS - n
+        self._file.write(_RECORD.pack(
+            n,
+            *roles, *([NO_ROLE] * pad),
+            *days, *([0] * pad),
+            *phases, *([0] * pad),
+            *(self._name_id(name) for name in names), *([EMPTY_NAME] * pad),
+            len(checks), *checks, *([0] * (MAX_CHECKS - len(checks))),
+        ))
+        self.games_written += 1
+
+    def add(self, players: List[Player]):
+        """Записать игру"""
+        seat_by_name = {p.name: i for i, p in enumerate(players)}
+        checks = []
+        for p in players:
+            if p.role == Role.SHERIFF:
+                for checked_name in p.checked_players:
+                    seat = seat_by_name.get(checked_name.strip())
+                    if seat is not None:
+                        checks.append(seat)
+        self._write([p.name for p in players],
+                    [ROLE_CODES[p.role] for p in players],
+                    [p.get_kill_day() for p in players],
+                    [p.get_kill_phase() for p in players],
+                    checks)
+
+    def add_compact(self, game: CompactGame):
+        """Записать игру в компактном виде"""
+        self._write(game.names, game.roles, game.days, game.phases, game.checks)
+
+    def close(self):
+        if self._file.closed:
+            return
+        names_offset = self._file.tell()
+        blobs = [name.encode("utf-8") for name in self._names]
+        offsets = np.zeros(len(blobs) + 1, dtype="<u4")
+        np.cumsum([len(b) for b in blobs], out=offsets[1:])
+        self._file.write(offsets.tobytes())
+        self._file.write(b"".join(blobs))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, SEATS, self.games_written,
+                                      names_offset, len(self._names)))
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_archive(path: str, games: Iterable[List[Player]]) -> int:
+    """Записать игры в архив; возвращает число игр"""
+    with ArchiveWriter(path) as writer:
+        for players in games:
+            writer.add(players)
+    return writer.games_written
+
+
+class GameArchive:
+    """
+    Архив, открытый через mmap
+
+    records - структурированный массив поверх файла (без копирования);
+    срезы колонок, CompactGame и Player строятся из него по требованию.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except ArchiveError:
+            self._mmap.close()
+            raise
+
+    def _open(self):
+        size = len(self._mmap)
+        if size < HEADER_SIZE:
+            raise ArchiveError(f"{self.path}: файл короче заголовка")
+        magic, version, seats, n_games, names_offset, names_count = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ArchiveError(f"{self.path}: не архив игр")
+        if version != FORMAT_VERSION or seats != SEATS:
+            raise ArchiveError(f"{self.path}: неподдерживаемая версия архива {version} ({seats} мест)")
+        if names_offset != HEADER_SIZE + n_games * RECORD_DTYPE.itemsize or \
+                names_offset + 4 * (names_count + 1) > size:
+            raise ArchiveError(f"{self.path}: архив поврежден или не дописан")
+
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=n_games, offset=HEADER_SIZE)
+        self._name_offsets = np.frombuffer(self._mmap, dtype="<u4", count=names_count + 1, offset=names_offset)
+        self._names_start = names_offset + 4 * (names_count + 1)
+        self._names: Optional[List[str]] = None
+
+    def close(self):
+        """Закрыть отображение (если на него нет живых ссылок из массивов)"""
+        self.records = self._name_offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # Срезы колонок еще используются - закроется вместе с ними
+
+    def __enter__(self) -> "GameArchive":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def names(self) -> List[str]:
+        """Таблица имен архива (читается при первом обращении)"""
+        if self._names is None:
+            start, data = self._names_start, self._mmap
+            offsets = self._name_offsets.tolist()
+            self._names = [data[start + a:start + b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+        return self._names
+
+    # --- игры по одной ---
+
+    def _fields(self, index: int) -> tuple:
+        if not 0 <= index < len(self.records):
+            raise IndexError(index)
+        return _RECORD.unpack_from(self._mmap, HEADER_SIZE + index * RECORD_DTYPE.itemsize)
+
+    def compact(self, index: int) -> CompactGame:
+        """
+        Игра index как CompactGame - ее принимают GameAnalyzer и RatingCalculator
+
+        Имена попадают в общий реестр CompactGame (не больше 65536 разных);
+        для обхода больших архивов - players(), imported_games() или columns().
+        """
+        fields = self._fields(index)
+        n = fields[0]
+        names = self.names
+        base = 1 + 3 * SEATS
+        check_count = fields[base + SEATS]
+        return CompactGame(
+            names=[names[i] for i in fields[base:base + n]],
+            roles=bytes(fields[1:1 + n]),
+            days=fields[1 + SEATS:1 + SEATS + n],
+            phases=bytes(fields[1 + 2 * SEATS:1 + 2 * SEATS + n]),
+            checks=bytes(fields[base + SEATS + 1:base + SEATS + 1 + check_count]),
+        )
+
+    def players(self, index: int) -> List[Player]:
+        """
+        Игра index списком Player
+
+        Строится прямо из записи и таблицы имен архива, без CompactGame: его
+        номера имен двухбайтовые, а в архиве имен может быть больше 65536.
+        """
+        fields = self._fields(index)
+        n = fields[0]
+        base = 1 + 3 * SEATS
+        names = self.names
+        seat_names = [names[i] for i in fields[base:base + n]]
+        check_count = fields[base + SEATS]
+        checked = [seat_names[seat] for seat in fields[base + SEATS + 1:base + SEATS + 1 + check_count]]
+        players = []
+        for i in range(n):
+            role = ROLES_BY_CODE[fields[1 + i]]
+            phase = fields[1 + 2 * SEATS + i]
+            killed_when = "0" if phase == PHASE_ALIVE else f"{fields[1 + SEATS + i]}{_PHASE_LETTERS.get(phase, '')}"
+            players.append(Player(seat_names[i], role, killed_when, list(checked) if role == Role.SHERIFF else []))
+        return players
+
+    def __getitem__(self, index: int) -> CompactGame:
+        return self.compact(index if index >= 0 else index + len(self))
+
+    def __iter__(self) -> Iterator[CompactGame]:
+        for index in range(len(self)):
+            yield self.compact(index)
+
+    def imported_games(self, start: int = 0, stop: Optional[int] = None) -> Iterator[ImportedGame]:
+        """Игры как из BatchLoader - для импорта в main.py"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(start, stop):
+            yield ImportedGame(line=index + 1, game_id=str(index + 1), players=self.players(index))
+
+    # --- срезы колонками ---
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> GameColumns:
+        """
+        Колонки игр [start, stop) для векторизованного подсчета
+
+        Роли, дни и фазы - представления файла без копирования; копируется
+        только счетчик проверок по местам (он строится из списка проверок).
+        """
+        block = self.records[start:stop]
+        seats = np.arange(SEATS)
+        in_list = np.arange(MAX_CHECKS)[None, :] < block["check_count"][:, None]
+        checks = ((block["check_seat"][:, :, None] == seats) & in_list[:, :, None]).sum(axis=1, dtype=np.int8)
+        return GameColumns(role=block["role"], kill_day=block["kill_day"],
+                           kill_phase=block["kill_phase"], checks=checks)
+
+    def player_ids(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Номера имен мест [start, stop) в таблице names; пустые места - EMPTY_NAME"""
+        return self.records["name_id"][start:stop]
+
+    def chunks(self, chunk: int = DEFAULT_CHUNK) -> Iterator[Tuple[int, GameColumns]]:
+        """Обход архива блоками колонок: (номер первой игры, колонки)"""
+        for start in range(0, len(self), chunk):
+            yield start, self.columns(start, start + chunk)
+
+    def score_chunks(self, rules: Optional[RuleSet] = None,
+                     chunk: int = DEFAULT_CHUNK) -> Iterator[Tuple[int, VectorizedScores]]:
+        """Векторизованный подсчет блоками - память не зависит от размера архива"""
+        for start, columns in self.chunks(chunk):
+            yield start, score_columns(columns, rules)
+
+
+def main(argv=None):
+    from batch_loader import BatchLoader, ImportIssue
+
+    parser = argparse.ArgumentParser(description="Бинарный архив игр")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="упаковать архив JSONL/CSV")
+    pack.add_argument("source")
+    pack.add_argument("target")
+    info = commands.add_parser("info", help="сведения об архиве")
+    info.add_argument("archive")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        with open(args.source, encoding="utf-8", newline="") as f:
+            loader = BatchLoader(f, BatchLoader.detect_format(args.source))
+            with ArchiveWriter(args.target) as writer:
+                for game in loader.games():
+                    # Игра, не помещающаяся в запись архива, пропускается как некорректная
+                    try:
+                        writer.add(game.players)
+                    except ArchiveError as e:
+                        loader.issues.append(ImportIssue(game.line, f"не упакована: {e}"))
+        print(f"Упаковано игр: {writer.games_written} ({os.path.getsize(args.target)} байт)")
+        for issue in sorted(loader.issues, key=lambda issue: issue.line):
+            print(f"   {issue}")
+    else:
+        with GameArchive(args.archive) as archive:
+            print(f"Игр: {len(archive)}, имен: {len(archive.names)}, "
+                  f"запись: {RECORD_DTYPE.itemsize} байт")
+
+
+if __name__ == "__main__":
+    main()
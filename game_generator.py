@@ -0,0 +1,94 @@
+"""
+Генератор синтетических игр для тестов и бенчмарков
+
+Партия разыгрывается по циклам «день → ночь»: днем стол с вероятностью
+vote_probability голосованием выводит одного игрока (мафию - чаще),
+ночью мафия с вероятностью kill_probability убивает мирного (Шерифа -
+чуть чаще), а живой Шериф проверяет еще не проверенного игрока. Игра
+заканчивается, как только мафии не осталось или мирных стало не больше
+мафии, поэтому угадайки и чистые/сухие победы получаются естественно.
+
+Параметры по умолчанию дают примерно поровну побед мирных и мафии и около
+15% игр с угадайкой. Генератор детерминирован: одинаковый seed дает
+одинаковые игры.
+"""
+import random
+from typing import Iterator, List, Optional
+
+from models import Player, Role, Team
+
+
+SEATS = 10
+ROLES = [Role.CIVILIAN] * 6 + [Role.SHERIFF, Role.MAFIA, Role.MAFIA, Role.DON]
+
+
+class GameGenerator:
+    """Генератор корректных игр на 10 мест"""
+
+    def __init__(self, seed: int = 0, player_pool: int = 200,
+                 vote_probability: float = 0.95, kill_probability: float = 0.92,
+                 mafia_vote_weight: float = 4.0, sheriff_kill_weight: float = 1.5):
+        if player_pool < SEATS:
+            raise ValueError(f"В пуле должно быть хотя бы {SEATS} игроков")
+        if vote_probability <= 0:
+            raise ValueError("Вероятность голосования должна быть больше 0")
+        self.random = random.Random(seed)
+        self.names = [f"Игрок{i + 1}" for i in range(player_pool)]
+        self.vote_probability = vote_probability
+        self.kill_probability = kill_probability
+        self.mafia_vote_weight = mafia_vote_weight
+        self.sheriff_kill_weight = sheriff_kill_weight
+
+    def games(self, count: Optional[int] = None) -> Iterator[List[Player]]:
+        """Поток игр (бесконечный, если count не задан)"""
+        generated = 0
+        while count is None or generated < count:
+            yield self.generate()
+            generated += 1
+
+    def generate(self) -> List[Player]:
+        """Сыграть одну игру"""
+        rng = self.random
+        roles = list(ROLES)
+        rng.shuffle(roles)
+        players = [Player(name, role) for name, role in zip(rng.sample(self.names, SEATS), roles)]
+
+        alive = list(players)
+        sheriff = next(p for p in players if p.role == Role.SHERIFF)
+        unchecked = [p for p in players if p is not sheriff]
+        rng.shuffle(unchecked)
+
+        day = 0
+        while self._winner(alive) is None:
+            day += 1
+
+            # День: голосование
+            if rng.random() < self.vote_probability:
+                weights = [self.mafia_vote_weight if p.get_team() == Team.MAFIA else 1.0 for p in alive]
+                voted = rng.choices(alive, weights)[0]
+                voted.killed_when = f"{day}D"
+                alive.remove(voted)
+                if self._winner(alive) is not None:
+                    break
+
+            # Ночь: проверка Шерифа и выстрел мафии
+            if sheriff in alive and unchecked:
+                sheriff.checked_players.append(unchecked.pop().name)
+
+            targets = [p for p in alive if p.get_team() == Team.CIVILIANS]
+            if targets and rng.random() < self.kill_probability:
+                weights = [self.sheriff_kill_weight if p is sheriff else 1.0 for p in targets]
+                victim = rng.choices(targets, weights)[0]
+                victim.killed_when = f"{day}N"
+                alive.remove(victim)
+
+        return players
+
+    @staticmethod
+    def _winner(alive: List[Player]) -> Optional[Team]:
+        mafia = sum(1 for p in alive if p.get_team() == Team.MAFIA)
+        if mafia == 0:
+            return Team.CIVILIANS
+        if len(alive) - mafia <= mafia:
+            return Team.MAFIA
+        return None
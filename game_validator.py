@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Пакетная проверка архива игр без интерактивных вопросов
+
+В отличие от InputHandler._validate_roles, который спрашивает ведущего, здесь
+все проверки - операции над колонками NumPy сразу для блока игр, а итог -
+структурированный отчет (ValidationReport): код ошибки, игра, строка архива
+и пояснение.
+
+Проверки (CHECKS):
+    состав        - 10 мест, 1 Шериф, 1 Дон, 2 Мафии
+    хронология    - не больше одного ухода голосованием за день и одного
+                    убийства за ночь, день убийства не меньше 1, никто не
+                    покидает игру после ее окончания, игра доведена до конца
+    проверки      - Шериф проверяет игроков своего стола, не себя и не дважды
+    победитель    - записанный в архиве победитель совпадает с исходом
+
+    python3 game_validator.py games.jsonl --json report.json
+"""
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from batch_loader import BatchLoader, ImportedGame
+from models import Role, Team, ROLE_CODES, PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT
+from vectorized_engine import SEATS, GameColumns, DON, MAFIA, SHERIFF, seat_keys
+
+
+ERROR = "error"
+WARNING = "warning"
+
+# Код проверки -> (серьезность, описание)
+CHECKS: Dict[str, Tuple[str, str]] = {
+    "seat_count": (ERROR, "за столом не 10 игроков"),
+    "sheriff_count": (ERROR, "Шерифов не 1"),
+    "don_count": (ERROR, "Донов не 1"),
+    "mafia_count": (ERROR, "Мафий (без Дона) не 2"),
+    "bad_kill_day": (ERROR, "день убийства меньше 1"),
+    "double_vote": (ERROR, "за один день ушли голосованием несколько игроков"),
+    "double_kill": (ERROR, "за одну ночь убиты несколько игроков"),
+    "kill_after_end": (ERROR, "игрок покинул игру после ее окончания"),
+    "unfinished": (WARNING, "игра не доведена до победы (считается победой мирных)"),
+    "check_unknown": (ERROR, "проверка игрока не из этой игры"),
+    "check_self": (ERROR, "Шериф проверил себя"),
+    "check_repeated": (ERROR, "игрок проверен несколько раз"),
+    "check_not_sheriff": (ERROR, "проверки указаны не у Шерифа"),
+    "winner_mismatch": (ERROR, "записанный победитель не совпадает с исходом"),
+    "unknown_winner": (ERROR, "не удалось разобрать записанного победителя"),
+}
+
+WINNER_NONE = -1   # Победитель не записан
+WINNER_UNKNOWN = -2  # Записан, но не разобран
+_WINNER_CODES = {
+    Team.CIVILIANS.value.lower(): 0, "мирный": 0, "civilians": 0,
+    Team.MAFIA.value.lower(): 1, "mafia": 1,
+}
+_MAX_TIMELINE = 1 << 14  # Позиция «жив» в хронологии - позже любого события
+
+
+@dataclass
+class ValidationIssue:
+    """Найденная ошибка"""
+    code: str
+    severity: str
+    game: int      # Порядковый номер игры в архиве (с 1)
+    game_id: str
+    line: int      # Строка архива, с которой начинается игра
+    message: str
+
+    def __str__(self) -> str:
+        return f"строка {self.line} (игра {self.game_id}): {self.message}"
+
+
+class ValidationReport:
+    """Итог проверки архива: счетчики по кодам и первые max_issues ошибок"""
+
+    def __init__(self, max_issues: Optional[int] = 1000):
+        self.max_issues = max_issues
+        self.games_checked = 0
+        self.games_with_errors = 0
+        self.counts: Dict[str, int] = {code: 0 for code in CHECKS}
+        self.issues: List[ValidationIssue] = []
+        self.unreadable: List[str] = []  # Записи, которые не удалось прочитать вовсе
+
+    @property
+    def ok(self) -> bool:
+        """Нет ни одной ошибки (предупреждения допускаются)"""
+        return self.games_with_errors == 0 and not self.unreadable
+
+    @property
+    def room(self) -> Optional[int]:
+        """Сколько еще ошибок можно сохранить подробно (None - без ограничения)"""
+        return None if self.max_issues is None else max(self.max_issues - len(self.issues), 0)
+
+    def to_dict(self) -> dict:
+        return {
+            "games_checked": self.games_checked,
+            "games_with_errors": self.games_with_errors,
+            "unreadable": list(self.unreadable),
+            "counts": {code: n for code, n in self.counts.items() if n},
+            "issues": [asdict(issue) for issue in self.issues],
+        }
+
+    def format_summary(self) -> str:
+        """Сводка для консоли"""
+        lines = [f"Проверено игр: {self.games_checked}, с ошибками: {self.games_with_errors}"]
+        if self.unreadable:
+            lines.append(f"Не прочитано записей: {len(self.unreadable)}")
+        for code, n in self.counts.items():
+            if n:
+                severity, description = CHECKS[code]
+                mark = "❌" if severity == ERROR else "⚠️ "
+                lines.append(f"   {mark} {description}: {n}")
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class ValidationBlock:
+    """Блок игр для проверки: колонки и то, что в колонки не помещается"""
+    columns: GameColumns
+    seat_count: np.ndarray        # int (n,): игроков за столом (может быть больше SEATS)
+    unknown_checks: np.ndarray    # int (n,): проверок игроков не из этой игры
+    foreign_checks: np.ndarray    # int (n,): проверок у игроков без роли Шерифа
+    recorded_winner: np.ndarray   # int (n,): WINNER_* или 0/1 (мирные/мафия)
+    game_ids: List[str]
+    lines: List[int]
+
+    @classmethod
+    def from_games(cls, games: List[ImportedGame]) -> "ValidationBlock":
+        n = len(games)
+        block = cls(
+            columns=GameColumns.empty(n),
+            seat_count=np.zeros(n, dtype=np.int32),
+            unknown_checks=np.zeros(n, dtype=np.int32),
+            foreign_checks=np.zeros(n, dtype=np.int32),
+            recorded_winner=np.full(n, WINNER_NONE, dtype=np.int8),
+            game_ids=[g.game_id for g in games],
+            lines=[g.line for g in games],
+        )
+        columns = block.columns
+        for g, game in enumerate(games):
+            players = game.players
+            block.seat_count[g] = len(players)
+            if game.winner is not None:
+                block.recorded_winner[g] = _WINNER_CODES.get(game.winner.strip().lower(), WINNER_UNKNOWN)
+            if len(players) > SEATS:
+                continue  # Не помещается в колонки - только seat_count
+            seat_by_name = {p.name: i for i, p in enumerate(players)}
+            for i, p in enumerate(players):
+                columns.role[g, i] = ROLE_CODES[p.role]
+                columns.kill_day[g, i] = p.get_kill_day()
+                columns.kill_phase[g, i] = p.get_kill_phase()
+                if not p.checked_players:
+                    continue
+                if p.role != Role.SHERIFF:
+                    block.foreign_checks[g] += len(p.checked_players)
+                    continue
+                for checked_name in p.checked_players:
+                    seat = seat_by_name.get(checked_name.strip())
+                    if seat is None:
+                        block.unknown_checks[g] += 1
+                    else:
+                        columns.checks[g, seat] += 1
+        return block
+
+    @classmethod
+    def from_columns(cls, columns: GameColumns, first_game: int = 0) -> "ValidationBlock":
+        """Блок из готовых колонок (например, среза GameArchive)"""
+        n = len(columns)
+        numbers = range(first_game + 1, first_game + n + 1)
+        return cls(
+            columns=columns,
+            seat_count=np.count_nonzero(columns.role >= 0, axis=1),
+            unknown_checks=np.zeros(n, dtype=np.int32),
+            foreign_checks=np.zeros(n, dtype=np.int32),
+            recorded_winner=np.full(n, WINNER_NONE, dtype=np.int8),
+            game_ids=[str(i) for i in numbers],
+            lines=list(numbers),
+        )
+
+
+def _duplicate_days(day: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Есть ли в строке два отмеченных места с одинаковым днем"""
+    days = np.sort(np.where(mask, day, -1 - np.arange(day.shape[1])), axis=1)
+    return np.any((days[:, 1:] == days[:, :-1]) & (days[:, 1:] >= 0), axis=1)
+
+
+def check_columns(block: ValidationBlock) -> Dict[str, np.ndarray]:
+    """Все проверки блока: код -> bool (n,) - игры с этой ошибкой"""
+    columns = block.columns
+    role, day, phase = columns.role, columns.kill_day.astype(np.int32), columns.kill_phase
+    present = role >= 0
+    mafia = (role == MAFIA) | (role == DON)
+    civilian = present & ~mafia
+    killed = present & (phase != PHASE_ALIVE)
+    voted = present & (phase == PHASE_DAY)
+    shot = present & (phase == PHASE_NIGHT)
+    fits = block.seat_count <= SEATS
+
+    found = {
+        "seat_count": block.seat_count != SEATS,
+        "sheriff_count": fits & (np.count_nonzero(role == SHERIFF, axis=1) != 1),
+        "don_count": fits & (np.count_nonzero(role == DON, axis=1) != 1),
+        "mafia_count": fits & (np.count_nonzero(role == MAFIA, axis=1) != 2),
+        "bad_kill_day": np.any(killed & (day < 1), axis=1),
+        "double_vote": _duplicate_days(day, voted),
+        "double_kill": _duplicate_days(day, shot),
+    }
+
+    # Хронология: день d раньше ночи d. Уходы упорядочиваются по времени, после
+    # каждого считаются живые в командах; игра кончилась на первом уходе, после
+    # которого есть победитель
+    position = np.where(killed, 2 * day + shot, _MAX_TIMELINE)
+    order = np.argsort(position, axis=1, kind="stable")
+    sorted_position = np.take_along_axis(position, order, axis=1)
+    sorted_killed = np.take_along_axis(killed, order, axis=1)
+    mafia_left = mafia.sum(axis=1)[:, None] - np.cumsum(np.take_along_axis(mafia & killed, order, axis=1), axis=1)
+    civilians_left = civilian.sum(axis=1)[:, None] - np.cumsum(np.take_along_axis(civilian & killed, order, axis=1), axis=1)
+    # Одновременные уходы (ошибка double_*) учитываются вместе - по последнему из них
+    last_at_position = np.ones_like(sorted_killed)
+    last_at_position[:, :-1] = sorted_position[:, 1:] != sorted_position[:, :-1]
+    ends = sorted_killed & last_at_position & ((mafia_left == 0) | (civilians_left <= mafia_left))
+    end_position = np.where(ends, sorted_position, _MAX_TIMELINE).min(axis=1)
+    found["kill_after_end"] = np.any(killed & (position > end_position[:, None]), axis=1)
+
+    alive_mafia = np.count_nonzero(mafia & ~killed, axis=1)
+    alive_civilians = np.count_nonzero(civilian & ~killed, axis=1)
+    found["unfinished"] = fits & (alive_mafia > 0) & (alive_civilians > alive_mafia)
+
+    is_sheriff = role == SHERIFF
+    found["check_unknown"] = block.unknown_checks > 0
+    found["check_self"] = np.any(is_sheriff & (columns.checks > 0), axis=1)
+    found["check_repeated"] = np.any(columns.checks > 1, axis=1)
+    found["check_not_sheriff"] = block.foreign_checks > 0
+
+    mafia_won = seat_keys(columns).analysis.mafia_won
+    recorded = block.recorded_winner
+    found["winner_mismatch"] = (recorded >= 0) & (recorded != mafia_won)
+    found["unknown_winner"] = recorded == WINNER_UNKNOWN
+    return found
+
+
+def _message(code: str, block: ValidationBlock, g: int) -> str:
+    """Пояснение с подробностями для одной игры"""
+    role = block.columns.role[g]
+    if code == "seat_count":
+        return f"за столом {block.seat_count[g]} игроков вместо {SEATS}"
+    if code == "sheriff_count":
+        return f"Шерифов должно быть 1, а указано {np.count_nonzero(role == SHERIFF)}"
+    if code == "don_count":
+        return f"Донов должно быть 1, а указано {np.count_nonzero(role == DON)}"
+    if code == "mafia_count":
+        return f"Мафий (без Дона) должно быть 2, а указано {np.count_nonzero(role == MAFIA)}"
+    if code == "check_unknown":
+        return f"проверок игроков не из этой игры: {block.unknown_checks[g]}"
+    if code == "winner_mismatch":
+        recorded = Team.MAFIA if block.recorded_winner[g] == 1 else Team.CIVILIANS
+        actual = Team.CIVILIANS if recorded == Team.MAFIA else Team.MAFIA
+        return f"записан победитель «{recorded.value}», а по хронологии - «{actual.value}»"
+    return CHECKS[code][1]
+
+
+def validate_block(block: ValidationBlock, report: ValidationReport, first_game: int = 0):
+    """Проверить блок и дописать найденное в report"""
+    found = check_columns(block)
+    codes = list(CHECKS)
+    flagged = np.stack([found[code] for code in codes], axis=1)
+    is_error = np.array([CHECKS[code][0] == ERROR for code in codes])
+    for code, n in zip(codes, np.count_nonzero(flagged, axis=0)):
+        report.counts[code] += int(n)
+
+    # Подробно - первые report.room ошибок: в порядке игр, внутри игры - в порядке CHECKS
+    games, checks = np.nonzero(flagged)
+    room = report.room
+    if room is not None:
+        games, checks = games[:room], checks[:room]
+    for g, c in zip(games.tolist(), checks.tolist()):
+        code = codes[c]
+        report.issues.append(ValidationIssue(code, CHECKS[code][0], first_game + g + 1,
+                                             block.game_ids[g], block.lines[g], _message(code, block, g)))
+    report.games_checked += len(block.columns)
+    report.games_with_errors += int(np.count_nonzero(np.any(flagged & is_error, axis=1)))
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_games(games: Iterable[ImportedGame], chunk: int = 65536,
+                   max_issues: Optional[int] = 1000) -> ValidationReport:
+    """Проверить игры (BatchLoader с strict=False) блоками по chunk"""
+    report = ValidationReport(max_issues)
+    for block_games in _chunks(games, chunk):
+        validate_block(ValidationBlock.from_games(block_games), report, report.games_checked)
+    return report
+
+
+def validate_file(path: str, fmt: Optional[str] = None, chunk: int = 65536,
+                  max_issues: Optional[int] = 1000) -> ValidationReport:
+    """Проверить архив JSONL/CSV или бинарный архив (game_archive)"""
+    from game_archive import GameArchive, is_archive
+
+    if fmt == "archive" or (fmt is None and is_archive(path)):
+        report = ValidationReport(max_issues)
+        with GameArchive(path) as archive:
+            for start, columns in archive.chunks(chunk):
+                validate_block(ValidationBlock.from_columns(columns, start), report, start)
+        return report
+
+    with open(path, encoding="utf-8", newline="") as f:
+        loader = BatchLoader(f, fmt or BatchLoader.detect_format(path), strict=False)
+        report = validate_games(loader.games(), chunk, max_issues)
+    report.unreadable = [str(issue) for issue in loader.issues]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверка архива игр")
+    parser.add_argument("archive", help="архив игр (JSONL, CSV или бинарный архив)")
+    parser.add_argument("--format", choices=("jsonl", "csv", "archive"))
+    parser.add_argument("--json", metavar="FILE", help="сохранить отчет в JSON")
+    parser.add_argument("--max-issues", type=int, default=1000,
+                        help="сколько ошибок хранить в отчете подробно")
+    args = parser.parse_args(argv)
+
+    report = validate_file(args.archive, args.format, max_issues=args.max_issues)
+    print(report.format_summary(), end="")
+    for issue in report.issues[:20]:
+        print(f"   {issue}")
+    if len(report.issues) > 20:
+        print(f"   ... и еще {sum(report.counts.values()) - 20}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
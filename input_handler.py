@@ -2,7 +2,7 @@
 Обработчик ввода данных с консоли
 """
 import sys
-from typing import List
+from typing import Callable, List, Optional
 from models import Player, Role
 
 
@@ -46,16 +46,24 @@ class InputHandler:
                 print("Используйте только английские буквы для имен или настройте UTF-8 в терминале.")
                 return ""
 
-    def get_players(self) -> List[Player]:
-        """Получить список игроков от пользователя"""
-        players = []
+    def get_players(self, entered: Optional[List[Player]] = None,
+                    on_seat: Optional[Callable[[int, Player], None]] = None) -> List[Player]:
+        """
+        Получить список игроков от пользователя
+
+        entered - уже введенные места (продолжение игры из журнала дня);
+        on_seat(номер места, игрок) вызывается после ввода каждого места
+        """
+        players = list(entered or [])
         REQUIRED_PLAYERS = 10
 
         print(f"Введите данные для {REQUIRED_PLAYERS} игроков.")
+        if players:
+            print(f"Уже введено из журнала: {len(players)} ({', '.join(p.name for p in players)})")
         print()
 
         # Ввод ровно 10 игроков
-        for player_num in range(1, REQUIRED_PLAYERS + 1):
+        for player_num in range(len(players) + 1, REQUIRED_PLAYERS + 1):
             print(f"--- Игрок {player_num} ---")
 
             # Имя
@@ -78,6 +86,8 @@ class InputHandler:
                 checked_players=[]
             )
             players.append(player)
+            if on_seat is not None:
+                on_seat(player_num, player)
             print()
 
         # Валидация состава
@@ -100,26 +110,40 @@ class InputHandler:
     def _get_killed_when(self) -> str:
         """Получить информацию о том, когда убит игрок"""
         while True:
-            killed = self._safe_input("Когда убит (0-жив, 1D/1N/2D/2N...): ").strip().upper()
-
-            # Жив
-            if not killed or killed == "0":
-                return "0"
-
-            # Проверка формата: должно быть цифра + D или N
-            if len(killed) >= 2:
-                # Извлекаем число и букву
-                day_part = killed[:-1]  # всё кроме последнего символа
-                letter = killed[-1]     # последний символ
-
-                # Проверяем: число + (D или N)
-                if day_part.isdigit() and letter in ('D', 'N'):
-                    return killed
+            killed = self.parse_killed_when(self._safe_input("Когда убит (0-жив, 1D/1N/2D/2N...): "))
+            if killed is not None:
+                return killed
 
             print("Неверный формат! Используйте: 0 (жив), 1D, 2N, 3D и т.д.")
             print("Где число - это день, D - убит днём, N - убит ночью")
             print("Попробуйте снова: ", end="")
 
+    @staticmethod
+    def parse_killed_when(value: str) -> Optional[str]:
+        """
+        Разобрать момент убийства: "0" (жив), "1D", "2N" и т.д.
+
+        Returns:
+            нормализованная строка или None, если формат неверный
+        """
+        killed = value.strip().upper()
+
+        # Жив
+        if not killed or killed == "0":
+            return "0"
+
+        # Проверка формата: должно быть цифра + D или N
+        if len(killed) >= 2:
+            # Извлекаем число и букву
+            day_part = killed[:-1]  # всё кроме последнего символа
+            letter = killed[-1]     # последний символ
+
+            # Проверяем: число + (D или N)
+            if day_part.isdigit() and letter in ('D', 'N'):
+                return killed
+
+        return None
+
     def _get_sheriff_checks_after_all(self, players: List[Player]):
         """Запросить проверки Шерифа ПОСЛЕ ввода всех игроков"""
         # Находим Шерифа
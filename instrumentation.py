@@ -0,0 +1,213 @@
+"""
+Замеры времени и счетчики по этапам конвейера
+
+Пока замеры выключены, код конвейера работает без оберток - накладных
+расходов нет. enable() оборачивает методы этапов (ввод, анализ и каждая
+проверка анализатора, подсчет, сессия, вывод) таймерами, disable()
+возвращает исходные методы.
+
+Итог - таблица для консоли, JSON или текстовый формат Prometheus.
+"""
+import functools
+import json
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from input_handler import InputHandler
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from output_formatter import OutputFormatter
+from session_manager import SessionManager
+from session_output import SessionOutputFormatter
+
+
+def _count_breakdowns(metrics: "Metrics", results):
+    metrics.count("ratings_results", len(results))
+    metrics.count("ratings_breakdowns", sum(r.breakdown_count for r in results))
+
+
+def _count_analysis(metrics: "Metrics", analysis):
+    metrics.count("games_analyzed")
+    if analysis.is_guessing:
+        metrics.count("games_guessing")
+
+
+# (класс, метод, имя таймера, счетчик по результату вызова)
+INSTRUMENTED: List[Tuple[type, str, str, Optional[Callable]]] = [
+    (InputHandler, "get_players", "input.get_players", None),
+    (GameAnalyzer, "analyze", "analyzer.analyze", _count_analysis),
+    (GameAnalyzer, "_determine_winner", "analyzer.determine_winner", None),
+    (GameAnalyzer, "_check_guessing", "analyzer.check_guessing", None),
+    (GameAnalyzer, "_check_clean_civilian_win", "analyzer.check_clean_civilian_win", None),
+    (GameAnalyzer, "_check_dry_mafia_win", "analyzer.check_dry_mafia_win", None),
+    (GameAnalyzer, "get_sheriff_checks", "analyzer.get_sheriff_checks", None),
+    (RatingCalculator, "calculate_all", "calculator.calculate_all", _count_breakdowns),
+    (SessionManager, "add_game_results", "session.add_game_results", None),
+    (OutputFormatter, "print_results", "output.print_results", None),
+    (SessionOutputFormatter, "format_final_rating", "output.format_final_rating", None),
+]
+
+
+class TimerStats:
+    """Накопленные замеры одного этапа (наносекунды)"""
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int):
+        if self.calls == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.calls += 1
+        self.total_ns += duration_ns
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_s": self.total_ns / 1e9,
+            "mean_us": self.total_ns / self.calls / 1000 if self.calls else 0.0,
+            "min_us": self.min_ns / 1000,
+            "max_us": self.max_ns / 1000,
+        }
+
+
+class Metrics:
+    """Реестр таймеров и счетчиков"""
+
+    def __init__(self):
+        self.timers: Dict[str, TimerStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.enabled = False
+        self._originals: List[Tuple[type, str, Callable]] = []
+
+    # --- включение/выключение ---
+
+    def enable(self):
+        """Обернуть методы этапов таймерами"""
+        if self.enabled:
+            return
+        for cls, method, timer_name, on_result in INSTRUMENTED:
+            original = cls.__dict__[method]
+            self._originals.append((cls, method, original))
+            setattr(cls, method, self._wrap(original, timer_name, on_result))
+        self.enabled = True
+
+    def disable(self):
+        """Вернуть исходные методы"""
+        for cls, method, original in reversed(self._originals):
+            setattr(cls, method, original)
+        self._originals.clear()
+        self.enabled = False
+
+    def reset(self):
+        """Обнулить накопленные замеры"""
+        for stats in self.timers.values():
+            stats.__init__()
+        self.counters.clear()
+
+    def _wrap(self, fn: Callable, timer_name: str, on_result: Optional[Callable]) -> Callable:
+        stats = self.timer(timer_name)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            result = fn(*args, **kwargs)
+            stats.add(clock() - start)
+            if on_result is not None:
+                on_result(self, result)
+            return result
+
+        return wrapper
+
+    # --- сбор ---
+
+    def timer(self, name: str) -> TimerStats:
+        stats = self.timers.get(name)
+        if stats is None:
+            stats = self.timers[name] = TimerStats()
+        return stats
+
+    def count(self, name: str, value: int = 1):
+        """Увеличить счетчик (только когда замеры включены)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def measure(self, name: str):
+        """Замерить произвольный участок кода"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timer(name).add(time.perf_counter_ns() - start)
+
+    # --- вывод ---
+
+    def summary_table(self) -> str:
+        """Таблица для консоли"""
+        lines = [f"{'Этап':<38} {'Вызовов':>9} {'Всего, с':>10} {'Среднее, мкс':>13} {'Макс, мкс':>11}",
+                 "-" * 85]
+        for name, stats in sorted(self.timers.items()):
+            if not stats.calls:
+                continue
+            d = stats.as_dict()
+            lines.append(f"{name:<38} {d['calls']:>9} {d['total_s']:>10.3f} {d['mean_us']:>13.1f} {d['max_us']:>11.1f}")
+        if self.counters:
+            lines.append("")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<38} {value:>9}")
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """Замеры в JSON"""
+        data = {
+            "timers": {name: stats.as_dict() for name, stats in sorted(self.timers.items()) if stats.calls},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Замеры в текстовом формате Prometheus"""
+        lines = [
+            "# HELP mafia_stage_seconds Time spent in pipeline stage",
+            "# TYPE mafia_stage_seconds summary",
+        ]
+        for name, stats in sorted(self.timers.items()):
+            if not stats.calls:
+                continue
+            lines.append(f'mafia_stage_seconds_count{{stage="{name}"}} {stats.calls}')
+            lines.append(f'mafia_stage_seconds_sum{{stage="{name}"}} {stats.total_ns / 1e9:.9f}')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE mafia_{name}_total counter")
+            lines.append(f"mafia_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Сохранить замеры: .json - JSON, .prom/.txt - Prometheus"""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Общий реестр приложения
+metrics = Metrics()
+
+
+@contextmanager
+def instrumented(registry: Metrics = metrics):
+    """Включить замеры на время блока"""
+    registry.enable()
+    try:
+        yield registry
+    finally:
+        registry.disable()
@@ -0,0 +1,180 @@
+"""
+Таблица лидеров, которая поддерживает порядок при каждом обновлении
+
+Игроки хранятся в индексируемом списке с пропусками (skip list): вставка,
+удаление, место игрока и k-й элемент - за O(log n). Сортировка всей
+таблицы при каждом запросе не нужна.
+
+Порядок тот же, что у SessionManager: по баллам, затем по числу игр
+(убывание), при равенстве - кто раньше появился. Лучший игрок - максимум
+баллов среди сыгравших min_games+ игр.
+"""
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key, value, levels: int):
+        self.key = key
+        self.value = value
+        self.next: List[Optional["_Node"]] = [None] * levels
+        self.width: List[int] = [1] * levels
+
+
+class IndexableSkipList:
+    """Упорядоченный список с доступом по индексу за O(log n)"""
+
+    MAX_LEVELS = 32
+
+    def __init__(self, seed: Optional[int] = None):
+        self._head = _Node(None, None, self.MAX_LEVELS)
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVELS and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key, value: Any = None):
+        """Вставить элемент с ключом key"""
+        chain: List[_Node] = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_level()
+        new_node = _Node(key, value, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        """Удалить элемент с ключом key"""
+        chain: List[_Node] = [None] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key) -> int:
+        """Индекс элемента с ключом key (с 0)"""
+        node = self._head
+        position = 0
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key <= key:
+                position += node.width[level]
+                node = node.next[level]
+        if node is self._head or node.key != key:
+            raise KeyError(key)
+        return position - 1
+
+    def __getitem__(self, index: int) -> Tuple[Any, Any]:
+        """(ключ, значение) элемента с индексом index"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        node = self._head
+        index += 1
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.width[level] <= index:
+                index -= node.width[level]
+                node = node.next[level]
+        return node.key, node.value
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key, node.value
+            node = node.next[0]
+
+
+class Leaderboard:
+    """Таблица лидеров с обновлением за O(log n) на результат"""
+
+    def __init__(self, min_games: int = 3):
+        self.min_games = min_games
+        self._order = IndexableSkipList()
+        self._qualified = IndexableSkipList()
+        self._keys: Dict[str, tuple] = {}
+        self._seq: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def update(self, stats):
+        """Обновить позицию игрока после изменения его PlayerStats"""
+        name = stats.name
+        old_key = self._keys.get(name)
+        if old_key is None:
+            self._seq[name] = len(self._seq)
+        else:
+            self._order.remove(old_key)
+            if old_key[3] >= self.min_games:
+                self._qualified.remove((old_key[0], old_key[2]))
+
+        seq = self._seq[name]
+        key = (-stats.total_points, -stats.games_played, seq, stats.games_played)
+        self._keys[name] = key
+        self._order.insert(key, stats)
+        if stats.games_played >= self.min_games:
+            self._qualified.insert((key[0], seq), stats)
+
+    def top(self, k: int) -> List:
+        """Первые k игроков таблицы"""
+        result = []
+        for _, stats in self._order:
+            if len(result) >= k:
+                break
+            result.append(stats)
+        return result
+
+    def all(self) -> List:
+        """Вся таблица по порядку"""
+        return [stats for _, stats in self._order]
+
+    def rank(self, name: str) -> int:
+        """Место игрока в таблице (с 1)"""
+        return self._order.rank(self._keys[name]) + 1
+
+    def at(self, place: int):
+        """Игрок на месте place (с 1)"""
+        return self._order[place - 1][1]
+
+    def best(self):
+        """Лучший игрок: максимум баллов среди сыгравших min_games+ игр"""
+        if not len(self._qualified):
+            return None
+        return self._qualified[0][1]
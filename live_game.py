@@ -0,0 +1,283 @@
+"""
+Игра как поток событий с пошаговым анализом
+
+Ведущий записывает события по ходу игры: уход голосованием днем, выстрел
+ночью, проверки Шерифа и Дона. LiveGame применяет каждое событие за O(1):
+обновляет число живых в командах, предварительного победителя, угадайку
+и возможность чистой/сухой победы. Текущее состояние можно показывать
+во время игры, а итоговый анализ готов сразу, без повторного разбора
+строк killed_when.
+
+Порядок событий - как в хронологии игры: день d, затем ночь d
+(1D, 1N, 2D, ...). Результат анализа совпадает с GameAnalyzer для той же
+игры.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from models import GameAnalysis, Player, RatingResult, Role, Team
+from rating_calculator import RatingCalculator
+
+
+class EventType(Enum):
+    """Типы событий игры"""
+    VOTE_OUT = "vote_out"            # Ушел голосованием днем
+    NIGHT_KILL = "night_kill"        # Убит ночью
+    SHERIFF_CHECK = "sheriff_check"  # Проверка Шерифа ночью
+    DON_CHECK = "don_check"          # Проверка Дона ночью
+
+
+# Фаза события в хронологии: день раньше ночи того же номера
+_DAY_EVENTS = (EventType.VOTE_OUT,)
+
+
+class GameEventError(ValueError):
+    """Событие не может быть применено к игре"""
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """Событие игры"""
+    kind: EventType
+    day: int     # Номер дня/ночи (с 1)
+    target: str  # Имя игрока, которого касается событие
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """Место в хронологии: (день, 0 - день / 1 - ночь)"""
+        return self.day, 0 if self.kind in _DAY_EVENTS else 1
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind.value, "day": self.day, "target": self.target}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameEvent":
+        try:
+            return cls(EventType(data["kind"]), int(data["day"]), str(data["target"]))
+        except (KeyError, ValueError, TypeError) as e:
+            raise GameEventError(f"некорректное событие {data!r}") from e
+
+
+@dataclass
+class LiveState:
+    """Состояние игры после последнего события"""
+    day: int
+    alive_civilians: int
+    alive_mafia: int
+    winner: Optional[Team]        # None - игра продолжается
+    is_guessing: bool             # Последнее голосование прошло при 3 игроках
+    guessing_next_vote: bool      # Следующее голосование будет угадайкой
+    clean_win_possible: bool      # Мирные еще могут победить чисто
+    dry_win_possible: bool        # Мафия еще может победить в сухую
+    black_checks: int
+    red_checks: int
+
+
+class LiveGame:
+    """Игра, которая строится из событий; анализ обновляется на каждом событии"""
+
+    GUESSING_PLAYERS = 3
+
+    def __init__(self, players: Iterable[Union[Player, Tuple[str, Role]]]):
+        self.players: List[Player] = []
+        for p in players:
+            name, role = (p.name, p.role) if isinstance(p, Player) else p
+            self.players.append(Player(name=name, role=role))
+        self._by_name: Dict[str, Player] = {p.name: p for p in self.players}
+        if len(self._by_name) != len(self.players):
+            raise GameEventError("имена игроков должны быть уникальны")
+
+        self.sheriff: Optional[Player] = next((p for p in self.players if p.role == Role.SHERIFF), None)
+        self.events: List[GameEvent] = []
+        self.don_checks: List[str] = []
+        self.total_mafia = sum(1 for p in self.players if p.get_team() == Team.MAFIA)
+        self.alive_mafia = self.total_mafia
+        self.alive_civilians = len(self.players) - self.total_mafia
+
+        self._position = (0, 0)
+        self._day = 0
+        self._day_start_alive = len(self.players)   # Живых к началу текущего дня
+        self._day_start_names: Optional[List[str]] = None
+        self._last_vote_alive = 0                    # Живых к началу дня последнего голосования
+        self._guessing_players: List[str] = []
+        self._mafia_voted_out = 0
+        self._mafia_killed_at_night = 0
+        self._civilians_voted_out = 0
+        self._black_checks = 0
+        self._red_checks = 0
+
+    @classmethod
+    def from_events(cls, players: Iterable[Union[Player, Tuple[str, Role]]],
+                    events: Iterable[Union[GameEvent, dict]]) -> "LiveGame":
+        """Восстановить игру по журналу событий"""
+        game = cls(players)
+        for event in events:
+            game.apply(event if isinstance(event, GameEvent) else GameEvent.from_dict(event))
+        return game
+
+    @classmethod
+    def from_players(cls, players: List[Player]) -> "LiveGame":
+        """
+        Построить журнал событий по завершенной игре
+
+        k-я проверка Шерифа ставится на k-ю ночь (но не позже его последней
+        ночи), проверки неизвестных игроков пропускаются - GameAnalyzer их
+        тоже не учитывает.
+        """
+        names = {p.name for p in players}
+        events = []
+        for order, p in enumerate(players):
+            day = p.get_kill_day()
+            if p.killed_by_vote() and day:
+                events.append((day, 0, 1, order, GameEvent(EventType.VOTE_OUT, day, p.name)))
+            elif p.killed_at_night() and day:
+                events.append((day, 1, 1, order, GameEvent(EventType.NIGHT_KILL, day, p.name)))
+
+            if p.role == Role.SHERIFF:
+                last_night = None
+                if p.killed_by_vote() and day:
+                    last_night = max(day - 1, 1)
+                elif p.killed_at_night() and day:
+                    last_night = day
+                for k, name in enumerate(p.checked_players, 1):
+                    name = name.strip()
+                    if name not in names:
+                        continue
+                    night = k if last_night is None else min(k, last_night)
+                    events.append((night, 1, 0, k, GameEvent(EventType.SHERIFF_CHECK, night, name)))
+
+        events.sort(key=lambda e: e[:4])
+        return cls.from_events(players, (e[4] for e in events))
+
+    # --- события ---
+
+    def apply(self, event: GameEvent):
+        """Применить событие (O(1))"""
+        if event.day < 1:
+            raise GameEventError(f"номер дня должен быть не меньше 1: {event.day}")
+        if event.position < self._position:
+            raise GameEventError(f"событие {event.day}-го дня пришло после событий {self._position[0]}-го")
+        target = self._by_name.get(event.target)
+        if target is None:
+            raise GameEventError(f"нет игрока {event.target}")
+
+        kind = event.kind
+        if kind in (EventType.VOTE_OUT, EventType.NIGHT_KILL) and not target.is_alive():
+            raise GameEventError(f"игрок {target.name} уже покинул игру")
+        if kind == EventType.SHERIFF_CHECK and self.sheriff is None:
+            raise GameEventError("в игре нет Шерифа")
+
+        if event.day > self._day:
+            self._start_day(event.day)
+        self._position = event.position
+
+        if kind == EventType.VOTE_OUT:
+            target.killed_when = f"{event.day}D"
+            self._remove(target)
+            if target.get_team() == Team.MAFIA:
+                self._mafia_voted_out += 1
+            else:
+                self._civilians_voted_out += 1
+            self._last_vote_alive = self._day_start_alive
+            if self._day_start_alive == self.GUESSING_PLAYERS:
+                self._guessing_players = list(self._day_start_names)
+            else:
+                self._guessing_players = []
+        elif kind == EventType.NIGHT_KILL:
+            target.killed_when = f"{event.day}N"
+            self._remove(target)
+            if target.get_team() == Team.MAFIA:
+                self._mafia_killed_at_night += 1
+        elif kind == EventType.SHERIFF_CHECK:
+            self.sheriff.checked_players.append(target.name)
+            if target.get_team() == Team.MAFIA:
+                self._black_checks += 1
+            else:
+                self._red_checks += 1
+        else:
+            self.don_checks.append(target.name)
+
+        self.events.append(event)
+
+    def vote_out(self, day: int, name: str):
+        self.apply(GameEvent(EventType.VOTE_OUT, day, name))
+
+    def night_kill(self, day: int, name: str):
+        self.apply(GameEvent(EventType.NIGHT_KILL, day, name))
+
+    def sheriff_check(self, day: int, name: str):
+        self.apply(GameEvent(EventType.SHERIFF_CHECK, day, name))
+
+    def don_check(self, day: int, name: str):
+        self.apply(GameEvent(EventType.DON_CHECK, day, name))
+
+    def _start_day(self, day: int):
+        self._day = day
+        self._day_start_alive = self.alive_mafia + self.alive_civilians
+        # Имена нужны только для угадайки, поэтому запоминаются только при 3 живых
+        self._day_start_names = (
+            [p.name for p in self.players if p.is_alive()]
+            if self._day_start_alive == self.GUESSING_PLAYERS else None
+        )
+
+    def _remove(self, player: Player):
+        if player.get_team() == Team.MAFIA:
+            self.alive_mafia -= 1
+        else:
+            self.alive_civilians -= 1
+
+    # --- состояние ---
+
+    @property
+    def winner(self) -> Optional[Team]:
+        """Победитель, если игра закончилась"""
+        if self.alive_mafia == 0:
+            return Team.CIVILIANS
+        if self.alive_civilians <= self.alive_mafia:
+            return Team.MAFIA
+        return None
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None
+
+    def state(self) -> LiveState:
+        """Текущее состояние для ведущего"""
+        return LiveState(
+            day=self._day,
+            alive_civilians=self.alive_civilians,
+            alive_mafia=self.alive_mafia,
+            winner=self.winner,
+            is_guessing=self._last_vote_alive == self.GUESSING_PLAYERS,
+            guessing_next_vote=self.alive_mafia + self.alive_civilians == self.GUESSING_PLAYERS,
+            clean_win_possible=self._civilians_voted_out == 0 and self._mafia_killed_at_night == 0,
+            dry_win_possible=self.alive_mafia == self.total_mafia,
+            black_checks=self._black_checks,
+            red_checks=self._red_checks,
+        )
+
+    def analysis(self) -> GameAnalysis:
+        """Итоговый анализ (тот же, что дает GameAnalyzer.analyze)"""
+        # Незаконченная игра, как и в GameAnalyzer, считается победой мирных
+        winner = self.winner or Team.CIVILIANS
+        return GameAnalysis(
+            winner=winner,
+            is_guessing=self._last_vote_alive == self.GUESSING_PLAYERS,
+            clean_civilian_win=(winner == Team.CIVILIANS
+                                and self._mafia_voted_out == self.total_mafia
+                                and self._civilians_voted_out == 0),
+            dry_mafia_win=winner == Team.MAFIA and self.alive_mafia == self.total_mafia,
+            alive_players_count=self.alive_mafia + self.alive_civilians,
+            guessing_players=list(self._guessing_players),
+        )
+
+    def get_sheriff_checks(self, sheriff: Player) -> Tuple[int, int]:
+        """(черные, красные) проверки Шерифа - как GameAnalyzer.get_sheriff_checks"""
+        if sheriff.role != Role.SHERIFF:
+            return (0, 0)
+        return (self._black_checks, self._red_checks)
+
+    def score(self) -> List[RatingResult]:
+        """Баллы игроков по текущему состоянию"""
+        return RatingCalculator(self.players, self.analysis(), self).calculate_all()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный генератор для сервиса подсчета (scoring_service.py)
+
+Несколько клиентов с постоянными соединениями отправляют игры из
+GameGenerator в POST /games и замеряют задержку каждого ответа. Итог -
+пропускная способность и перцентили задержки:
+
+    python3 load_generator.py --requests 10000 --concurrency 50
+    python3 load_generator.py --spawn          # поднять сервис в этом же процессе
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+from game_generator import GameGenerator
+
+
+def game_payloads(count: int, seed: int = 0) -> List[bytes]:
+    """Тела запросов POST /games с играми генератора"""
+    payloads = []
+    for number, players in enumerate(GameGenerator(seed).games(count), 1):
+        record = {"game": number, "players": [
+            {"name": p.name, "role": p.role.value, "killed_when": p.killed_when, "checks": p.checked_players}
+            for p in players
+        ]}
+        payloads.append(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+    return payloads
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host: str, port: int, payloads: List[bytes], next_index: List[int],
+                  latencies: List[float], errors: List[int]):
+    reader, writer = await asyncio.open_connection(host, port)
+    clock = time.perf_counter
+    try:
+        while next_index[0] < len(payloads):
+            body = payloads[next_index[0]]
+            next_index[0] += 1
+            request = (f"POST /games HTTP/1.1\r\nHost: {host}\r\n"
+                       "Content-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+            start = clock()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(clock() - start)
+            if status != 200:
+                errors[0] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(host: str, port: int, requests: int = 10_000, concurrency: int = 50,
+                   seed: int = 0, payloads: Optional[List[bytes]] = None) -> dict:
+    """Отправить requests игр с concurrency клиентов и вернуть замеры"""
+    payloads = payloads if payloads is not None else game_payloads(requests, seed)
+    latencies: List[float] = []
+    errors = [0]
+    next_index = [0]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, payloads, next_index, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "seconds": elapsed,
+        "throughput_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(50),
+        "p99_ms": percentile(99),
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def _spawn_and_run(args) -> dict:
+    from scoring_service import ScoringService
+
+    service = ScoringService(batch_window=args.batch_window_ms / 1000)
+    await service.start(args.host, 0)
+    try:
+        report = await run_load(args.host, service.port, args.requests, args.concurrency, args.seed)
+        report["service"] = service.stats()
+        return report
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный генератор сервиса подсчета")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=10_000, help="сколько игр отправить")
+    parser.add_argument("--concurrency", type=int, default=50, help="число одновременных клиентов")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="поднять сервис в этом же процессе")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0, help="окно пачки для --spawn (мс)")
+    args = parser.parse_args(argv)
+
+    if args.spawn:
+        report = asyncio.run(_spawn_and_run(args))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency, args.seed))
+
+    print(f"Запросов: {report['requests']}, ошибок: {report['errors']}")
+    print(f"Пропускная способность: {report['throughput_per_s']:,.0f} игр/с")
+    print(f"Задержка: p50 {report['p50_ms']:.1f} мс, p99 {report['p99_ms']:.1f} мс, макс {report['max_ms']:.1f} мс")
+    if "service" in report:
+        print(f"Пачек: {report['service']['batches']}, средний размер {report['service']['mean_batch']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,27 @@
 Точка входа в приложение
 """
 
+import argparse
+import sys
+from datetime import date
+
 from input_handler import InputHandler
 from game_analyzer import GameAnalyzer
 from rating_calculator import RatingCalculator
 from output_formatter import OutputFormatter
 from session_manager import SessionManager
 from session_output import SessionOutputFormatter
+from batch_loader import BatchLoader, score_games
+from game_archive import GameArchive, is_archive
+from season_ledger import SeasonLedger
+from parallel_rescore import rescore_jsonl
+from analysis_cache import AnalysisCache
+from instrumentation import metrics
+from report_renderers import RENDERERS, open_report
+from skill_rating import SkillRating
+from player_registry import registry
+from scoring_worker import ScoringWorker
+from day_journal import DayJournal, read_journal
 
 
 def get_games_count(input_handler: InputHandler) -> int:
@@ -34,14 +49,19 @@ def get_games_count(input_handler: InputHandler) -> int:
             print("Введите число!")
 
 
-def play_single_game(game_number: int, total_games: int, input_handler: InputHandler):
-    """Провести одну игру и вернуть результаты"""
+def play_single_game(game_number: int, total_games: int, input_handler: InputHandler,
+                     entered=None, on_seat=None):
+    """
+    Провести одну игру и вернуть результаты
+
+    entered и on_seat передаются в InputHandler.get_players (журнал дня)
+    """
     # Разделитель между играми
     session_formatter = SessionOutputFormatter()
     session_formatter.format_game_separator(game_number, total_games)
 
     # 1. Получаем данные от пользователя
-    players = input_handler.get_players()
+    players = input_handler.get_players(entered, on_seat)
 
     if not players:
         print("Не введено ни одного игрока. Пропускаем игру.")
@@ -62,36 +82,265 @@ def play_single_game(game_number: int, total_games: int, input_handler: InputHan
     return results
 
 
-def main():
-    """Главная функция приложения"""
+# Выгрузки Parquet/Arrow (columnar_export, pyarrow) нужны только для этих файлов
+_COLUMNAR_SUFFIXES = (".parquet", ".arrow", ".feather", ".ipc")
+
+
+def detect_import_format(path: str) -> str:
+    """Формат архива для --import: бинарный архив по сигнатуре, остальные - по расширению"""
+    if is_archive(path):
+        return "archive"
+    if path.lower().endswith(_COLUMNAR_SUFFIXES):
+        from columnar_export import detect_format as columnar_format
+        return columnar_format(path)
+    return BatchLoader.detect_format(path)
+
+
+def run_import(path: str, fmt: str = None, ledger: SeasonLedger = None, workers: int = 1,
+               cache: AnalysisCache = None, report_path: str = None, report_format: str = None,
+               skill: SkillRating = None, game_date: date = None):
+    """
+    Импортировать архив игр без интерактивного ввода и вывести итоговый рейтинг
+
+    report_path - записать отчет по всем играм и итоговую таблицу в файл
+    game_date - день для журнала сезона у игр без своей даты (по умолчанию - сегодня)
+    """
+    if fmt is None:
+        fmt = detect_import_format(path)
+    report = open_report(report_path, report_format) if report_path else None
+
+    # Параллельный пересчет - только для JSONL без журнала, кэша, отчета и рейтинга силы
+    sequential = [option for option, value in (("--ledger", ledger), ("--cache", cache),
+                                               ("--report", report), ("--skill", skill)) if value is not None]
+    if fmt != "jsonl":
+        sequential.insert(0, f"формат {fmt}")
+    if workers != 1 and sequential:
+        print(f"⚠️  --workers не используется ({', '.join(sequential)}): архив считается в одном процессе")
+
+    try:
+        if workers != 1 and not sequential:
+            session, issues = rescore_jsonl(path, workers or None)
+        else:
+            session = SessionManager(0, ledger, skill)
+            if fmt == "archive":
+                with GameArchive(path) as archive:
+                    _import_games(session, archive.imported_games(), cache, report, game_date)
+                issues = []
+            elif fmt in ("parquet", "arrow"):
+                from columnar_export import ColumnarReader
+                _import_games(session, ColumnarReader(path, fmt).imported_games(), cache, report, game_date)
+                issues = []
+            else:
+                with open(path, encoding="utf-8", newline="") as f:
+                    loader = BatchLoader(f, fmt)
+                    _import_games(session, loader.games(), cache, report, game_date)
+                issues = loader.issues
+            session.total_games = session.current_game
+
+        if report is not None:
+            report.write_standings(session)
+    finally:
+        if report is not None:
+            report.close()
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Кэш: попаданий {stats['hits'] + stats['disk_hits']}, промахов {stats['misses']}")
+
+    if issues:
+        print(f"⚠️  Пропущено некорректных записей: {len(issues)}")
+        for issue in issues:
+            print(f"   {issue}")
+
+    session_formatter = SessionOutputFormatter()
+    session_formatter.format_final_rating(session)
+    if skill is not None:
+        session_formatter.format_skill_ratings(session)
+
+
+def run_worker(socket_path: str = "", ledger: SeasonLedger = None, skill: SkillRating = None,
+               cache_path: str = None):
+    """Обрабатывать игры NDJSON из stdin (или Unix-сокета) до конца ввода"""
+    cache = AnalysisCache(disk_path=cache_path) if cache_path else None
+    worker = ScoringWorker(SessionManager(0, ledger, skill), cache)
+    try:
+        if socket_path:
+            worker.serve_unix(socket_path)
+        else:
+            worker.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _import_games(session: SessionManager, games, cache: AnalysisCache = None, report=None,
+                  game_date: date = None):
+    """Посчитать игры архива и добавить их в игровой день (дата из архива важнее game_date)"""
+    for game, analysis, results in score_games(games, cache):
+        session.add_game_results(results, analysis, game.game_date or game_date)
+        if report is not None:
+            report.write_game(results, analysis)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="Система рейтинга Мафии v2")
+    parser.add_argument("--import", dest="import_path", metavar="FILE",
+                        help="импортировать архив игр (JSONL, CSV, бинарный архив или выгрузка Parquet/Arrow) "
+                             "без интерактивного ввода")
+    parser.add_argument("--format", choices=("jsonl", "csv", "archive", "parquet", "arrow"),
+                        help="формат архива (по умолчанию - по расширению файла)")
+    parser.add_argument("--ledger", metavar="DB",
+                        help="сохранять игры в журнал сезона (файл SQLite)")
+    parser.add_argument("--date", type=date.fromisoformat, metavar="ГГГГ-ММ-ДД",
+                        help="день игр архива для журнала сезона, если в записи нет поля date "
+                             "(по умолчанию - сегодня)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="пересчитать архив JSONL в N процессах (0 - по числу ядер)")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="кэш посчитанных игр на диске для повторных импортов")
+    parser.add_argument("--aliases", metavar="FILE",
+                        help="псевдонимы игроков: JSON {\"имя\": [\"псевдоним\", ...]}")
+    parser.add_argument("--skill", metavar="FILE",
+                        help="вести долгосрочный рейтинг силы игроков (состояние в JSON-файле)")
+    parser.add_argument("--report", metavar="FILE",
+                        help="записать результаты всех игр архива и итоговую таблицу в файл")
+    parser.add_argument("--report-format", choices=tuple(RENDERERS),
+                        help="формат отчета (по умолчанию - по расширению файла)")
+    parser.add_argument("--worker", nargs="?", const="", metavar="SOCKET",
+                        help="обрабатывать игры NDJSON построчно: без SOCKET - stdin/stdout, "
+                             "иначе - Unix-сокет")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="записывать введенные места и игры в журнал дня для восстановления после сбоя")
+    parser.add_argument("--resume", metavar="FILE",
+                        help="восстановить игровой день из журнала и продолжить ввод (журнал дописывается)")
+    parser.add_argument("--metrics", nargs="?", const="", metavar="FILE",
+                        help="замерить этапы конвейера: без FILE - таблица в конце, "
+                             "FILE.json - JSON, иначе - текстовый формат Prometheus")
+    return parser.parse_args(argv)
+
+
+def report_metrics(path: str):
+    """Вывести или сохранить замеры этапов"""
+    if path:
+        metrics.dump(path)
+        print(f"\nЗамеры сохранены в {path}")
+    else:
+        print("\n" + metrics.summary_table())
+
+
+def run(args: argparse.Namespace):
+    """Запустить импорт архива или интерактивную сессию"""
+    if args.aliases:
+        registry.load_aliases(args.aliases)
+    # Обработчик на сокете пишет журнал из потоков соединений (по одному, под блокировкой)
+    ledger = SeasonLedger(args.ledger, check_same_thread=args.worker is None) if args.ledger else None
+    skill = SkillRating.load(args.skill) if args.skill else None
+    if args.worker is not None:
+        run_worker(args.worker, ledger, skill, args.cache)
+        if skill is not None:
+            skill.save(args.skill)
+        return
+    if args.import_path:
+        cache = AnalysisCache(disk_path=args.cache) if args.cache else None
+        try:
+            run_import(args.import_path, args.format, ledger, args.workers, cache,
+                       args.report, args.report_format, skill, args.date)
+        finally:
+            if cache is not None:
+                cache.close()
+        if skill is not None:
+            skill.save(args.skill)
+        return
+
+    journal_path = args.resume or args.journal
+    journal = None
     try:
         input_handler = InputHandler()
 
-        # 1. Запрашиваем количество игр
-        total_games = get_games_count(input_handler)
-        print(f"\n✅ Будет сыграно игр: {total_games}")
-        print()
+        if args.resume:
+            # 1-2. Восстанавливаем день из журнала (журнал сезона уже содержит эти игры)
+            state = read_journal(args.resume)
+            total_games = state.total_games
+            session = state.session(None if state.finished else skill)
+            session.ledger, session.skill = ledger, skill
+            pending = state.pending
+            print(f"\n✅ Восстановлено игр: {state.games_played} из {total_games}")
+            print()
+        else:
+            # 1. Запрашиваем количество игр
+            total_games = get_games_count(input_handler)
+            print(f"\n✅ Будет сыграно игр: {total_games}")
+            print()
 
-        # 2. Создаём менеджер сессии
-        session = SessionManager(total_games)
+            # 2. Создаём менеджер сессии
+            session = SessionManager(total_games, ledger, skill)
+            pending = []
+
+        if journal_path:
+            journal = DayJournal(journal_path)
+            if not args.resume:
+                journal.start_day(total_games)
 
         # 3. Проводим каждую игру
-        for game_num in range(1, total_games + 1):
-            results = play_single_game(game_num, total_games, input_handler)
+        for game_num in range(session.current_game + 1, total_games + 1):
+            on_seat = None
+            if journal is not None:
+                number = session.current_game + 1
+
+                def on_seat(seat, player, number=number):
+                    journal.log_seat(number, seat, player)
+
+            results = play_single_game(game_num, total_games, input_handler, pending, on_seat)
+            pending = []
 
             if results:
+                if journal is not None:
+                    journal.log_game(session.current_game + 1, results)
                 session.add_game_results(results)
 
+        if journal is not None:
+            journal.end_day()
+
         # 4. Выводим итоговый рейтинг
         session_formatter = SessionOutputFormatter()
         session_formatter.format_final_rating(session)
+        if skill is not None:
+            session_formatter.format_skill_ratings(session)
+            skill.save(args.skill)
 
     except KeyboardInterrupt:
         print("\n\nПрограмма прервана пользователем.")
+        _resume_hint(journal)
     except Exception as e:
         print(f"\n\nОшибка: {e}")
         import traceback
         traceback.print_exc()
+        _resume_hint(journal)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def _resume_hint(journal):
+    if journal is not None:
+        print(f"Введенные игры сохранены в журнале. Продолжить: python3 main.py --resume {journal.path}")
+
+
+def main(argv=None):
+    """Главная функция приложения"""
+    args = parse_args(argv)
+    if args.metrics is not None:
+        metrics.enable()
+        try:
+            run(args)
+        finally:
+            metrics.disable()
+            report_metrics(args.metrics)
+    else:
+        run(args)
 
 
 if __name__ == "__main__":
@@ -3,7 +3,10 @@
 """
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from scoring_rules import RuleSet
 
 
 class Role(Enum):
@@ -20,6 +23,23 @@ class Team(Enum):
     MAFIA = "Мафия"
 
 
+# Компактные коды для колоночного представления игр
+ROLE_CODES = {
+    Role.CIVILIAN: 0,
+    Role.SHERIFF: 1,
+    Role.MAFIA: 2,
+    Role.DON: 3,
+}
+ROLES_BY_CODE = {code: role for role, code in ROLE_CODES.items()}
+NO_ROLE = -1  # Пустое место за столом
+
+# Фаза убийства
+PHASE_ALIVE = 0
+PHASE_DAY = 1
+PHASE_NIGHT = 2
+PHASE_UNKNOWN = 3  # Убит, но фаза не указана
+
+
 @dataclass
 class Player:
     """Игрок в партии"""
@@ -49,6 +69,16 @@ class Player:
         except ValueError:
             return 0
 
+    def get_kill_phase(self) -> int:
+        """Получить код фазы убийства (PHASE_*)"""
+        if self.is_alive():
+            return PHASE_ALIVE
+        if self.killed_by_vote():
+            return PHASE_DAY
+        if self.killed_at_night():
+            return PHASE_NIGHT
+        return PHASE_UNKNOWN
+
     def get_team(self) -> Team:
         """Получить команду игрока"""
         if self.role in (Role.MAFIA, Role.DON):
@@ -76,16 +106,37 @@ class RatingBreakdown:
 
 @dataclass
 class RatingResult:
-    """Результат подсчета рейтинга для игрока"""
+    """
+    Результат подсчета рейтинга для игрока
+
+    Сработавшие правила хранятся битовой маской (бит i - i-е правило набора
+    rules), итог - готовым числом. Детализация с описаниями собирается
+    только при обращении к breakdowns, например для вывода.
+    """
     player: Player
-    breakdowns: List[RatingBreakdown] = field(default_factory=list)
+    rule_mask: int = 0
+    total_points: int = 0  # Итоговые баллы
+    rules: Optional["RuleSet"] = field(default=None, repr=False, compare=False)
+    extra: List[RatingBreakdown] = field(default_factory=list)  # Баллы вне правил (add_points)
 
     @property
-    def total_points(self) -> int:
-        """Итоговые баллы"""
-        return sum(b.points for b in self.breakdowns)
+    def breakdowns(self) -> List[RatingBreakdown]:
+        """Детализация начисления баллов"""
+        expanded = self.rules.breakdowns(self.rule_mask) if self.rule_mask else []
+        return expanded + self.extra
+
+    @property
+    def breakdown_count(self) -> int:
+        """Число строк детализации (без ее построения)"""
+        return bin(self.rule_mask).count("1") + len(self.extra)
+
+    def add_rules(self, mask: int, points: int):
+        """Отметить сработавшие правила (маска) и их сумму баллов"""
+        self.rule_mask |= mask
+        self.total_points += points
 
     def add_points(self, description: str, points: int):
-        """Добавить баллы"""
+        """Добавить баллы вне набора правил"""
         if points != 0:
-            self.breakdowns.append(RatingBreakdown(description, points))
+            self.extra.append(RatingBreakdown(description, points))
+            self.total_points += points
@@ -0,0 +1,193 @@
+"""
+Игровой день на нескольких столах одновременно
+
+На фестивале 10-40 столов играют параллельно. Каждый стол пишет результаты
+в свой шард (TableShard) - потоки столов не мешают друг другу: у шарда свой
+замок, который берет только его стол и изредка сводка. Шард копит
+приращения статистики с последнего слияния; сводная таблица
+(MultiTableSession) забирает их при чтении (или периодически в фоне) и
+обновляет позиции только изменившихся игроков - слияние стоит
+O(изменившихся игроков × log), а не пересчет всех столов.
+
+Столы в других процессах шлют те же приращения (TableShard.drain -
+список PlayerStats, он передается через pickle) и сводка применяет их
+через apply_delta. Каждое приращение применяется ровно один раз, поэтому
+итоговые суммы совпадают с последовательным подсчетом тех же игр.
+
+Сводка - обычный SessionManager: лучший игрок, места и вывод работают как
+для одного стола. При равенстве выше тот, кто раньше попал в сводку
+(шарды сливаются по порядку столов).
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from batch_loader import score_game
+from models import GameAnalysis, Player, RatingResult
+from player_registry import PlayerRegistry
+from session_manager import PlayerStats, SessionManager
+
+
+# (стол, сыграно игр, приращения статистики игроков по порядку появления)
+TableDelta = Tuple[str, int, List[PlayerStats]]
+
+
+class TableShard:
+    """Результаты одного стола"""
+
+    def __init__(self, table_id: str):
+        self.table_id = table_id
+        self.games = 0
+        self.stats: Dict[str, PlayerStats] = {}     # Итоги стола по именам
+        self._pending: Dict[str, PlayerStats] = {}  # Приращения с последнего drain
+        self._pending_games = 0
+        self._lock = threading.Lock()
+
+    def add_game_results(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None):
+        """Добавить результаты игры стола"""
+        with self._lock:
+            self.games += 1
+            self._pending_games += 1
+            for result in results:
+                name = result.player.name
+                points = result.total_points
+                total = self.stats.get(name)
+                if total is None:
+                    total = self.stats[name] = PlayerStats(name)
+                total.add_game_result(points)
+                delta = self._pending.get(name)
+                if delta is None:
+                    delta = self._pending[name] = PlayerStats(name)
+                delta.add_game_result(points)
+
+    def drain(self) -> TableDelta:
+        """Забрать приращения с прошлого вызова"""
+        with self._lock:
+            pending, games = self._pending, self._pending_games
+            self._pending, self._pending_games = {}, 0
+        return self.table_id, games, list(pending.values())
+
+
+class MultiTableSession:
+    """Сводная таблица игрового дня по всем столам"""
+
+    def __init__(self, registry: PlayerRegistry = None):
+        self.merged = SessionManager(0, registry=registry)
+        self.tables: Dict[str, TableShard] = {}
+        self.games_by_table: Dict[str, int] = {}
+        self._lock = threading.Lock()  # Слияние и чтение сводки
+        self._compactor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- запись ---
+
+    def table(self, table_id: str) -> TableShard:
+        """Шард стола (создается при первом обращении)"""
+        shard = self.tables.get(table_id)
+        if shard is None:
+            with self._lock:
+                shard = self.tables.setdefault(table_id, TableShard(table_id))
+        return shard
+
+    def add_game_results(self, table_id: str, results: List[RatingResult],
+                         analysis: Optional[GameAnalysis] = None):
+        """Добавить результаты игры за столом table_id"""
+        self.table(table_id).add_game_results(results, analysis)
+
+    def apply_delta(self, delta: TableDelta):
+        """Применить приращения стола (например, присланные другим процессом)"""
+        with self._lock:
+            self._apply(delta)
+
+    def _apply(self, delta: TableDelta):
+        table_id, games, players = delta
+        self.games_by_table[table_id] = self.games_by_table.get(table_id, 0) + games
+        self.merged.current_game += games
+        self.merged.total_games = self.merged.current_game
+        for partial in players:
+            self.merged.merge_player_stats(partial)
+
+    # --- слияние ---
+
+    def refresh(self) -> int:
+        """
+        Слить приращения всех шардов в сводку
+
+        Returns:
+            число обновленных строк таблицы
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        updated = 0
+        for shard in list(self.tables.values()):
+            delta = shard.drain()
+            if delta[1]:
+                self._apply(delta)
+                updated += len(delta[2])
+        return updated
+
+    def start_compaction(self, interval: float = 1.0):
+        """Сливать шарды в фоне каждые interval секунд"""
+        if self._compactor is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.refresh()
+
+        self._compactor = threading.Thread(target=loop, name="table-compaction", daemon=True)
+        self._compactor.start()
+
+    def close(self):
+        """Остановить фоновое слияние и слить остаток"""
+        if self._compactor is not None:
+            self._stop.set()
+            self._compactor.join()
+            self._compactor = None
+        self.refresh()
+
+    # --- чтение (как у SessionManager) ---
+
+    @property
+    def current_game(self) -> int:
+        """Сыграно игр на всех столах"""
+        with self._lock:
+            self._refresh()
+            return self.merged.current_game
+
+    def session(self) -> SessionManager:
+        """Сводка как SessionManager - для SessionOutputFormatter и отчетов"""
+        self.refresh()
+        return self.merged
+
+    def get_all_players(self) -> List[PlayerStats]:
+        with self._lock:
+            self._refresh()
+            return self.merged.get_all_players()
+
+    def get_top_players(self, k: int) -> List[PlayerStats]:
+        with self._lock:
+            self._refresh()
+            return self.merged.get_top_players(k)
+
+    def get_player_rank(self, name: str) -> int:
+        with self._lock:
+            self._refresh()
+            return self.merged.get_player_rank(name)
+
+    def get_best_player(self) -> Optional[PlayerStats]:
+        """Лучший игрок по всем столам (максимум баллов среди сыгравших 3+ игры)"""
+        with self._lock:
+            self._refresh()
+            return self.merged.get_best_player()
+
+
+def score_table(table_id: str, games: Iterable[List[Player]]) -> TableDelta:
+    """Посчитать игры стола в отдельном процессе и вернуть приращения для apply_delta"""
+    shard = TableShard(table_id)
+    for players in games:
+        analysis, results = score_game(players)
+        shard.add_game_results(results, analysis)
+    return shard.drain()
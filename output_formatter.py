@@ -9,47 +9,77 @@ class OutputFormatter:
     """Форматирует и выводит результаты на экран"""
 
     def print_results(self, results: List[RatingResult], analysis: GameAnalysis):
-        """Вывести результаты игры"""
-        print()
-        print("=" * 60)
-        print("РЕЗУЛЬТАТЫ ИГРЫ")
-        print("=" * 60)
-        print()
+        """Вывести результаты игры (одной записью в stdout)"""
+        print(self.format_results(results, analysis), end="")
+
+    def format_results(self, results: List[RatingResult], analysis: GameAnalysis) -> str:
+        """Результаты игры одной строкой - тот же текст, что выводит print_results"""
+        lines = [
+            "",
+            "=" * 60,
+            "РЕЗУЛЬТАТЫ ИГРЫ",
+            "=" * 60,
+            "",
+        ]
 
         # Информация об игре
-        print(f"🏆 Победитель: {analysis.winner.value}")
+        lines.append(f"🏆 Победитель: {analysis.winner.value}")
         if analysis.is_guessing:
-            print("🎲 Была угадайка!")
+            lines.append("🎲 Была угадайка!")
         if analysis.clean_civilian_win:
-            print("✨ Чистая победа мирных!")
+            lines.append("✨ Чистая победа мирных!")
         if analysis.dry_mafia_win:
-            print("💧 Победа мафии в сухую!")
-        print()
-        print("-" * 60)
+            lines.append("💧 Победа мафии в сухую!")
+        lines.append("")
+        lines.append("-" * 60)
 
         # Результаты по игрокам
         for result in results:
-            self._print_player_result(result)
-            print("-" * 60)
+            self._format_player_result(result, lines)
+            lines.append("-" * 60)
 
-        print()
+        lines.append("")
+        lines.append("")
+        return "\n".join(lines)
 
-    def _print_player_result(self, result: RatingResult):
-        """Вывести результат для одного игрока"""
+    def _format_player_result(self, result: RatingResult, lines: List[str]):
+        """Добавить в lines результат для одного игрока"""
         player = result.player
-        print()
-        print(f"👤 {player.name} ({player.role.value})")
+        lines.append("")
+        lines.append(f"👤 {player.name} ({player.role.value})")
 
         if result.breakdowns:
             for breakdown in result.breakdowns:
                 sign = "+" if breakdown.points >= 0 else ""
-                print(f"   {breakdown.description}: {sign}{breakdown.points}")
+                lines.append(f"   {breakdown.description}: {sign}{breakdown.points}")
         else:
-            print("   Нет начисленных баллов")
+            lines.append("   Нет начисленных баллов")
 
         # Итоговый балл
         total = result.total_points
         sign = "+" if total >= 0 else ""
-        print()
-        print(f"   ⭐ ИТОГО: {sign}{total}")
-        print()
+        lines.append("")
+        lines.append(f"   ⭐ ИТОГО: {sign}{total}")
+        lines.append("")
+
+    def format_live_state(self, state) -> str:
+        """Текущее состояние игры (LiveState) для ведущего"""
+        if state.winner is not None:
+            status = f"🏆 Игра окончена, победитель: {state.winner.value}"
+        else:
+            status = f"⏳ Идет {state.day or 1}-й день"
+        lines = [
+            status,
+            f"   Живы: мирных {state.alive_civilians}, мафии {state.alive_mafia}",
+            f"   Проверки Шерифа: черных {state.black_checks}, красных {state.red_checks}",
+        ]
+        if state.is_guessing:
+            lines.append("   🎲 Была угадайка")
+        elif state.guessing_next_vote and state.winner is None:
+            lines.append("   🎲 Следующее голосование - угадайка")
+        if state.winner is None:
+            if state.clean_win_possible:
+                lines.append("   ✨ Мирные еще могут победить чисто")
+            if state.dry_win_possible:
+                lines.append("   💧 Мафия еще может победить в сухую")
+        return "\n".join(lines) + "\n"
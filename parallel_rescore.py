@@ -0,0 +1,145 @@
+"""
+Параллельный пересчет архива на нескольких ядрах
+
+Архив делится на шарды фиксированного размера. Каждый шард разбирается и
+считается (GameAnalyzer + RatingCalculator) в отдельном процессе, результат
+шарда - частичная статистика игроков в порядке их появления. Шарды
+сливаются строго по порядку, поэтому итоговый рейтинг совпадает с
+последовательным пересчетом при любом числе процессов.
+"""
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models import Player, Role
+from batch_loader import BatchLoader, ImportIssue, score_game
+from session_manager import PlayerStats, SessionManager
+
+
+DEFAULT_SHARD_SIZE = 5000  # Игр (или строк JSONL) в одном шарде
+
+_ROLES_BY_VALUE = {role.value: role for role in Role}
+
+# (сыграно игр, статистика игроков по порядку появления, ошибки разбора)
+ShardResult = Tuple[int, List[PlayerStats], List[ImportIssue]]
+
+
+def _accumulate(games: Iterable[List[Player]]) -> Tuple[int, List[PlayerStats]]:
+    """Посчитать игры шарда и собрать частичную статистику игроков"""
+    stats = {}
+    count = 0
+    for players in games:
+        _, results = score_game(players)
+        count += 1
+        for result in results:
+            name = result.player.name
+            player_stats = stats.get(name)
+            if player_stats is None:
+                player_stats = stats[name] = PlayerStats(name)
+            player_stats.add_game_result(result.total_points)
+    return count, list(stats.values())
+
+
+def _pack(players: List[Player]) -> tuple:
+    """Упаковать игру в кортежи - их дешевле передавать между процессами"""
+    return tuple((p.name, p.role.value, p.killed_when, tuple(p.checked_players)) for p in players)
+
+
+def _unpack(game: tuple) -> List[Player]:
+    return [Player(name, _ROLES_BY_VALUE[role], killed_when, list(checked))
+            for name, role, killed_when, checked in game]
+
+
+def _score_packed_shard(games: List[tuple]) -> ShardResult:
+    count, stats = _accumulate(_unpack(game) for game in games)
+    return count, stats, []
+
+
+def _score_jsonl_shard(path: str, offset: int, first_line: int, lines: int) -> ShardResult:
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        loader = BatchLoader(islice(f, lines), "jsonl", first_line=first_line)
+        count, stats = _accumulate(game.players for game in loader.games())
+    return count, stats, loader.issues
+
+
+def _jsonl_shards(path: str, shard_lines: int) -> Iterator[Tuple[int, int, int]]:
+    """Границы шардов JSONL: (смещение в байтах, номер первой строки, число строк)"""
+    with open(path, "rb") as f:
+        offset = 0
+        line_num = 1
+        while True:
+            start, start_line = offset, line_num
+            lines = 0
+            for line in islice(f, shard_lines):
+                offset += len(line)
+                lines += 1
+            if not lines:
+                return
+            line_num += lines
+            yield start, start_line, lines
+
+
+def _ordered_results(executor: ProcessPoolExecutor, tasks: Iterable[tuple], window: int) -> Iterator[ShardResult]:
+    """Выполнять задачи в пуле, держа не больше window шардов в работе, и отдавать результаты по порядку"""
+    pending = deque()
+    for fn, *args in tasks:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def merge_shards(results: Iterable[ShardResult], session: Optional[SessionManager] = None
+                 ) -> Tuple[SessionManager, List[ImportIssue]]:
+    """Слить результаты шардов по порядку в одну таблицу"""
+    session = session or SessionManager(0)
+    issues: List[ImportIssue] = []
+    for count, stats, shard_issues in results:
+        session.current_game += count
+        for partial in stats:
+            session.merge_player_stats(partial)
+        issues.extend(shard_issues)
+    session.total_games = session.current_game
+    return session, issues
+
+
+def rescore_games(games: Iterable[List[Player]], workers: Optional[int] = None,
+                  shard_size: int = DEFAULT_SHARD_SIZE) -> SessionManager:
+    """Пересчитать готовые игры в пуле процессов"""
+    workers = workers or os.cpu_count() or 1
+
+    def tasks():
+        games_iter = iter(games)
+        while True:
+            shard = [_pack(players) for players in islice(games_iter, shard_size)]
+            if not shard:
+                return
+            yield _score_packed_shard, shard
+
+    if workers == 1:
+        session, _ = merge_shards(fn(*args) for fn, *args in tasks())
+        return session
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        session, _ = merge_shards(_ordered_results(executor, tasks(), workers * 2))
+    return session
+
+
+def rescore_jsonl(path: str, workers: Optional[int] = None,
+                  shard_size: int = DEFAULT_SHARD_SIZE) -> Tuple[SessionManager, List[ImportIssue]]:
+    """Пересчитать архив JSONL: каждый процесс сам читает и разбирает свой шард"""
+    workers = workers or os.cpu_count() or 1
+    tasks = ((_score_jsonl_shard, path, offset, first_line, lines)
+             for offset, first_line, lines in _jsonl_shards(path, shard_size))
+
+    if workers == 1:
+        return merge_shards(fn(*args) for fn, *args in tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return merge_shards(_ordered_results(executor, tasks, workers * 2))
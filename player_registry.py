@@ -0,0 +1,88 @@
+"""
+Реестр игроков: имя ↔ плотный целый номер
+
+Номера выдаются подряд с 0, поэтому статистику игроков можно хранить в
+списках, индексированных номером, а не в словарях по строкам. Псевдонимы
+(«Ваня» → «Иван») ведут на номер основного имени: результаты под любым из
+имен попадают одному игроку.
+
+Общий реестр процесса - player_registry.registry; его же использует
+CompactGame для хранения имен. Выдача новых номеров защищена блокировкой,
+поэтому реестр можно делить между потоками (рабочие потоки, столы).
+"""
+import json
+import threading
+from typing import Dict, List, Optional
+
+
+class PlayerRegistry:
+    """Таблица имен игроков с псевдонимами"""
+
+    def __init__(self):
+        self.names: List[str] = []       # Номер -> имя
+        self.ids: Dict[str, int] = {}    # Имя -> номер
+        self.aliases: Dict[str, int] = {}  # Псевдоним -> номер основного имени
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        """Номер имени как оно написано (без учета псевдонимов), добавив его при необходимости"""
+        player_id = self.ids.get(name)
+        if player_id is None:
+            # Новое имя: проверка и выдача номера - под блокировкой
+            with self._lock:
+                player_id = self.ids.get(name)
+                if player_id is None:
+                    self.names.append(name)
+                    player_id = self.ids[name] = len(self.names) - 1
+        return player_id
+
+    def resolve(self, name: str) -> int:
+        """Номер игрока с учетом псевдонимов"""
+        player_id = self.aliases.get(name)
+        if player_id is None:
+            player_id = self.intern(name)
+        return player_id
+
+    def find(self, name: str) -> Optional[int]:
+        """Номер игрока или None, если имя не встречалось"""
+        player_id = self.aliases.get(name)
+        return player_id if player_id is not None else self.ids.get(name)
+
+    def name(self, player_id: int) -> str:
+        """Основное имя игрока по номеру"""
+        return self.names[player_id]
+
+    def canonical(self, name: str) -> str:
+        """Основное имя для имени или псевдонима"""
+        player_id = self.aliases.get(name)
+        return self.names[player_id] if player_id is not None else name
+
+    def add_alias(self, alias: str, name: str) -> int:
+        """Считать alias другим именем игрока name (resolve предпочитает псевдоним)"""
+        player_id = self.resolve(name)
+        if alias != self.names[player_id]:
+            self.aliases[alias] = player_id
+        return player_id
+
+    def load_aliases(self, path: str) -> int:
+        """
+        Загрузить псевдонимы из JSON: {"основное имя": ["псевдоним", ...]}
+
+        Returns:
+            число загруженных псевдонимов
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        count = 0
+        for name, aliases in data.items():
+            for alias in aliases:
+                self.add_alias(alias, name)
+                count += 1
+        return count
+
+
+# Общий реестр процесса
+registry = PlayerRegistry()
@@ -0,0 +1,334 @@
+"""
+Отчеты о результатах игр в разных форматах: текст, JSON, CSV, HTML
+
+Рендерер собирает отчет в строки, ReportWriter пишет их потоком в файл с
+большим буфером: результаты каждой игры и итоговая таблица попадают в
+файл по мере подсчета, без print() на каждую строку. Текстовый формат -
+тот же, что выводится на экран (OutputFormatter, SessionOutputFormatter).
+
+    with open_report("season.html") as report:
+        for analysis, results in games:
+            report.write_game(results, analysis)
+        report.write_standings(session)
+"""
+import csv
+import html
+from abc import ABC, abstractmethod
+import io
+import json
+import os
+from typing import Dict, List, Optional, TextIO
+
+from models import GameAnalysis, RatingResult
+from output_formatter import OutputFormatter
+from session_manager import SessionManager
+from session_output import SessionOutputFormatter, format_game_results
+
+
+WRITE_BUFFER = 1 << 20
+
+
+def _best_and_qualified(session: SessionManager):
+    best = session.get_best_player()
+    return (best.name if best else None), session.leaderboard.min_games
+
+
+def game_to_dict(number: int, results: List[RatingResult], analysis: GameAnalysis) -> dict:
+    """Результаты игры в виде словаря для JSON"""
+    return {
+        "game": number,
+        "winner": analysis.winner.value,
+        "is_guessing": analysis.is_guessing,
+        "clean_civilian_win": analysis.clean_civilian_win,
+        "dry_mafia_win": analysis.dry_mafia_win,
+        "players": [
+            {
+                "name": r.player.name,
+                "role": r.player.role.value,
+                "killed_when": r.player.killed_when,
+                "total_points": r.total_points,
+                "breakdowns": [{"description": b.description, "points": b.points} for b in r.breakdowns],
+            }
+            for r in results
+        ],
+    }
+
+
+def standings_rows(session: SessionManager, limit: Optional[int] = None) -> List[dict]:
+    """Итоговая таблица в виде словарей для JSON (первые limit мест)"""
+    best_name, min_games = _best_and_qualified(session)
+    players = session.get_all_players() if limit is None else session.get_top_players(limit)
+    return [
+        {
+            "place": place,
+            "name": p.name,
+            "games_played": p.games_played,
+            "total_points": p.total_points,
+            "average_points": round(p.average_points(), 2),
+            "qualified": p.games_played >= min_games,
+            "best": p.name == best_name,
+            "game_results": list(p.game_results),
+        }
+        for place, p in enumerate(players, 1)
+    ]
+
+
+class Renderer(ABC):
+    """
+    Формат отчета
+
+    Отчет - это begin(), затем game() для каждой игры, затем standings()
+    (необязательно) и end(). Каждый метод возвращает готовый кусок текста.
+    Рендерер хранит состояние одного отчета, поэтому на отчет - свой объект.
+    """
+
+    name = ""
+    extension = ""
+
+    def begin(self) -> str:
+        return ""
+
+    @abstractmethod
+    def game(self, number: int, results: List[RatingResult], analysis: GameAnalysis) -> str:
+        """Результаты одной игры"""
+
+    @abstractmethod
+    def standings(self, session: SessionManager) -> str:
+        """Итоговая таблица сессии"""
+
+    def end(self) -> str:
+        return ""
+
+
+class TextRenderer(Renderer):
+    """Тот же текст, что выводится на экран"""
+
+    name = "text"
+    extension = ".txt"
+
+    def __init__(self):
+        self.formatter = OutputFormatter()
+        self.session_formatter = SessionOutputFormatter()
+
+    def game(self, number, results, analysis):
+        return (self.session_formatter.render_game_separator(number)
+                + self.formatter.format_results(results, analysis))
+
+    def standings(self, session):
+        return self.session_formatter.render_final_rating(session)
+
+
+class JsonRenderer(Renderer):
+    """Один документ JSON: {"games": [...], "standings": [...]}"""
+
+    name = "json"
+    extension = ".json"
+
+    def __init__(self):
+        self._games = 0
+        self._games_closed = False
+
+    def begin(self):
+        return '{"games": ['
+
+    def game(self, number, results, analysis):
+        prefix = "\n" if self._games == 0 else ",\n"
+        self._games += 1
+        return prefix + json.dumps(game_to_dict(number, results, analysis), ensure_ascii=False)
+
+    def _close_games(self) -> str:
+        if self._games_closed:
+            return ""
+        self._games_closed = True
+        return "\n]" if self._games else "]"
+
+    def standings(self, session):
+        rows = standings_rows(session)
+        return (self._close_games() + ',\n"total_games": ' + str(session.total_games)
+                + ',\n"standings": [\n' + ",\n".join(json.dumps(r, ensure_ascii=False) for r in rows) + "\n]")
+
+    def end(self):
+        return self._close_games() + "}\n"
+
+
+class CsvRenderer(Renderer):
+    """
+    Одна таблица: строки section=game - игроки каждой игры,
+    строки section=total - итоговая таблица
+    """
+
+    name = "csv"
+    extension = ".csv"
+    COLUMNS = ("section", "game", "place", "name", "role", "winner", "points", "games", "average", "details")
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def _flush(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def begin(self):
+        self._writer.writerow(self.COLUMNS)
+        return self._flush()
+
+    def game(self, number, results, analysis):
+        winner = analysis.winner.value
+        self._writer.writerows(
+            ("game", number, "", r.player.name, r.player.role.value, winner, r.total_points, "", "",
+             "; ".join(f"{b.description}: {b.points:+d}" for b in r.breakdowns))
+            for r in results
+        )
+        return self._flush()
+
+    def standings(self, session):
+        best_name, _ = _best_and_qualified(session)
+        self._writer.writerows(
+            ("total", "", place, p.name, "", "", p.total_points, p.games_played, f"{p.average_points():.2f}",
+             "best" if p.name == best_name else "")
+            for place, p in enumerate(session.get_all_players(), 1)
+        )
+        return self._flush()
+
+
+class HtmlRenderer(Renderer):
+    """Страница HTML с таблицей на каждую игру и итоговой таблицей"""
+
+    name = "html"
+    extension = ".html"
+
+    def begin(self):
+        return ("<!DOCTYPE html>\n<html lang=\"ru\">\n<head>\n<meta charset=\"utf-8\">\n"
+                "<title>Рейтинг Мафии</title>\n<style>\n"
+                "table { border-collapse: collapse; margin-bottom: 1em; }\n"
+                "th, td { border: 1px solid #ccc; padding: 2px 8px; }\n"
+                "td.num { text-align: right; }\n"
+                "tr.best { font-weight: bold; }\n"
+                "</style>\n</head>\n<body>\n")
+
+    def game(self, number, results, analysis):
+        esc = html.escape
+        flags = [analysis.winner.value]
+        if analysis.is_guessing:
+            flags.append("угадайка")
+        if analysis.clean_civilian_win:
+            flags.append("чистая победа мирных")
+        if analysis.dry_mafia_win:
+            flags.append("победа мафии в сухую")
+
+        parts = [f"<section>\n<h2>Игра {number}</h2>\n<p>{esc(', '.join(flags))}</p>\n<table>\n"
+                 "<tr><th>Игрок</th><th>Роль</th><th>Начисления</th><th>Итого</th></tr>\n"]
+        for r in results:
+            details = "<br>".join(f"{esc(b.description)}: {b.points:+d}" for b in r.breakdowns)
+            parts.append(f"<tr><td>{esc(r.player.name)}</td><td>{esc(r.player.role.value)}</td>"
+                         f"<td>{details}</td><td class=\"num\">{r.total_points:+d}</td></tr>\n")
+        parts.append("</table>\n</section>\n")
+        return "".join(parts)
+
+    def standings(self, session):
+        esc = html.escape
+        best_name, min_games = _best_and_qualified(session)
+        parts = [f"<section>\n<h2>Итоговый рейтинг</h2>\n<p>Всего сыграно игр: {session.total_games}</p>\n"
+                 "<table>\n<tr><th>№</th><th>Игрок</th><th>Игры</th><th>Очки</th><th>Среднее</th>"
+                 "<th>Результаты по играм</th></tr>\n"]
+        for place, p in enumerate(session.get_all_players(), 1):
+            css = ' class="best"' if p.name == best_name else ""
+            parts.append(f"<tr{css}><td class=\"num\">{place}</td><td>{esc(p.name)}</td>"
+                         f"<td class=\"num\">{p.games_played}</td><td class=\"num\">{p.total_points}</td>"
+                         f"<td class=\"num\">{p.average_points():.2f}</td>"
+                         f"<td>{format_game_results(p.game_results)}</td></tr>\n")
+        parts.append("</table>\n</section>\n")
+        return "".join(parts)
+
+    def end(self):
+        return "</body>\n</html>\n"
+
+
+RENDERERS: Dict[str, type] = {
+    cls.name: cls for cls in (TextRenderer, JsonRenderer, CsvRenderer, HtmlRenderer)
+}
+
+
+def detect_report_format(path: str) -> str:
+    """Формат отчета по расширению файла (по умолчанию - текст)"""
+    ext = os.path.splitext(path)[1].lower()
+    for name, cls in RENDERERS.items():
+        if cls.extension == ext:
+            return name
+    if ext == ".htm":
+        return "html"
+    return "text"
+
+
+def get_renderer(fmt: str) -> Renderer:
+    """Новый рендерер для отчета в формате fmt"""
+    try:
+        return RENDERERS[fmt]()
+    except KeyError:
+        raise ValueError(f"Неизвестный формат отчета: {fmt}") from None
+
+
+class ReportWriter:
+    """Потоковая запись отчета в текстовый поток"""
+
+    def __init__(self, stream: TextIO, fmt: str = "text", close_stream: bool = False):
+        self.stream = stream
+        self.renderer = get_renderer(fmt)
+        self.games_written = 0
+        self._close_stream = close_stream
+        self._closed = False
+        self.stream.write(self.renderer.begin())
+
+    def write_game(self, results: List[RatingResult], analysis: GameAnalysis):
+        """Добавить в отчет результаты очередной игры"""
+        self.games_written += 1
+        self.stream.write(self.renderer.game(self.games_written, results, analysis))
+
+    def write_standings(self, session: SessionManager):
+        """Добавить в отчет итоговую таблицу"""
+        self.stream.write(self.renderer.standings(session))
+
+    def close(self):
+        """Завершить отчет"""
+        if self._closed:
+            return
+        self._closed = True
+        self.stream.write(self.renderer.end())
+        if self._close_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_report(path: str, fmt: Optional[str] = None) -> ReportWriter:
+    """Открыть файл отчета (формат - по расширению, если не задан)"""
+    fmt = fmt or detect_report_format(path)
+    get_renderer(fmt)  # Проверить формат до создания файла
+    stream = open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+    return ReportWriter(stream, fmt, close_stream=True)
+
+
+def render_report(games, session: Optional[SessionManager] = None, fmt: str = "text") -> str:
+    """
+    Отчет целиком одной строкой
+
+    Args:
+        games: пары (results, analysis)
+        session: итоговая таблица (если нужна)
+    """
+    buffer = io.StringIO()
+    with ReportWriter(buffer, fmt) as report:
+        for results, analysis in games:
+            report.write_game(results, analysis)
+        if session is not None:
+            report.write_standings(session)
+    return buffer.getvalue()
@@ -0,0 +1,75 @@
+"""
+Журнал результатов мест для аудита
+
+Результат места хранится тремя числами в плоских массивах: номер игрока
+в реестре (4 байта), маска сработавших правил (4 байта, 8 - если правил
+больше 32) и итог (2 байта). Миллион мест занимает ~10 МБ вместо объектов
+RatingResult с детализацией. Описания правил разворачиваются из маски
+только при выводе (RuleSet.breakdowns).
+"""
+from array import array
+from typing import List, Tuple
+
+from models import RatingBreakdown, RatingResult
+from player_registry import PlayerRegistry, registry as default_registry
+from scoring_rules import RuleSet, RuleSetError, default_rules
+
+
+class ResultLog:
+    """Результаты мест всех игр в компактном виде"""
+
+    def __init__(self, rules: RuleSet = None, registry: PlayerRegistry = None):
+        self.rules = rules or default_rules()
+        self.registry = registry or default_registry
+        if len(self.rules.rules) > 64:
+            raise RuleSetError("в маске помещается не больше 64 правил")
+        self.player_ids = array("I")
+        self.masks = array("I" if len(self.rules.rules) <= 32 else "Q")
+        self.totals = array("h")
+        self.game_starts = array("I")  # Номер первого места каждой игры
+
+    def add_game(self, results: List[RatingResult]):
+        """Записать результаты одной игры"""
+        for result in results:
+            if result.rules is not None and result.rules is not self.rules:
+                raise ValueError(f"{result.player.name}: результат посчитан по другому набору правил")
+            if result.extra:
+                raise ValueError(f"{result.player.name}: баллы вне правил не кодируются маской")
+        self.game_starts.append(len(self.totals))
+        resolve = self.registry.resolve
+        for result in results:
+            self.player_ids.append(resolve(result.player.name))
+            self.masks.append(result.rule_mask)
+            self.totals.append(result.total_points)
+
+    def __len__(self) -> int:
+        """Число записанных мест"""
+        return len(self.totals)
+
+    @property
+    def games(self) -> int:
+        return len(self.game_starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Память массивов журнала"""
+        return sum(a.itemsize * len(a) for a in (self.player_ids, self.masks, self.totals, self.game_starts))
+
+    def seats(self, game: int) -> range:
+        """Номера мест игры game"""
+        stop = self.game_starts[game + 1] if game + 1 < len(self.game_starts) else len(self.totals)
+        return range(self.game_starts[game], stop)
+
+    def player(self, seat: int) -> str:
+        return self.registry.name(self.player_ids[seat])
+
+    def total(self, seat: int) -> int:
+        return self.totals[seat]
+
+    def breakdowns(self, seat: int) -> List[RatingBreakdown]:
+        """Детализация баллов места"""
+        return self.rules.breakdowns(self.masks[seat])
+
+    def game_results(self, game: int) -> List[Tuple[str, int, List[RatingBreakdown]]]:
+        """Игра для вывода: (игрок, итог, детализация) по местам"""
+        return [(self.player(seat), self.totals[seat], self.breakdowns(seat)) for seat in self.seats(game)]
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Таблицы за произвольный период: неделя, месяц, последние N игровых дней
+
+Для каждого игрока хранятся накопительные суммы по игровым дням (баллы,
+игры, победы, игры по ролям): строка дня d - итог игрока по день d
+включительно. Итог за период [from, to] - разность двух строк, найденных
+двоичным поиском по дням игрока, поэтому таблица за любой период (и лучший
+игрок с правилом 3+ игр) строится за O(игроков · log дней) без пересчета игр.
+
+Игры обычно приходят по порядку дней - тогда добавление O(1). Игра задним
+числом сдвигает суммы последующих дней игрока.
+
+    python3 rolling_standings.py season.db --month 2026-10
+    python3 rolling_standings.py season.db --last-days 30
+"""
+import argparse
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from models import GameAnalysis, RatingResult, Role, ROLE_CODES, ROLES_BY_CODE
+from game_analyzer import GameAnalyzer
+from player_registry import PlayerRegistry, registry as default_registry
+
+
+# Поля строки накопительных сумм
+POINTS, GAMES, WINS = 0, 1, 2
+_ROLE_FIELD = 3  # Далее - игры по кодам ролей
+N_FIELDS = _ROLE_FIELD + len(ROLE_CODES)
+_ZERO = [0] * N_FIELDS
+
+
+@dataclass
+class WindowStanding:
+    """Строка таблицы за период"""
+    player: str
+    total_points: int
+    games_played: int
+    wins: int
+    role_games: Dict[Role, int] = field(default_factory=dict)
+
+    def average_points(self) -> float:
+        """Средний балл за игру"""
+        if self.games_played == 0:
+            return 0.0
+        return self.total_points / self.games_played
+
+
+class RollingStandings:
+    """Накопительные суммы игроков по игровым дням"""
+
+    def __init__(self, registry: PlayerRegistry = None, min_games: int = 3):
+        self.registry = registry or default_registry
+        self.min_games = min_games
+        self.game_days: List[int] = []           # Все игровые дни (ординалы дат) по возрастанию
+        self.player_ids: List[int] = []          # Игроки в порядке появления
+        self._days: Dict[int, List[int]] = {}    # Игрок -> его игровые дни по возрастанию
+        self._sums: Dict[int, List[List[int]]] = {}  # Игрок -> накопительные строки по этим дням
+        self._first: Dict[int, List[int]] = {}   # Игрок -> номер его первого места в каждый день
+        self._seats = 0                          # Счетчик мест всех игр - порядок появления
+
+    # --- запись ---
+
+    def add_game(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None,
+                 game_date: Optional[date] = None):
+        """Учесть игру дня game_date (по умолчанию - сегодня)"""
+        if analysis is None:
+            analysis = GameAnalyzer([r.player for r in results]).analyze()
+        day = (game_date or date.today()).toordinal()
+        winner = analysis.winner
+        for result in results:
+            player = result.player
+            self._add(self.registry.resolve(player.name), day, result.total_points,
+                      player.get_team() == winner, ROLE_CODES[player.role])
+
+    def _add(self, pid: int, day: int, points: int, won: bool, role_code: int):
+        seat = self._seats
+        self._seats += 1
+        days = self._days.get(pid)
+        if days is None:
+            days = self._days[pid] = []
+            self._sums[pid] = []
+            self._first[pid] = []
+            self.player_ids.append(pid)
+        sums = self._sums[pid]
+
+        if not days or day > days[-1]:
+            # Обычный случай: новый день позже всех - строка = прошлая + игра
+            days.append(day)
+            sums.append(list(sums[-1]) if sums else list(_ZERO))
+            self._first[pid].append(seat)
+            if not self.game_days or day > self.game_days[-1]:
+                self.game_days.append(day)
+            elif self.game_days[bisect_left(self.game_days, day)] != day:
+                insort(self.game_days, day)
+            start = len(days) - 1
+        else:
+            start = bisect_left(days, day)
+            if days[start] != day:
+                # Игра задним числом: новая строка = строка предыдущего дня
+                days.insert(start, day)
+                sums.insert(start, list(sums[start - 1]) if start else list(_ZERO))
+                self._first[pid].insert(start, seat)
+                i = bisect_left(self.game_days, day)
+                if i == len(self.game_days) or self.game_days[i] != day:
+                    self.game_days.insert(i, day)
+
+        for row in sums[start:]:
+            row[POINTS] += points
+            row[GAMES] += 1
+            row[WINS] += won
+            row[_ROLE_FIELD + role_code] += 1
+
+    @classmethod
+    def from_ledger(cls, ledger, registry: PlayerRegistry = None, min_games: int = 3) -> "RollingStandings":
+        """Построить по журналу сезона (SeasonLedger)"""
+        standings = cls(registry, min_games)
+        role_codes = {role.value: code for role, code in ROLE_CODES.items()}
+        resolve = standings.registry.resolve
+        for player, game_date, role, won, points in ledger.conn.execute(
+                "SELECT s.player, g.game_date, s.role, s.won, s.points FROM seat_results s"
+                " JOIN games g ON g.id = s.game_id ORDER BY s.game_id, s.seat"):
+            standings._add(resolve(player), date.fromisoformat(game_date).toordinal(),
+                           points, bool(won), role_codes[role])
+        return standings
+
+    # --- запросы ---
+
+    def _window(self, pid: int, lo: int, hi: int) -> Optional[Tuple[List[int], Tuple[int, int]]]:
+        """Суммы игрока за дни [lo, hi] и его первое появление в периоде: (день, место)"""
+        days = self._days[pid]
+        i = bisect_left(days, lo)
+        j = bisect_right(days, hi)
+        if i == j:
+            return None
+        sums = self._sums[pid]
+        upper = sums[j - 1]
+        lower = sums[i - 1] if i else _ZERO
+        return [u - l for u, l in zip(upper, lower)], (days[i], self._first[pid][i])
+
+    def _rows(self, start: Optional[date], end: Optional[date]) -> List[Tuple[int, List[int], Tuple[int, int]]]:
+        lo = start.toordinal() if start else 1
+        hi = end.toordinal() if end else date.max.toordinal()
+        rows = []
+        for pid in self.player_ids:
+            window = self._window(pid, lo, hi)
+            if window is not None:
+                rows.append((pid, *window))
+        return rows
+
+    def _standing(self, pid: int, sums: List[int]) -> WindowStanding:
+        return WindowStanding(
+            player=self.registry.name(pid),
+            total_points=sums[POINTS],
+            games_played=sums[GAMES],
+            wins=sums[WINS],
+            role_games={ROLES_BY_CODE[code]: sums[_ROLE_FIELD + code]
+                        for code in range(len(ROLE_CODES)) if sums[_ROLE_FIELD + code]},
+        )
+
+    def standings(self, start: Optional[date] = None, end: Optional[date] = None,
+                  limit: Optional[int] = None) -> List[WindowStanding]:
+        """
+        Таблица за дни [start, end] включительно (None - без границы)
+
+        По баллам, затем по числу игр (убывание); при равенстве выше тот,
+        кто раньше появился в периоде - как SessionManager, в который игры
+        периода добавлены по порядку дней.
+        """
+        rows = self._rows(start, end)
+        rows.sort(key=lambda row: (-row[1][POINTS], -row[1][GAMES], row[2]))
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._standing(pid, sums) for pid, sums, _ in rows]
+
+    def best_player(self, start: Optional[date] = None, end: Optional[date] = None) -> Optional[WindowStanding]:
+        """Лучший игрок периода: максимум баллов среди сыгравших min_games+ игр"""
+        best = None
+        for pid, sums, first in self._rows(start, end):
+            if sums[GAMES] >= self.min_games and (
+                    best is None or (-sums[POINTS], first) < (-best[1][POINTS], best[2])):
+                best = (pid, sums, first)
+        return self._standing(best[0], best[1]) if best else None
+
+    # --- периоды ---
+
+    @staticmethod
+    def week(day: date) -> Tuple[date, date]:
+        """Неделя (пн-вс), в которую попадает day"""
+        monday = day - timedelta(days=day.weekday())
+        return monday, monday + timedelta(days=6)
+
+    @staticmethod
+    def month(year: int, month: int) -> Tuple[date, date]:
+        """Календарный месяц"""
+        first = date(year, month, 1)
+        following = date(year + month // 12, month % 12 + 1, 1)
+        return first, following - timedelta(days=1)
+
+    def last_game_days(self, n: int, until: Optional[date] = None) -> Tuple[Optional[date], Optional[date]]:
+        """Последние n игровых дней (по until включительно)"""
+        end = bisect_right(self.game_days, until.toordinal()) if until else len(self.game_days)
+        if end == 0 or n <= 0:
+            return None, until
+        return date.fromordinal(self.game_days[max(end - n, 0)]), date.fromordinal(self.game_days[end - 1])
+
+
+def main(argv=None):
+    from season_ledger import SeasonLedger
+
+    parser = argparse.ArgumentParser(description="Таблица за период по журналу сезона")
+    parser.add_argument("ledger", help="журнал сезона (файл SQLite)")
+    period = parser.add_mutually_exclusive_group()
+    period.add_argument("--week", metavar="ДАТА", help="неделя, в которую попадает дата (ГГГГ-ММ-ДД)")
+    period.add_argument("--month", metavar="ГГГГ-ММ")
+    period.add_argument("--last-days", type=int, metavar="N", help="последние N игровых дней")
+    parser.add_argument("--from", dest="start", metavar="ДАТА")
+    parser.add_argument("--to", dest="end", metavar="ДАТА")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    ledger = SeasonLedger(args.ledger)
+    try:
+        rolling = RollingStandings.from_ledger(ledger)
+    finally:
+        ledger.close()
+
+    start = date.fromisoformat(args.start) if args.start else None
+    end = date.fromisoformat(args.end) if args.end else None
+    if args.week:
+        start, end = rolling.week(date.fromisoformat(args.week))
+    elif args.month:
+        year, month = map(int, args.month.split("-"))
+        start, end = rolling.month(year, month)
+    elif args.last_days:
+        start, end = rolling.last_game_days(args.last_days, end)
+
+    print(f"Период: {start or '…'} - {end or '…'}")
+    best = rolling.best_player(start, end)
+    if best:
+        print(f"🏆 Лучший игрок: {best.player} ({best.total_points} баллов, {best.games_played} игр)")
+    print(f"{'Место':>5} {'Игрок':<20} {'Игры':>5} {'Победы':>6} {'Баллы':>6}")
+    print("-" * 46)
+    for place, row in enumerate(rolling.standings(start, end, args.top), 1):
+        print(f"{place:>5} {row.player:<20} {row.games_played:>5} {row.wins:>6} {row.total_points:>6}")
+
+
+if __name__ == "__main__":
+    main()
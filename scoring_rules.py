@@ -0,0 +1,198 @@
+"""
+Декларативные правила начисления баллов
+
+Правила описаны в версионируемом файле scoring_rules.json и при загрузке
+компилируются в таблицу. Индекс таблицы - код роли и флаги места:
+
+    победил, жив, чистая победа, победа в сухую, участник угадайки,
+    покинул игру голосованием в 1-й или 2-й день
+
+Значение - сумма баллов и список сработавших правил (для детализации),
+плюс правила по проверкам Шерифа, которые зависят от числа проверок и
+считаются отдельным слагаемым.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from models import RatingBreakdown, Role, ROLE_CODES
+
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_rules.json")
+
+# Флаги места в порядке от старшего бита к младшему
+FLAGS = ("won", "alive", "clean_win", "dry_win", "guessing", "left_early")
+CHECK_CONDITIONS = ("min_black_checks", "min_red_checks")
+
+FLAG_BITS = len(FLAGS)
+TABLE_SIZE = len(ROLE_CODES) << FLAG_BITS
+
+_ROLES_BY_VALUE = {role.value: role for role in Role}
+
+
+class RuleSetError(ValueError):
+    """Ошибка в описании правил"""
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    """Одно правило начисления баллов"""
+    rule_id: str
+    description: str
+    points: int
+    roles: FrozenSet[Role]
+    flags: Tuple[Tuple[str, bool], ...] = ()  # Требуемые значения флагов места
+    min_black_checks: int = 0
+    min_red_checks: int = 0
+
+    @property
+    def is_check_rule(self) -> bool:
+        """Правило зависит от проверок Шерифа"""
+        return self.min_black_checks > 0 or self.min_red_checks > 0
+
+    def matches(self, role: Role, seat_flags: Dict[str, bool]) -> bool:
+        """Подходит ли правило месту (без учета проверок)"""
+        return role in self.roles and all(seat_flags[name] == value for name, value in self.flags)
+
+    def checks_passed(self, black_checks: int, red_checks: int) -> bool:
+        """Выполнены ли условия по проверкам"""
+        return black_checks >= self.min_black_checks and red_checks >= self.min_red_checks
+
+
+def seat_key(role_code: int, won: bool, alive: bool, clean_win: bool, dry_win: bool,
+             guessing: bool, left_early: bool) -> int:
+    """Индекс места в скомпилированной таблице (флаги приводятся к 0/1)"""
+    return ((role_code << FLAG_BITS) | (int(bool(won)) << 5) | (int(bool(alive)) << 4)
+            | (int(bool(clean_win)) << 3) | (int(bool(dry_win)) << 2)
+            | (int(bool(guessing)) << 1) | int(bool(left_early)))
+
+
+def key_flags(key: int) -> Dict[str, bool]:
+    """Флаги места по индексу таблицы"""
+    return {name: bool(key >> (FLAG_BITS - 1 - i) & 1) for i, name in enumerate(FLAGS)}
+
+
+@dataclass(frozen=True)
+class TableEntry:
+    """Ячейка скомпилированной таблицы"""
+    points: int                             # Сумма баллов без учета проверок
+    rules: Tuple[ScoringRule, ...]          # Сработавшие правила по порядку
+    check_rules: Tuple[ScoringRule, ...]    # Правила по проверкам, подходящие месту
+    mask: int = 0                           # Биты сработавших правил с ненулевыми баллами
+    check_bits: Tuple[int, ...] = ()        # Биты правил check_rules
+
+
+class RuleSet:
+    """Скомпилированный набор правил"""
+
+    def __init__(self, rules: List[ScoringRule], version: str = ""):
+        self.version = version
+        self.rules = tuple(rules)
+        ids = [rule.rule_id for rule in self.rules]
+        if len(set(ids)) != len(ids):
+            raise RuleSetError("id правил должны быть уникальны")
+        self.bits = {rule_id: bit for bit, rule_id in enumerate(ids)}  # id правила -> бит маски
+        # Порядок детализации как при начислении: сначала правила места, затем проверки
+        self._expand_order = ([bit for bit, rule in enumerate(self.rules) if not rule.is_check_rule]
+                              + [bit for bit, rule in enumerate(self.rules) if rule.is_check_rule])
+        self.table: List[TableEntry] = [self._compile_entry(key) for key in range(TABLE_SIZE)]
+        # Отпечаток содержимого правил: version ведется вручную и может не
+        # меняться при правке баллов, поэтому кэши и журналы сверяют digest
+        payload = json.dumps(self.to_dict(), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        self.digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _compile_entry(self, key: int) -> TableEntry:
+        role = next(r for r, code in ROLE_CODES.items() if code == key >> FLAG_BITS)
+        flags = key_flags(key)
+        matched = [rule for rule in self.rules if rule.matches(role, flags)]
+        base = tuple(rule for rule in matched if not rule.is_check_rule)
+        checks = tuple(rule for rule in matched if rule.is_check_rule)
+        mask = 0
+        for rule in base:
+            if rule.points:
+                mask |= 1 << self.bits[rule.rule_id]
+        return TableEntry(sum(rule.points for rule in base), base, checks, mask,
+                          tuple(self.bits[rule.rule_id] for rule in checks))
+
+    def lookup(self, key: int) -> TableEntry:
+        return self.table[key]
+
+    def breakdowns(self, mask: int) -> List[RatingBreakdown]:
+        """Развернуть маску сработавших правил в детализацию"""
+        rules = self.rules
+        return [RatingBreakdown(rules[bit].description, rules[bit].points)
+                for bit in self._expand_order if mask >> bit & 1]
+
+    def mask_points(self, mask: int) -> int:
+        """Сумма баллов правил маски"""
+        return sum(rule.points for bit, rule in enumerate(self.rules) if mask >> bit & 1)
+
+    def rule(self, rule_id: str) -> ScoringRule:
+        """Правило по id"""
+        for rule in self.rules:
+            if rule.rule_id == rule_id:
+                return rule
+        raise KeyError(rule_id)
+
+    def to_dict(self) -> dict:
+        """Описание правил в формате файла"""
+        rules = []
+        for rule in self.rules:
+            when = dict(rule.flags)
+            if rule.min_black_checks:
+                when["min_black_checks"] = rule.min_black_checks
+            if rule.min_red_checks:
+                when["min_red_checks"] = rule.min_red_checks
+            rules.append({
+                "id": rule.rule_id,
+                "description": rule.description,
+                "points": rule.points,
+                "roles": [role.value for role in Role if role in rule.roles],
+                "when": when,
+            })
+        return {"version": self.version, "rules": rules}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RuleSet":
+        """Скомпилировать правила из описания"""
+        rules = []
+        for raw in data.get("rules", []):
+            rule_id = raw.get("id")
+            try:
+                roles = frozenset(_ROLES_BY_VALUE[value] for value in raw["roles"])
+                when = dict(raw.get("when", {}))
+                checks = {name: int(when.pop(name, 0)) for name in CHECK_CONDITIONS}
+                unknown = set(when) - set(FLAGS)
+                if unknown:
+                    raise RuleSetError(f"правило {rule_id}: неизвестные условия {sorted(unknown)}")
+                flags = tuple((name, bool(when[name])) for name in FLAGS if name in when)
+                rules.append(ScoringRule(
+                    rule_id=str(rule_id),
+                    description=str(raw["description"]),
+                    points=int(raw["points"]),
+                    roles=roles,
+                    flags=flags,
+                    **checks,
+                ))
+            except KeyError as e:
+                raise RuleSetError(f"правило {rule_id}: нет поля или неизвестная роль {e}") from None
+        return cls(rules, str(data.get("version", "")))
+
+
+def load_rules(path: Optional[str] = None) -> RuleSet:
+    """Загрузить и скомпилировать правила из файла"""
+    with open(path or DEFAULT_RULES_PATH, encoding="utf-8") as f:
+        return RuleSet.from_dict(json.load(f))
+
+
+_default_rules: Optional[RuleSet] = None
+
+
+def default_rules() -> RuleSet:
+    """Правила по умолчанию (scoring_rules.json), компилируются один раз"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = load_rules()
+    return _default_rules
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Локальный HTTP-сервис подсчета рейтинга на asyncio
+
+    POST /games          - игра в формате JSONL-архива: {"game": ..., "players": [...]}
+                           (необязательное поле date - день для журнала сезона)
+                           ответ: результаты игры (как в JSON-отчете)
+    GET  /standings?limit=N - текущая таблица сессии
+    GET  /stats          - счетчики сервиса
+    GET  /health         - проверка, что сервис жив
+
+Игры, пришедшие почти одновременно, собираются в пачку (ждем не дольше
+batch_window секунд или до max_batch игр) и считаются одним проходом в
+отдельном потоке, поэтому цикл событий продолжает принимать запросы.
+Запись в журнал сезона (SQLite) делается там же, в потоке подсчета.
+Таблица сессии обновляется в цикле событий в порядке поступления игр;
+ошибка одной игры возвращается только ее запросу.
+Каждое соединение обслуживается своей задачей с таймаутами на чтение,
+так что медленный клиент не задерживает остальных.
+
+    python3 scoring_service.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from batch_loader import RowError, parse_game_date, parse_game_record, score_game
+from models import GameAnalysis, Player, RatingResult
+from report_renderers import game_to_dict, standings_rows
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+
+
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """Ошибка запроса с HTTP-статусом"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """Сервис подсчета: очередь игр, пачки и таблица сессии"""
+
+    def __init__(self, session: Optional[SessionManager] = None, batch_window: float = 0.002,
+                 max_batch: int = 256, cache=None, read_timeout: float = 10.0):
+        self.session = session or SessionManager(0)
+        # Журнал сезона сессии пишется из потока подсчета, а не из цикла событий
+        self.ledger: Optional[SeasonLedger] = self.session.ledger
+        if self.ledger is not None and self.ledger.check_same_thread:
+            raise ValueError("журнал сезона сервиса пишется из потока подсчета: "
+                             "откройте его с check_same_thread=False")
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = cache
+        self.read_timeout = read_timeout
+        self.games_scored = 0
+        self.batches = 0
+        self.requests = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # --- запуск ---
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Запустить сервер (port=0 - свободный порт)"""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Остановить сервер и обработку пачек"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    # --- подсчет ---
+
+    async def submit(self, players: List[Player], game_date: Optional[date] = None
+                     ) -> Tuple[int, GameAnalysis, List[RatingResult]]:
+        """
+        Поставить игру в очередь и дождаться результата (номер игры в сессии, анализ, баллы)
+
+        game_date - день игры для журнала сезона (по умолчанию - сегодня)
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((players, game_date, future))
+        return await future
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                scored = await loop.run_in_executor(self._executor, self._score_batch,
+                                                    [(players, game_date) for players, game_date, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            for (_, _, future), (analysis, results, error) in zip(batch, scored):
+                if error is None:
+                    try:
+                        self.session.add_game_results(results, analysis, committed=True)
+                    except Exception as e:
+                        error = e
+                if error is not None:
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                self.session.total_games = self.session.current_game
+                self.games_scored += 1
+                if not future.done():
+                    future.set_result((self.session.current_game, analysis, results))
+
+    def _score_batch(self, games: List[Tuple[List[Player], Optional[date]]]
+                     ) -> List[Tuple[GameAnalysis, List[RatingResult], Optional[Exception]]]:
+        """Посчитать пачку и записать ее в журнал сезона; ошибка - у своей игры"""
+        scored = []
+        for players, game_date in games:
+            try:
+                analysis, results = score_game(players, self.cache)
+                if self.ledger is not None:
+                    self.ledger.commit_game(results, analysis, game_date)
+            except Exception as e:
+                scored.append((None, None, e))
+            else:
+                scored.append((analysis, results, None))
+        return scored
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслужить одно соединение (keep-alive)"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, keep_alive, body = request
+                self.requests += 1
+                try:
+                    status, payload = await self._dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception:
+                    # Подробности - в журнал процесса, клиенту - без внутренних деталей
+                    traceback.print_exc(file=sys.stderr)
+                    status, payload = 500, {"error": "внутренняя ошибка сервиса"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Прочитать запрос: (метод, путь, keep-alive, тело) или None, если клиент закрыл соединение"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.read_timeout)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HttpError(400, "неполный запрос") from None
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "слишком длинные заголовки") from None
+        except asyncio.TimeoutError:
+            raise HttpError(408, "таймаут чтения запроса") from None
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(400, "неверная строка запроса") from None
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HttpError(400, "неверный Content-Length") from None
+        if length < 0:
+            raise HttpError(400, "неверный Content-Length")
+        if length > MAX_BODY:
+            raise HttpError(413, "слишком большое тело запроса")
+        body = b""
+        if length:
+            try:
+                body = await asyncio.wait_for(reader.readexactly(length), self.read_timeout)
+            except asyncio.TimeoutError:
+                raise HttpError(408, "таймаут чтения тела запроса") from None
+        return method.upper(), target, keep_alive, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        if url.path == "/games":
+            if method != "POST":
+                raise HttpError(405, "ожидается POST")
+            try:
+                record = json.loads(body)
+                players = parse_game_record(record)
+                game_date = parse_game_date(record.get("date"))
+            except json.JSONDecodeError as e:
+                raise HttpError(400, f"некорректный JSON ({e.msg})") from None
+            except RowError as e:
+                raise HttpError(400, str(e)) from None
+            except ValueError as e:  # В том числе тело не в UTF-8
+                raise HttpError(400, f"некорректное тело запроса ({e})") from None
+            number, analysis, results = await self.submit(players, game_date)
+            return 200, game_to_dict(number, results, analysis)
+
+        if method != "GET":
+            raise HttpError(405, "ожидается GET")
+        if url.path == "/standings":
+            query = parse_qs(url.query)
+            try:
+                limit = int(query["limit"][0]) if "limit" in query else None
+            except ValueError:
+                raise HttpError(400, "limit должен быть числом") from None
+            if limit is not None and limit < 0:
+                raise HttpError(400, "limit не может быть отрицательным")
+            return 200, {"total_games": self.session.current_game,
+                         "standings": standings_rows(self.session, limit)}
+        if url.path == "/stats":
+            return 200, self.stats()
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        raise HttpError(404, f"нет ресурса {url.path}")
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    def stats(self) -> dict:
+        """Счетчики сервиса"""
+        return {
+            "requests": self.requests,
+            "games_scored": self.games_scored,
+            "batches": self.batches,
+            "mean_batch": self.games_scored / self.batches if self.batches else 0.0,
+            "players": len(self.session.player_ids),
+        }
+
+
+async def serve(host: str, port: int, service: ScoringService):
+    """Запустить сервис и работать до остановки"""
+    server = await service.start(host, port)
+    print(f"Сервис подсчета слушает http://{host}:{service.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP-сервис подсчета рейтинга Мафии")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="сколько ждать остальных игр пачки (мс)")
+    parser.add_argument("--max-batch", type=int, default=256, help="наибольший размер пачки")
+    parser.add_argument("--ledger", metavar="DB", help="сохранять игры в журнал сезона (файл SQLite)")
+    args = parser.parse_args(argv)
+
+    ledger = SeasonLedger(args.ledger, check_same_thread=False) if args.ledger else None
+    service = ScoringService(SessionManager(0, ledger), args.batch_window_ms / 1000, args.max_batch)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        print("\nСервис остановлен.")
+
+
+if __name__ == "__main__":
+    main()
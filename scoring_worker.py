@@ -0,0 +1,124 @@
+"""
+Долгоживущий обработчик игр: NDJSON через stdin/stdout или Unix-сокет
+
+Скрипты турнира запускают `main.py --worker` один раз и дальше пишут в него
+по строке на игру - запуск интерпретатора и импорт модулей оплачиваются
+один раз, а таблица игрового дня живет в памяти между играми.
+
+Строка запроса - игра в формате JSONL-архива или команда:
+
+    {"game": "1", "players": [...]}           - посчитать игру (необязательное
+                                                поле date - день для журнала сезона)
+    {"command": "standings", "limit": 10}     - текущая таблица
+    {"command": "stats"}                      - счетчики обработчика
+
+На каждую строку запроса - одна строка ответа в JSON: результаты игры (как в
+JSON-отчете), таблица, счетчики или {"error": "..."}; пустые строки
+пропускаются. Ответ отправляется сразу, поэтому скрипт может писать
+запрос и ждать ответ.
+"""
+import json
+import os
+import socketserver
+import threading
+from typing import BinaryIO, Optional
+
+from batch_loader import parse_game_date, parse_game_record, score_game
+from report_renderers import game_to_dict, standings_rows
+from session_manager import SessionManager
+
+
+class ScoringWorker:
+    """Обработка строк NDJSON с общей сессией"""
+
+    def __init__(self, session: Optional[SessionManager] = None, cache=None):
+        self.session = session or SessionManager(0)
+        self.cache = cache
+        self.lines = 0
+        self.errors = 0
+        self._lock = threading.Lock()  # Соединения сокета обслуживаются в разных потоках
+
+    def handle_line(self, line: bytes) -> Optional[bytes]:
+        """Ответ на одну строку запроса (None - пустая строка)"""
+        if not line.strip():
+            return None
+        with self._lock:
+            self.lines += 1
+            try:
+                payload = self._dispatch(json.loads(line))
+            except json.JSONDecodeError as e:
+                self.errors += 1
+                payload = {"error": f"некорректный JSON ({e.msg})"}
+            except ValueError as e:  # В том числе RowError
+                self.errors += 1
+                payload = {"error": str(e)}
+            except Exception as e:  # Сбой подсчета или журнала сезона - ответ все равно нужен
+                self.errors += 1
+                payload = {"error": f"внутренняя ошибка ({type(e).__name__})"}
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def _dispatch(self, request) -> dict:
+        if not isinstance(request, dict):
+            raise ValueError("ожидается JSON-объект")
+        command = request.get("command")
+        if command is None:
+            players = parse_game_record(request)
+            game_date = parse_game_date(request.get("date"))
+            analysis, results = score_game(players, self.cache)
+            self.session.add_game_results(results, analysis, game_date)
+            self.session.total_games = self.session.current_game
+            return game_to_dict(self.session.current_game, results, analysis)
+        if command == "standings":
+            limit = request.get("limit")
+            if limit is not None and not isinstance(limit, int):
+                raise ValueError("limit должен быть числом")
+            return {"total_games": self.session.current_game,
+                    "standings": standings_rows(self.session, limit)}
+        if command == "stats":
+            return self.stats()
+        raise ValueError(f"неизвестная команда {command!r}")
+
+    def stats(self) -> dict:
+        """Счетчики обработчика"""
+        return {
+            "lines": self.lines,
+            "errors": self.errors,
+            "games_scored": self.session.current_game,
+            "players": len(self.session.player_ids),
+        }
+
+    def serve_stream(self, source: BinaryIO, target: BinaryIO) -> int:
+        """
+        Обрабатывать строки source до конца потока, ответы - в target
+
+        Returns:
+            число обработанных строк
+        """
+        for line in source:
+            response = self.handle_line(line)
+            if response is not None:
+                target.write(response)
+                target.flush()
+        return self.lines
+
+    def unix_server(self, path: str) -> socketserver.ThreadingUnixStreamServer:
+        """Сервер на Unix-сокете path: каждое соединение - поток NDJSON"""
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                worker.serve_stream(self.rfile, self.wfile)
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        server.daemon_threads = True
+        return server
+
+    def serve_unix(self, path: str):
+        """Слушать Unix-сокет path до остановки"""
+        with self.unix_server(path) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(path)
@@ -0,0 +1,200 @@
+"""
+Журнал сезона - постоянное хранилище игр и рейтинга на SQLite
+
+Хранит игры, результаты по местам и накопительные суммы по игрокам.
+Суммы обновляются при записи каждой игры, поэтому таблица сезона
+читается по индексу без пересчета всех игр.
+"""
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models import GameAnalysis, RatingResult, ROLE_CODES, Team
+from game_analyzer import GameAnalyzer
+from player_registry import PlayerRegistry, registry as default_registry
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    season TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    is_guessing INTEGER NOT NULL,
+    clean_civilian_win INTEGER NOT NULL,
+    dry_mafia_win INTEGER NOT NULL,
+    alive_players_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seat_results (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    role TEXT NOT NULL,
+    killed_when TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seat)
+);
+
+CREATE TABLE IF NOT EXISTS player_aggregates (
+    season TEXT NOT NULL,
+    player TEXT NOT NULL,
+    total_points INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (season, player)
+);
+
+CREATE INDEX IF NOT EXISTS idx_games_date ON games(game_date);
+CREATE INDEX IF NOT EXISTS idx_games_season ON games(season);
+CREATE INDEX IF NOT EXISTS idx_seat_results_player ON seat_results(player);
+CREATE INDEX IF NOT EXISTS idx_seat_results_role ON seat_results(role);
+CREATE INDEX IF NOT EXISTS idx_player_aggregates_rank
+    ON player_aggregates(season, total_points DESC, games_played DESC);
+"""
+
+
+@dataclass
+class StandingRow:
+    """Строка таблицы сезона"""
+    player: str
+    total_points: int
+    games_played: int
+    wins: int
+
+    def average_points(self) -> float:
+        """Средний балл за игру"""
+        if self.games_played == 0:
+            return 0.0
+        return self.total_points / self.games_played
+
+
+class SeasonLedger:
+    """Постоянное хранилище игр и накопительного рейтинга"""
+
+    def __init__(self, path: str = ":memory:", check_same_thread: bool = True,
+                 registry: PlayerRegistry = None):
+        # Игроки пишутся под основным именем (псевдонимы - через реестр)
+        self.registry = registry or default_registry
+        # check_same_thread=False - журнал создается в одном потоке, а пишется
+        # из другого (но не из нескольких сразу), как в scoring_service
+        self.check_same_thread = check_same_thread
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def commit_game(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None,
+                    game_date: Optional[date] = None, season: Optional[str] = None) -> int:
+        """Записать игру и обновить суммы игроков. Возвращает id игры"""
+        with self.conn:
+            return self._insert_game(results, analysis, game_date, season)
+
+    def commit_games(self, games: Iterable[Tuple[List[RatingResult], Optional[GameAnalysis]]],
+                     game_date: Optional[date] = None, season: Optional[str] = None) -> int:
+        """Записать много игр одной транзакцией. Возвращает число игр"""
+        count = 0
+        with self.conn:
+            for results, analysis in games:
+                self._insert_game(results, analysis, game_date, season)
+                count += 1
+        return count
+
+    def _insert_game(self, results: List[RatingResult], analysis: Optional[GameAnalysis],
+                     game_date: Optional[date], season: Optional[str]) -> int:
+        if analysis is None:
+            analysis = GameAnalyzer([r.player for r in results]).analyze()
+        game_date = game_date or date.today()
+        season = season or str(game_date.year)
+
+        cursor = self.conn.execute(
+            "INSERT INTO games (season, game_date, winner, is_guessing, clean_civilian_win,"
+            " dry_mafia_win, alive_players_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (season, game_date.isoformat(), analysis.winner.value, analysis.is_guessing,
+             analysis.clean_civilian_win, analysis.dry_mafia_win, analysis.alive_players_count),
+        )
+        game_id = cursor.lastrowid
+
+        seats = []
+        canonical = self.registry.canonical
+        for seat, result in enumerate(results, 1):
+            player = result.player
+            won = player.get_team() == analysis.winner
+            seats.append((game_id, seat, canonical(player.name), player.role.value, player.killed_when,
+                          won, result.total_points))
+
+        self.conn.executemany("INSERT INTO seat_results VALUES (?, ?, ?, ?, ?, ?, ?)", seats)
+        self.conn.executemany(
+            "INSERT INTO player_aggregates (season, player, total_points, games_played, wins)"
+            " VALUES (?, ?, ?, 1, ?)"
+            " ON CONFLICT(season, player) DO UPDATE SET"
+            " total_points = total_points + excluded.total_points,"
+            " games_played = games_played + 1,"
+            " wins = wins + excluded.wins",
+            [(season, name, points, won) for _, _, name, _, _, won, points in seats],
+        )
+        return game_id
+
+    def season_standings(self, season: str, limit: Optional[int] = None) -> List[StandingRow]:
+        """
+        Таблица сезона: по баллам, затем по числу игр (убывание)
+
+        При равенстве выше тот, кто раньше появился в сезоне - как в SessionManager.
+        """
+        query = ("SELECT player, total_points, games_played, wins FROM player_aggregates"
+                 " WHERE season = ? ORDER BY total_points DESC, games_played DESC, rowid")
+        params: tuple = (season,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        return [StandingRow(*row) for row in self.conn.execute(query, params)]
+
+    def best_player(self, season: str, min_games: int = 3) -> Optional[StandingRow]:
+        """Лучший игрок сезона среди сыгравших min_games+ игр"""
+        row = self.conn.execute(
+            "SELECT player, total_points, games_played, wins FROM player_aggregates"
+            " WHERE season = ? AND games_played >= ? ORDER BY total_points DESC, rowid LIMIT 1",
+            (season, min_games),
+        ).fetchone()
+        return StandingRow(*row) if row else None
+
+    def seasons(self) -> List[str]:
+        """Все сезоны журнала"""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT season FROM games ORDER BY season")]
+
+    def games_count(self, season: Optional[str] = None) -> int:
+        """Число записанных игр"""
+        if season is None:
+            return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM games WHERE season = ?", (season,)).fetchone()[0]
+
+    def game_rosters(self) -> Iterator[Tuple[List[str], List[int], bool]]:
+        """
+        Составы всех игр в порядке записи: (имена, коды ролей, победила ли мафия)
+
+        Читается потоком - для пересчета долгосрочного рейтинга по истории.
+        """
+        role_codes = {role.value: code for role, code in ROLE_CODES.items()}
+        cursor = self.conn.execute(
+            "SELECT s.game_id, s.player, s.role, g.winner FROM seat_results s"
+            " JOIN games g ON g.id = s.game_id ORDER BY s.game_id, s.seat"
+        )
+        current = None
+        names: List[str] = []
+        roles: List[int] = []
+        mafia_won = False
+        for game_id, player, role, winner in cursor:
+            if game_id != current:
+                if current is not None:
+                    yield names, roles, mafia_won
+                current, names, roles = game_id, [], []
+                mafia_won = winner == Team.MAFIA.value
+            names.append(player)
+            roles.append(role_codes[role])
+        if current is not None:
+            yield names, roles, mafia_won
@@ -1,9 +1,11 @@
 """
 Менеджер игровой сессии - управляет несколькими играми за день
 """
-from typing import List, Dict
-from collections import defaultdict
-from models import RatingResult
+from datetime import date
+from typing import List, Dict, Optional
+from models import RatingResult, GameAnalysis
+from leaderboard import Leaderboard
+from player_registry import PlayerRegistry, registry as default_registry
 
 
 class PlayerStats:
@@ -20,6 +22,12 @@ class PlayerStats:
         self.games_played += 1
         self.game_results.append(points)
 
+    def merge(self, other: "PlayerStats"):
+        """Добавить статистику, накопленную отдельно (в другом процессе или за другим столом)"""
+        self.total_points += other.total_points
+        self.games_played += other.games_played
+        self.game_results.extend(other.game_results)
+
     def average_points(self) -> float:
         """Средний балл за игру"""
         if self.games_played == 0:
@@ -30,31 +38,82 @@ class PlayerStats:
 class SessionManager:
     """Управляет игровой сессией (несколько игр за день)"""
 
-    def __init__(self, total_games: int):
+    def __init__(self, total_games: int, ledger=None, skill=None, registry: PlayerRegistry = None, cube=None):
         self.total_games = total_games
         self.current_game = 0
-        self.player_stats: Dict[str, PlayerStats] = defaultdict(lambda: PlayerStats(""))
+        # Статистика по номеру игрока в реестре; псевдонимы попадают к основному имени
+        self.registry = registry or default_registry
+        self.stats_by_id: List[Optional[PlayerStats]] = []
+        self.player_ids: List[int] = []  # Игроки сессии в порядке появления
+        self.ledger = ledger  # SeasonLedger для постоянного хранения (необязательно)
+        self.skill = skill    # SkillRating - долгосрочный рейтинг силы (необязательно)
+        self.cube = cube      # StatsCube - статистика по ролям и исходам (необязательно)
+        self.leaderboard = Leaderboard(min_games=3)
+
+    def add_game_results(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None,
+                         game_date: Optional[date] = None, committed: bool = False):
+        """
+        Добавить результаты одной игры
 
-    def add_game_results(self, results: List[RatingResult]):
-        """Добавить результаты одной игры"""
+        game_date - день игры для журнала сезона (по умолчанию - сегодня)
+        committed - игра уже записана в журнал сезона вызывающим (например,
+        из потока, которому принадлежит соединение SQLite)
+        """
+        # Сначала журнал сезона: если запись не удалась, сессия не меняется
+        if self.ledger is not None and not committed:
+            self.ledger.commit_game(results, analysis, game_date)
         self.current_game += 1
 
-        for result in results:
-            player_name = result.player.name
+        if self.skill is not None:
+            self.skill.update(results, analysis)
+        if self.cube is not None:
+            self.cube.add_game(results, analysis)
 
-            # Инициализируем, если игрок новый
-            if player_name not in self.player_stats:
-                self.player_stats[player_name] = PlayerStats(player_name)
+        resolve = self.registry.resolve
+        for result in results:
+            stats = self._stats_for(resolve(result.player.name))
+            stats.add_game_result(result.total_points)
+            self.leaderboard.update(stats)
+
+    def _stats_for(self, player_id: int) -> PlayerStats:
+        """Статистика игрока по номеру (создается при первой игре)"""
+        by_id = self.stats_by_id
+        if player_id >= len(by_id):
+            by_id.extend([None] * (player_id + 1 - len(by_id)))
+        stats = by_id[player_id]
+        if stats is None:
+            stats = by_id[player_id] = PlayerStats(self.registry.name(player_id))
+            self.player_ids.append(player_id)
+        return stats
+
+    @property
+    def player_stats(self) -> Dict[str, PlayerStats]:
+        """Статистика игроков по имени в порядке появления"""
+        return {self.stats_by_id[pid].name: self.stats_by_id[pid] for pid in self.player_ids}
+
+    def merge_player_stats(self, partial: PlayerStats):
+        """
+        Добавить частичную статистику игрока
 
-            # Добавляем результат игры
-            self.player_stats[player_name].add_game_result(result.total_points)
+        Порядок вызовов определяет порядок появления игроков - он решает
+        равенства в рейтинге так же, как при последовательном добавлении игр.
+        """
+        stats = self._stats_for(self.registry.resolve(partial.name))
+        stats.merge(partial)
+        self.leaderboard.update(stats)
 
     def get_all_players(self) -> List[PlayerStats]:
         """Получить всех игроков, отсортированных по баллам"""
-        players = list(self.player_stats.values())
-        # Сортируем: сначала по баллам (убывание), потом по количеству игр (убывание)
-        players.sort(key=lambda p: (p.total_points, p.games_played), reverse=True)
-        return players
+        # Таблица лидеров уже упорядочена: по баллам (убывание), потом по количеству игр (убывание)
+        return self.leaderboard.all()
+
+    def get_top_players(self, k: int) -> List[PlayerStats]:
+        """Первые k игроков рейтинга"""
+        return self.leaderboard.top(k)
+
+    def get_player_rank(self, name: str) -> int:
+        """Место игрока в рейтинге (с 1)"""
+        return self.leaderboard.rank(self.registry.canonical(name))
 
     def get_best_player(self) -> PlayerStats:
         """
@@ -62,14 +121,7 @@ class SessionManager:
 
         Лучший игрок = максимум баллов среди сыгравших 3+ игры
         """
-        qualified_players = [p for p in self.player_stats.values() if p.games_played >= 3]
-
-        if not qualified_players:
-            return None
-
-        # Сортируем по баллам
-        qualified_players.sort(key=lambda p: p.total_points, reverse=True)
-        return qualified_players[0]
+        return self.leaderboard.best()
 
     def is_complete(self) -> bool:
         """Все ли игры сыграны"""
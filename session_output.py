@@ -1,7 +1,7 @@
 """
 Форматирование вывода итогового рейтинга за игровой день
 """
-from typing import List
+from typing import List, Optional
 from session_manager import PlayerStats, SessionManager
 
 
@@ -9,25 +9,32 @@ class SessionOutputFormatter:
     """Форматирует вывод итогового рейтинга"""
 
     def format_final_rating(self, session: SessionManager):
-        """Вывести итоговый рейтинг за игровой день"""
-        print("\n" + "=" * 60)
-        print("ИТОГОВЫЙ РЕЙТИНГ ИГРОВОГО ДНЯ")
-        print("=" * 60)
-        print(f"Всего сыграно игр: {session.total_games}")
-        print()
+        """Вывести итоговый рейтинг за игровой день (одной записью в stdout)"""
+        print(self.render_final_rating(session), end="")
+
+    def render_final_rating(self, session: SessionManager) -> str:
+        """Итоговый рейтинг одной строкой - тот же текст, что выводит format_final_rating"""
+        lines = [
+            "\n" + "=" * 60,
+            "ИТОГОВЫЙ РЕЙТИНГ ИГРОВОГО ДНЯ",
+            "=" * 60,
+            f"Всего сыграно игр: {session.total_games}",
+            "",
+        ]
 
         players = session.get_all_players()
 
         if not players:
-            print("Нет данных об играх.")
-            return
+            lines.append("Нет данных об играх.")
+            lines.append("")
+            return "\n".join(lines)
 
         # Определяем лучшего игрока
         best_player = session.get_best_player()
 
         # Выводим таблицу рейтинга
-        print(f"{'№':<4} {'Игрок':<20} {'Игры':<8} {'Очки':<10} {'Среднее':<10} {'Статус'}")
-        print("-" * 60)
+        lines.append(f"{'№':<4} {'Игрок':<20} {'Игры':<8} {'Очки':<10} {'Среднее':<10} {'Статус'}")
+        lines.append("-" * 60)
 
         for i, player in enumerate(players, 1):
             # Форматируем среднее до 2 знаков
@@ -40,30 +47,65 @@ class SessionOutputFormatter:
             elif player.games_played >= 3:
                 status = "✓ Квалифицирован"
 
-            print(f"{i:<4} {player.name:<20} {player.games_played:<8} {player.total_points:<10} {avg:<10} {status}")
+            lines.append(f"{i:<4} {player.name:<20} {player.games_played:<8} {player.total_points:<10} {avg:<10} {status}")
 
-        print("-" * 60)
+        lines.append("-" * 60)
 
         # Детальная информация о лучшем игроке
         if best_player:
-            print()
-            print("🏆 " + "=" * 58)
-            print(f"   ЛУЧШИЙ ИГРОК ДНЯ: {best_player.name}")
-            print("=" * 60)
-            print(f"   Сыграно игр: {best_player.games_played}")
-            print(f"   Всего баллов: {best_player.total_points}")
-            print(f"   Средний балл: {best_player.average_points():.2f}")
-            print(f"   Результаты по играм: {', '.join(map(lambda x: f'{x:+d}' if x >= 0 else str(x), best_player.game_results))}")
-            print("=" * 60)
+            lines.append("")
+            lines.append("🏆 " + "=" * 58)
+            lines.append(f"   ЛУЧШИЙ ИГРОК ДНЯ: {best_player.name}")
+            lines.append("=" * 60)
+            lines.append(f"   Сыграно игр: {best_player.games_played}")
+            lines.append(f"   Всего баллов: {best_player.total_points}")
+            lines.append(f"   Средний балл: {best_player.average_points():.2f}")
+            lines.append(f"   Результаты по играм: {format_game_results(best_player.game_results)}")
+            lines.append("=" * 60)
         else:
-            print()
-            print("⚠️  Нет игроков, сыгравших 3 или более игры.")
-            print("   Для звания 'Лучший игрок дня' нужно сыграть минимум 3 игры.")
+            lines.append("")
+            lines.append("⚠️  Нет игроков, сыгравших 3 или более игры.")
+            lines.append("   Для звания 'Лучший игрок дня' нужно сыграть минимум 3 игры.")
+
+        lines.append("")
+        lines.append("")
+        return "\n".join(lines)
+
+    def format_skill_ratings(self, session: SessionManager):
+        """Вывести рейтинг силы игроков дня"""
+        print(self.render_skill_ratings(session), end="")
 
-        print()
+    def render_skill_ratings(self, session: SessionManager) -> str:
+        """Рейтинг силы (SkillRating) игроков, сыгравших в этот день"""
+        skill = session.skill
+        players = sorted((skill.get(p.name) for p in session.get_all_players() if p.name in skill),
+                         key=lambda s: s.rating, reverse=True)
+        lines = [
+            "=" * 60,
+            "РЕЙТИНГ СИЛЫ ИГРОКОВ",
+            "=" * 60,
+            f"{'№':<4} {'Игрок':<20} {'Рейтинг':<10} {'Игры':<8} {'Победы'}",
+            "-" * 60,
+        ]
+        for i, p in enumerate(players, 1):
+            lines.append(f"{i:<4} {p.name:<20} {p.rating:<10.0f} {p.games:<8} {p.wins}")
+        lines.append("-" * 60)
+        lines.append("")
+        lines.append("")
+        return "\n".join(lines)
 
     def format_game_separator(self, game_number: int, total_games: int):
         """Разделитель между играми"""
-        print("\n" + "🎮 " + "=" * 56)
-        print(f"   ИГРА {game_number} из {total_games}")
-        print("=" * 60 + "\n")
+        print(self.render_game_separator(game_number, total_games), end="")
+
+    def render_game_separator(self, game_number: int, total_games: Optional[int] = None) -> str:
+        """Разделитель между играми одной строкой (без total_games - только номер)"""
+        title = f"ИГРА {game_number} из {total_games}" if total_games else f"ИГРА {game_number}"
+        return ("\n" + "🎮 " + "=" * 56 + "\n"
+                f"   {title}\n"
+                + "=" * 60 + "\n\n")
+
+
+def format_game_results(game_results: List[int]) -> str:
+    """Результаты по играм через запятую со знаком: +4, -3, +0"""
+    return ', '.join(f'{x:+d}' if x >= 0 else str(x) for x in game_results)
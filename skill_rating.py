@@ -0,0 +1,255 @@
+"""
+Долгосрочный рейтинг силы игроков (командный Эло)
+
+В отличие от баллов игрового дня, рейтинг силы переходит из дня в день и
+учитывает силу соперников. Для каждой игры:
+
+    ожидание мафии E = 1 / (1 + 10^((R_мирных - R_мафии - A) / 400))
+
+где R_* - средний рейтинг команды, A - преимущество мафии (подстраивается
+по истории клуба). Каждый игрок получает K_роли × (S - E) для своей
+команды (S = 1 при победе). Поправки по ролям - множители K: Шериф и Дон
+сильнее влияют на исход. Первые provisional_games игр новичка K больше,
+чтобы его рейтинг быстрее нашел свой уровень (как у Glicko с большой
+неопределенностью в начале).
+
+Обновление одной игры - O(игроков). Состояние хранится в JSON, поэтому
+новый игровой день начинается с последних рейтингов.
+"""
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models import GameAnalysis, RatingResult, Role, ROLE_CODES, ROLES_BY_CODE, Team
+from game_analyzer import GameAnalyzer
+from player_registry import PlayerRegistry, registry as default_registry
+
+
+STATE_VERSION = 1
+
+DEFAULT_ROLE_WEIGHTS = {
+    Role.CIVILIAN: 1.0,
+    Role.SHERIFF: 1.25,
+    Role.MAFIA: 1.0,
+    Role.DON: 1.25,
+}
+
+_IS_MAFIA = [False] * len(ROLE_CODES)
+for _role in (Role.MAFIA, Role.DON):
+    _IS_MAFIA[ROLE_CODES[_role]] = True
+_LN10_400 = math.log(10) / 400
+
+
+@dataclass
+class PlayerSkill:
+    """Рейтинг силы игрока"""
+    name: str
+    rating: float
+    games: int
+    wins: int
+
+
+class SkillRating:
+    """Рейтинг силы игроков с пошаговым обновлением по играм"""
+
+    def __init__(self, base_rating: float = 1500.0, k_factor: float = 24.0,
+                 provisional_games: int = 10, provisional_factor: float = 2.0,
+                 advantage_k: float = 2.0, role_weights: Optional[Dict[Role, float]] = None,
+                 registry: PlayerRegistry = None):
+        # Псевдонимы разрешаются через реестр - игрок один и тот же, что в SessionManager
+        self.registry = registry or default_registry
+        self.base_rating = base_rating
+        self.k_factor = k_factor
+        self.provisional_games = provisional_games
+        self.provisional_factor = provisional_factor
+        self.advantage_k = advantage_k
+        self.role_weights = dict(DEFAULT_ROLE_WEIGHTS if role_weights is None else role_weights)
+        self.mafia_advantage = 0.0
+        self.games = 0
+
+        # Параллельные списки по id игрока - быстрее словарей объектов при пересчете
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._ratings: List[float] = []
+        self._games: List[int] = []
+        self._wins: List[int] = []
+        self._k_by_code = [0.0] * len(ROLE_CODES)
+        for role, code in ROLE_CODES.items():
+            self._k_by_code[code] = self.k_factor * self.role_weights.get(role, 1.0)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return self.registry.canonical(name) in self._ids
+
+    def _player_id(self, name: str) -> int:
+        name = self.registry.canonical(name)
+        pid = self._ids.get(name)
+        if pid is None:
+            pid = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._ratings.append(self.base_rating)
+            self._games.append(0)
+            self._wins.append(0)
+        return pid
+
+    # --- обновление ---
+
+    def update(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None):
+        """Учесть одну игру (как SessionManager.add_game_results)"""
+        if analysis is None:
+            analysis = GameAnalyzer([r.player for r in results]).analyze()
+        self.update_game([r.player.name for r in results],
+                         [ROLE_CODES[r.player.role] for r in results],
+                         analysis.winner == Team.MAFIA)
+
+    def update_game(self, names: Sequence[str], role_codes: Sequence[int], mafia_won: bool):
+        """Учесть игру по именам, кодам ролей и исходу - O(игроков)"""
+        self._apply([self._player_id(name) for name in names], role_codes, mafia_won)
+
+    def _apply(self, ids: Sequence[int], role_codes: Sequence[int], mafia_won: bool):
+        ratings = self._ratings
+        is_mafia = _IS_MAFIA
+        mafia_sum = civ_sum = 0.0
+        mafia_n = 0
+        for pid, code in zip(ids, role_codes):
+            if is_mafia[code]:
+                mafia_sum += ratings[pid]
+                mafia_n += 1
+            else:
+                civ_sum += ratings[pid]
+        civ_n = len(ids) - mafia_n
+        if not mafia_n or not civ_n:
+            return
+
+        diff = civ_sum / civ_n - mafia_sum / mafia_n - self.mafia_advantage
+        expected_mafia = 1.0 / (1.0 + math.exp(diff * _LN10_400))
+        delta = (1.0 if mafia_won else 0.0) - expected_mafia
+
+        # Изменение для каждой роли считается один раз на игру
+        step = [k * delta if is_mafia[code] else -k * delta for code, k in enumerate(self._k_by_code)]
+        factor = self.provisional_factor
+        provisional = self.provisional_games
+        games = self._games
+        wins = self._wins
+        for pid, code in zip(ids, role_codes):
+            played = games[pid]
+            ratings[pid] += step[code] * factor if played < provisional else step[code]
+            games[pid] = played + 1
+            if is_mafia[code] == mafia_won:
+                wins[pid] += 1
+
+        self.mafia_advantage += self.advantage_k * delta
+        self.games += 1
+
+    def expected_mafia_win(self, names: Sequence[str], roles: Sequence[Role]) -> float:
+        """Вероятность победы мафии для состава (новички - с базовым рейтингом)"""
+        mafia, civilians = [], []
+        for name, role in zip(names, roles):
+            pid = self._ids.get(self.registry.canonical(name))
+            rating = self._ratings[pid] if pid is not None else self.base_rating
+            (mafia if _IS_MAFIA[ROLE_CODES[role]] else civilians).append(rating)
+        diff = sum(civilians) / len(civilians) - sum(mafia) / len(mafia) - self.mafia_advantage
+        return 1.0 / (1.0 + math.exp(diff * _LN10_400))
+
+    # --- пересчет истории ---
+
+    def reset(self):
+        """Забыть все игры"""
+        self.__init__(self.base_rating, self.k_factor, self.provisional_games,
+                      self.provisional_factor, self.advantage_k, self.role_weights, self.registry)
+
+    def recompute(self, games: Iterable[Tuple[Sequence[str], Sequence[int], bool]]) -> int:
+        """
+        Пересчитать рейтинг с нуля по всей истории
+
+        Args:
+            games: (имена, коды ролей, победила ли мафия) в хронологическом порядке
+
+        Returns:
+            число учтенных игр
+        """
+        self.reset()
+        ids = self._ids
+        player_id = self._player_id
+        apply = self._apply
+        for names, role_codes, mafia_won in games:
+            apply([ids[n] if n in ids else player_id(n) for n in names], role_codes, mafia_won)
+        return self.games
+
+    def recompute_from_ledger(self, ledger) -> int:
+        """Пересчитать рейтинг по всем играм журнала сезона (SeasonLedger)"""
+        return self.recompute(ledger.game_rosters())
+
+    # --- чтение ---
+
+    def get(self, name: str) -> Optional[PlayerSkill]:
+        pid = self._ids.get(self.registry.canonical(name))
+        if pid is None:
+            return None
+        return PlayerSkill(self._names[pid], self._ratings[pid], self._games[pid], self._wins[pid])
+
+    def rating(self, name: str) -> float:
+        """Рейтинг игрока (новичок - базовый)"""
+        pid = self._ids.get(self.registry.canonical(name))
+        return self._ratings[pid] if pid is not None else self.base_rating
+
+    def top(self, k: Optional[int] = None, min_games: int = 0) -> List[PlayerSkill]:
+        """Игроки по убыванию рейтинга"""
+        order = sorted((pid for pid, g in enumerate(self._games) if g >= min_games),
+                       key=self._ratings.__getitem__, reverse=True)
+        if k is not None:
+            order = order[:k]
+        return [PlayerSkill(self._names[p], self._ratings[p], self._games[p], self._wins[p]) for p in order]
+
+    # --- хранение ---
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "params": {
+                "base_rating": self.base_rating,
+                "k_factor": self.k_factor,
+                "provisional_games": self.provisional_games,
+                "provisional_factor": self.provisional_factor,
+                "advantage_k": self.advantage_k,
+                "role_weights": {ROLE_CODES[role]: w for role, w in self.role_weights.items()},
+            },
+            "mafia_advantage": self.mafia_advantage,
+            "games": self.games,
+            "players": [[n, r, g, w] for n, r, g, w in zip(self._names, self._ratings, self._games, self._wins)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SkillRating":
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия рейтинга силы: {data.get('version')}")
+        params = dict(data["params"])
+        params["role_weights"] = {ROLES_BY_CODE[int(code)]: w for code, w in params["role_weights"].items()}
+        skill = cls(**params)
+        skill.mafia_advantage = data["mafia_advantage"]
+        skill.games = data["games"]
+        for name, rating, games, wins in data["players"]:
+            pid = skill._player_id(name)
+            skill._ratings[pid] = rating
+            skill._games[pid] = games
+            skill._wins[pid] = wins
+        return skill
+
+    def save(self, path: str):
+        """Сохранить состояние в JSON (атомарно: через временный файл)"""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillRating":
+        """Загрузить состояние; если файла нет - новый рейтинг"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
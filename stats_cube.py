@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Куб статистики игроков: игрок × роль × исход × особые условия
+
+Каждое место за столом попадает в одну ячейку куба игрока. Ячейка -
+сочетание роли, победы, момента ухода из игры (жив / выгнан днем /
+убит ночью, день 1, 2 или 3+) и условий игры (чистая победа или победа
+в сухую, угадайка). В ячейке хранятся счетчики: игры, баллы, черные и
+красные проверки. Куб - один массив (игроки, CELLS, поля) int32 и
+обновляется по мере поступления результатов RatingCalculator.
+
+Любой срез ("процент побед Доном", "средний балл Шерифа, выгнанного в
+1-й день", "доля черных проверок") - маска ячеек и одна свертка массива,
+без прохода по играм:
+
+    cube.player("Иван", role=Role.DON).win_rate()
+    cube.top("average_points", role=Role.SHERIFF, phase=PHASE_DAY, killed_day=1)
+
+    python3 stats_cube.py games.jsonl --role Дон --sort win_rate --min-games 5
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models import (
+    GameAnalysis, Player, RatingResult, Role, Team, ROLE_CODES,
+    PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT, PHASE_UNKNOWN,
+)
+from game_analyzer import GameAnalyzer
+from player_registry import PlayerRegistry, registry as default_registry
+from vectorized_engine import GameColumns, MAFIA, DON, score_columns, seat_keys
+
+# Поля ячейки
+GAMES, POINTS, BLACK_CHECKS, RED_CHECKS = 0, 1, 2, 3
+N_FIELDS = 4
+
+# Момент ухода из игры (3 бита): жив, выгнан днем 1/2/3+, убит ночью 1/2/3+, фаза неизвестна
+LAST_DAY = 3  # День 3 и позже считаются вместе
+_VOTED, _NIGHT, _UNKNOWN = 0, LAST_DAY, 2 * LAST_DAY + 1
+
+# Ячейка: роль (2 бита) | победа | уход (3 бита) | чистая/сухая победа | угадайка
+CELLS = len(ROLE_CODES) << 6
+
+_cell = np.arange(CELLS)
+_exit = _cell >> 2 & 7
+CELL_ROLE = _cell >> 6
+CELL_WON = (_cell >> 5 & 1).astype(bool)
+CELL_PHASE = np.select([_exit == 0, _exit <= LAST_DAY, _exit < _UNKNOWN],
+                       [PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT], PHASE_UNKNOWN)
+CELL_DAY = np.where((_exit > 0) & (_exit < _UNKNOWN), (_exit - 1) % LAST_DAY + 1, 0)
+CELL_MAFIA = (CELL_ROLE == ROLE_CODES[Role.MAFIA]) | (CELL_ROLE == ROLE_CODES[Role.DON])
+_sweep = (_cell >> 1 & 1).astype(bool)
+# Чистая победа бывает только у мирных, сухая - только у мафии
+CELL_CLEAN = _sweep & (CELL_WON != CELL_MAFIA)
+CELL_DRY = _sweep & (CELL_WON == CELL_MAFIA)
+CELL_GUESSING = (_cell & 1).astype(bool)
+CELL_LEFT_EARLY = (CELL_PHASE == PHASE_DAY) & (CELL_DAY <= 2)
+del _cell, _exit, _sweep
+
+
+def _exit_code(phase, day):
+    """Код ухода из игры по фазе и дню убийства (числа или массивы)"""
+    day = np.clip(day, 1, LAST_DAY)
+    return np.select([phase == PHASE_ALIVE, phase == PHASE_DAY, phase == PHASE_NIGHT],
+                     [0, _VOTED + day, _NIGHT + day], _UNKNOWN)
+
+
+def cell_index(role_code, won, phase, day, sweep, guessing):
+    """Номер ячейки места (числа или массивы numpy одной формы)"""
+    return ((np.asarray(role_code, dtype=np.int64) << 6) | (np.asarray(won, dtype=np.int64) << 5)
+            | (_exit_code(phase, day) << 2) | (np.asarray(sweep, dtype=np.int64) << 1)
+            | np.asarray(guessing, dtype=np.int64))
+
+
+def cell_mask(role: Union[Role, Sequence[Role], None] = None, team: Optional[Team] = None,
+              won: Optional[bool] = None, alive: Optional[bool] = None, phase: Optional[int] = None,
+              killed_day: Optional[int] = None, left_early: Optional[bool] = None,
+              clean_win: Optional[bool] = None, dry_win: Optional[bool] = None,
+              guessing: Optional[bool] = None) -> np.ndarray:
+    """
+    Маска ячеек среза; None - измерение не ограничено
+
+    Args:
+        role: роль или несколько ролей
+        phase: PHASE_DAY (выгнан) или PHASE_NIGHT (убит ночью), PHASE_ALIVE - дожил
+        killed_day: день ухода; LAST_DAY означает "третий и позже"
+        left_early: выгнан днем в 1-й или 2-й день
+    """
+    mask = np.ones(CELLS, dtype=bool)
+    if role is not None:
+        roles = [role] if isinstance(role, Role) else list(role)
+        mask &= np.isin(CELL_ROLE, [ROLE_CODES[r] for r in roles])
+    if team is not None:
+        mask &= CELL_MAFIA == (team == Team.MAFIA)
+    if won is not None:
+        mask &= CELL_WON == won
+    if alive is not None:
+        mask &= (CELL_PHASE == PHASE_ALIVE) == alive
+    if phase is not None:
+        mask &= CELL_PHASE == phase
+    if killed_day is not None:
+        mask &= CELL_DAY == min(killed_day, LAST_DAY)
+    if left_early is not None:
+        mask &= CELL_LEFT_EARLY == left_early
+    if clean_win is not None:
+        mask &= CELL_CLEAN == clean_win
+    if dry_win is not None:
+        mask &= CELL_DRY == dry_win
+    if guessing is not None:
+        mask &= CELL_GUESSING == guessing
+    return mask
+
+
+@dataclass
+class CubeStats:
+    """Итог среза куба для игрока (или всех игроков)"""
+    player: Optional[str]
+    games: int
+    wins: int
+    points: int
+    black_checks: int
+    red_checks: int
+
+    def average_points(self) -> float:
+        """Средний балл за игру"""
+        return self.points / self.games if self.games else 0.0
+
+    def win_rate(self) -> float:
+        """Доля побед"""
+        return self.wins / self.games if self.games else 0.0
+
+    def black_check_rate(self) -> float:
+        """Доля черных проверок среди всех проверок Шерифа"""
+        checks = self.black_checks + self.red_checks
+        return self.black_checks / checks if checks else 0.0
+
+
+# Ключи сортировки top()
+SORT_KEYS = ("games", "wins", "points", "average_points", "win_rate", "black_check_rate")
+
+
+def _sort_value(row: CubeStats, key: str) -> float:
+    value = getattr(row, key)
+    return value() if callable(value) else value
+
+
+class StatsCube:
+    """Куб статистики, обновляемый по мере поступления результатов"""
+
+    def __init__(self, registry: PlayerRegistry = None, capacity: int = 256):
+        self.registry = registry or default_registry
+        # Строка массива - номер игрока в реестре
+        self.data = np.zeros((capacity, CELLS, N_FIELDS), dtype=np.int32)
+        self.player_ids: List[int] = []  # Игроки в порядке появления
+        self._seen = np.zeros(capacity, dtype=bool)
+        self.games = 0
+
+    def _reserve(self, player_id: int):
+        capacity = len(self.data)
+        if player_id < capacity:
+            return
+        while capacity <= player_id:
+            capacity *= 2
+        data = np.zeros((capacity, CELLS, N_FIELDS), dtype=np.int32)
+        data[:len(self.data)] = self.data
+        seen = np.zeros(capacity, dtype=bool)
+        seen[:len(self._seen)] = self._seen
+        self.data, self._seen = data, seen
+
+    def _note(self, player_ids: Iterable[int]):
+        """Запомнить новых игроков в порядке появления"""
+        for pid in player_ids:
+            if not self._seen[pid]:
+                self._seen[pid] = True
+                self.player_ids.append(pid)
+
+    # --- запись ---
+
+    def add_game(self, results: List[RatingResult], analysis: Optional[GameAnalysis] = None):
+        """Учесть результаты одной игры (выход RatingCalculator)"""
+        players = [r.player for r in results]
+        analyzer = GameAnalyzer(players)
+        if analysis is None:
+            analysis = analyzer.analyze()
+        sweep = analysis.clean_civilian_win or analysis.dry_mafia_win
+        guessing = frozenset(analysis.guessing_players) if analysis.is_guessing else frozenset()
+
+        self.games += 1
+        resolve = self.registry.resolve
+        for result in results:
+            player = result.player
+            pid = resolve(player.name)
+            self._reserve(pid)
+            self._note((pid,))
+            cell = int(cell_index(ROLE_CODES[player.role], player.get_team() == analysis.winner,
+                                  player.get_kill_phase(), player.get_kill_day(),
+                                  sweep, player.name in guessing))
+            row = self.data[pid, cell]
+            row[GAMES] += 1
+            row[POINTS] += result.total_points
+            if player.role == Role.SHERIFF and player.checked_players:
+                black, red = analyzer.get_sheriff_checks(player)
+                row[BLACK_CHECKS] += black
+                row[RED_CHECKS] += red
+
+    def add_columns(self, columns: GameColumns, player_ids: np.ndarray, names: Sequence[str],
+                    rules=None):
+        """
+        Учесть блок игр в колоночном виде (например, из бинарного архива)
+
+        Args:
+            player_ids: int (n, seats) - номер игрока места в names
+        """
+        seats = seat_keys(columns)
+        present = seats.present
+        points = score_columns(columns, rules).points
+        analysis = seats.analysis
+        mafia = (columns.role == MAFIA) | (columns.role == DON)
+        won = mafia == analysis.mafia_won[:, None]
+        sweep = (analysis.clean_civilian_win | analysis.dry_mafia_win)[:, None]
+        cells = cell_index(columns.role.clip(0), won, columns.kill_phase, columns.kill_day,
+                           np.broadcast_to(sweep, won.shape), analysis.guessing_seats)
+
+        local = player_ids[present]
+        unique, first_index, inverse = np.unique(local, return_index=True, return_inverse=True)
+        resolve = self.registry.resolve
+        pid_of = np.array([resolve(names[int(i)]) for i in unique], dtype=np.int64)
+        if len(pid_of):
+            self._reserve(int(pid_of.max()))
+        pids = pid_of[inverse]
+        self._note(int(pid) for pid in pid_of[np.argsort(first_index, kind="stable")])
+
+        # Суммы по ячейкам одним bincount на поле
+        index = pids * CELLS + cells[present]
+        size = len(self.data) * CELLS
+        flat = self.data.reshape(size, N_FIELDS)
+        flat[:, GAMES] += np.bincount(index, minlength=size).astype(np.int32)
+        for field, values in ((POINTS, points), (BLACK_CHECKS, seats.black), (RED_CHECKS, seats.red)):
+            flat[:, field] += np.bincount(index, weights=values[present], minlength=size).astype(np.int32)
+        self.games += len(columns)
+
+    @classmethod
+    def from_games(cls, games: Iterable[List[Player]], registry: PlayerRegistry = None) -> "StatsCube":
+        """Построить куб по играм (спискам игроков)"""
+        from batch_loader import score_game
+
+        cube = cls(registry)
+        for players in games:
+            analysis, results = score_game(players)
+            cube.add_game(results, analysis)
+        return cube
+
+    @classmethod
+    def from_archive(cls, archive, registry: PlayerRegistry = None, chunk: int = 65536) -> "StatsCube":
+        """Построить куб по бинарному архиву (GameArchive) блоками"""
+        cube = cls(registry)
+        for start, columns in archive.chunks(chunk):
+            cube.add_columns(columns, archive.player_ids(start, start + len(columns)), archive.names)
+        return cube
+
+    # --- запросы ---
+
+    def _fields(self, mask: np.ndarray):
+        """Суммы полей и побед среза для всех игроков по порядку появления"""
+        ids = np.array(self.player_ids, dtype=np.int64)
+        data = self.data[ids]
+        fields = np.tensordot(data, mask.astype(np.int32), axes=([1], [0]))
+        wins = data[:, :, GAMES] @ (mask & CELL_WON).astype(np.int32)
+        return ids, fields, wins
+
+    def _stats(self, name: Optional[str], fields, wins) -> CubeStats:
+        return CubeStats(
+            player=name,
+            games=int(fields[GAMES]),
+            wins=int(wins),
+            points=int(fields[POINTS]),
+            black_checks=int(fields[BLACK_CHECKS]),
+            red_checks=int(fields[RED_CHECKS]),
+        )
+
+    def player(self, name: str, **filters) -> CubeStats:
+        """Срез для одного игрока (фильтры - как у cell_mask)"""
+        pid = self.registry.find(name)
+        if pid is None or pid >= len(self.data) or not self._seen[pid]:
+            return CubeStats(self.registry.canonical(name), 0, 0, 0, 0, 0)
+        mask = cell_mask(**filters)
+        data = self.data[pid]
+        return self._stats(self.registry.name(pid), mask @ data, data[:, GAMES] @ (mask & CELL_WON))
+
+    def total(self, **filters) -> CubeStats:
+        """Срез по всем игрокам"""
+        _, fields, wins = self._fields(cell_mask(**filters))
+        return self._stats(None, fields.sum(axis=0), wins.sum())
+
+    def by_player(self, min_games: int = 1, **filters) -> List[CubeStats]:
+        """Срез для каждого игрока (в порядке появления), у кого в срезе min_games+ игр"""
+        ids, fields, wins = self._fields(cell_mask(**filters))
+        name = self.registry.name
+        return [self._stats(name(int(pid)), fields[i], wins[i])
+                for i, pid in enumerate(ids) if fields[i, GAMES] >= max(min_games, 1)]
+
+    def top(self, key: str = "points", limit: Optional[int] = 10, min_games: int = 1,
+            **filters) -> List[CubeStats]:
+        """Игроки среза по убыванию key (SORT_KEYS); при равенстве - по порядку появления"""
+        if key not in SORT_KEYS:
+            raise ValueError(f"Неизвестный ключ сортировки: {key}")
+        rows = self.by_player(min_games, **filters)
+        rows.sort(key=lambda row: -_sort_value(row, key))
+        return rows if limit is None else rows[:limit]
+
+
+def main(argv=None):
+    from batch_loader import BatchLoader
+    from game_archive import GameArchive, is_archive
+
+    roles = {role.value: role for role in Role}
+    phases = {"day": PHASE_DAY, "night": PHASE_NIGHT}
+    parser = argparse.ArgumentParser(description="Срез статистики игроков по ролям и исходам")
+    parser.add_argument("archive", help="архив игр (JSONL, CSV или бинарный архив)")
+    parser.add_argument("--role", action="append", choices=list(roles))
+    outcome = parser.add_mutually_exclusive_group()
+    outcome.add_argument("--won", dest="won", action="store_true", default=None)
+    outcome.add_argument("--lost", dest="won", action="store_false")
+    parser.add_argument("--phase", choices=list(phases), help="как покинул игру: выгнан днем или убит ночью")
+    parser.add_argument("--killed-day", type=int, metavar="N", help=f"день ухода ({LAST_DAY} - третий и позже)")
+    parser.add_argument("--clean", action="store_true", default=None, help="только чистые победы мирных")
+    parser.add_argument("--dry", action="store_true", default=None, help="только победы мафии в сухую")
+    parser.add_argument("--guessing", action="store_true", default=None, help="только участники угадайки")
+    parser.add_argument("--left-early", action="store_true", default=None,
+                        help="только выгнанные в 1-й или 2-й день")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="points")
+    parser.add_argument("--min-games", type=int, default=1)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if is_archive(args.archive):
+        with GameArchive(args.archive) as archive:
+            cube = StatsCube.from_archive(archive)
+    else:
+        with open(args.archive, encoding="utf-8", newline="") as f:
+            loader = BatchLoader(f, BatchLoader.detect_format(args.archive))
+            cube = StatsCube.from_games(game.players for game in loader.games())
+
+    filters = dict(
+        role=[roles[r] for r in args.role] if args.role else None,
+        won=args.won,
+        phase=phases[args.phase] if args.phase else None,
+        killed_day=args.killed_day,
+        clean_win=args.clean,
+        dry_win=args.dry,
+        guessing=args.guessing,
+        left_early=args.left_early,
+    )
+    total = cube.total(**filters)
+    print(f"Игр в архиве: {cube.games}, мест в срезе: {total.games}, "
+          f"побед: {total.win_rate():.1%}, средний балл: {total.average_points():.2f}")
+    print(f"{'Место':>5} {'Игрок':<20} {'Игры':>5} {'Победы':>7} {'Баллы':>6} {'Средний':>8} {'Черные':>7}")
+    print("-" * 64)
+    for place, row in enumerate(cube.top(args.sort, args.top, args.min_games, **filters), 1):
+        print(f"{place:>5} {row.player:<20} {row.games:>5} {row.win_rate():>7.1%} {row.points:>6} "
+              f"{row.average_points():>8.2f} {row.black_check_rate():>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Тест кэша анализа игр
+"""
+import os
+import random
+import tempfile
+
+from analysis_cache import AnalysisCache
+from batch_loader import score_game
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from scoring_rules import RuleSet, default_rules
+from vectorized_engine import random_columns
+
+
+def _view(analysis, results):
+    return analysis, [(r.player.name, r.total_points, r.breakdowns) for r in results]
+
+
+def test_cache_hits_with_reordered_seats():
+    """Переставленные места - та же игра: результат берется из кэша в порядке текущей игры"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Кэш анализа")
+    print("="*60)
+
+    rng = random.Random(1)
+    columns = random_columns(200, seed=2)
+    cache = AnalysisCache(max_size=1000)
+
+    for g in range(len(columns)):
+        players = columns.to_players(g)
+        cache.score(players)
+
+        shuffled = list(players)
+        rng.shuffle(shuffled)
+        assert _view(*cache.score(shuffled)) == _view(*score_game(shuffled))
+
+    stats = cache.stats()
+    print(f"✅ {stats}")
+    assert stats["hits"] == 200
+    assert stats["misses"] + stats["hits"] == 400 and stats["misses"] <= 200
+
+
+def test_lru_eviction_and_disk_tier():
+    """Вытесненные игры находятся на диске, в том числе после перезапуска"""
+    columns = random_columns(30, seed=3)
+    games = [columns.to_players(g) for g in range(len(columns))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache")
+        cache = AnalysisCache(max_size=10, disk_path=path)
+        for players in games:
+            cache.score(players)
+        assert len(cache) <= 10 and cache.evictions >= 1
+        cache.close()
+
+        cache = AnalysisCache(max_size=10, disk_path=path)
+        for players in games:
+            assert _view(*cache.score(players)) == _view(*score_game(players))
+        assert cache.misses == 0 and cache.disk_hits == len(set(cache.fingerprint(p)[0] for p in games))
+        cache.close()
+
+        # Баллы изменены без смены version - старые записи диска не используются
+        data = default_rules().to_dict()
+        for rule in data["rules"]:
+            rule["points"] += 1
+        edited = RuleSet.from_dict(data)
+        assert edited.version == default_rules().version and edited.digest != default_rules().digest
+        cache = AnalysisCache(max_size=10, disk_path=path, rules=edited)
+        for players in games:
+            analyzer = GameAnalyzer(players)
+            expected = RatingCalculator(players, analyzer.analyze(), analyzer, edited).calculate_all()
+            assert [r.total_points for r in cache.score(players)[1]] == [r.total_points for r in expected]
+        assert cache.disk_hits == 0
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_cache_hits_with_reordered_seats()
+    test_lru_eviction_and_disk_tier()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Тест пакетного импорта игр из JSONL/CSV
+"""
+import io
+import json
+from datetime import date
+
+from batch_loader import BatchLoader, score_games
+
+
+ROSTER = [
+    ("Мирный1", "Мирный", "1N", []),
+    ("Мирный2", "1", "0", []),
+    ("Мирный3", "мирный", "2N", []),
+    ("Мирный4", "Мирный", "0", []),
+    ("Мирный5", "Мирный", "0", []),
+    ("Мирный6", "Мирный", "0", []),
+    ("Шериф", "Шериф", "0", [8, 9, 10]),
+    ("Дон", "Дон", "2D", []),
+    ("Мафия1", "Мафия", "1D", []),
+    ("Мафия2", "3", "3d", []),
+]
+
+
+def _jsonl_line(game_id, roster, **fields):
+    players = [{"name": n, "role": r, "killed_when": k, "checks": c} for n, r, k, c in roster]
+    return json.dumps({"game": game_id, "players": players, **fields}, ensure_ascii=False)
+
+
+def test_jsonl_import():
+    """Корректные игры считаются, ошибочные попадают в отчёт с номером строки"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Импорт JSONL")
+    print("="*60)
+
+    broken_roster = [(n, "Шериф" if n == "Мирный1" else r, k, c) for n, r, k, c in ROSTER]
+    lines = [
+        _jsonl_line("g1", ROSTER),
+        "{not json",
+        _jsonl_line("g3", broken_roster),
+        "",
+        _jsonl_line("g5", ROSTER, date="2025-03-01"),
+        _jsonl_line("g6", ROSTER, date="01.03.2025"),
+    ]
+    loader = BatchLoader(io.StringIO("\n".join(lines)), "jsonl")
+    scored = list(score_games(loader.games()))
+
+    for issue in loader.issues:
+        print(f"  {issue}")
+
+    assert [game.game_id for game, _, _ in scored] == ["g1", "g5"]
+    assert [issue.line for issue in loader.issues] == [2, 3, 6]
+    assert [game.game_date for game, _, _ in scored] == [None, date(2025, 3, 1)]
+
+    game, analysis, results = scored[0]
+    assert analysis.clean_civilian_win
+    sheriff = game.players[6]
+    assert sheriff.checked_players == ["Дон", "Мафия1", "Мафия2"]
+    totals = {r.player.name: r.total_points for r in results}
+    assert totals["Шериф"] == 4 + 3 + 2 + 3
+    assert totals["Дон"] == -3
+    print("✅ Импортировано игр: 2, ошибок: 3")
+
+
+def test_csv_import():
+    """Строки одной игры группируются по колонке game, ошибка места - на его строке"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Импорт CSV")
+    print("="*60)
+
+    rows = ["game,name,role,killed_when,checks,date"]
+    for game_id in ("1", "2"):
+        for name, role, killed, checks in ROSTER:
+            rows.append(f'{game_id},{name},{role},{killed},"{",".join(map(str, checks))}",2025-03-01')
+    rows.insert(13, "2,Лишний,Мирный,5X,")
+    rows += [f"3,{name},{role},{killed}," for name, role, killed, _ in ROSTER[:9]]  # Без одного игрока
+
+    loader = BatchLoader(io.StringIO("\n".join(rows) + "\n"), "csv")
+    scored = list(score_games(loader.games()))
+
+    for issue in loader.issues:
+        print(f"  {issue}")
+
+    assert [game.game_id for game, _, _ in scored] == ["1"]
+    assert scored[0][0].game_date == date(2025, 3, 1)
+    # Неверное место - на своей строке, неполный состав - на первой строке игры
+    assert [issue.line for issue in loader.issues] == [14, 23]
+    print("✅ Импортировано игр: 1, ошибок: 2")
+
+
+if __name__ == "__main__":
+    test_jsonl_import()
+    test_csv_import()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Тесты выгрузки в Parquet / Arrow IPC (нужен pyarrow)
+"""
+import io
+import os
+import tempfile
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from batch_loader import BatchLoader, score_game
+from columnar_export import ColumnarReader, ColumnarWriter, export_file
+from game_archive import write_archive
+from load_generator import game_payloads
+from models import Team
+from stats_cube import StatsCube
+from player_registry import PlayerRegistry
+
+
+def _payloads(n_games: int, seed: int) -> bytes:
+    return b"\n".join(game_payloads(n_games, seed=seed)) + b"\n"
+
+
+def _games(n_games: int, seed: int):
+    source = io.StringIO(_payloads(n_games, seed).decode("utf-8"))
+    return [g.players for g in BatchLoader(source).games()]
+
+
+def test_round_trip():
+    """Выгрузка хранит баллы и флаги калькулятора, чтение возвращает те же игры"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Выгрузка в Parquet и Arrow")
+    print("="*60)
+
+    games = _games(500, seed=14)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("season.parquet", "season.arrow"):
+            path = os.path.join(tmp, name)
+            with ColumnarWriter(path) as writer:
+                writer.write_games(games, chunk=64)  # Новые имена в каждом блоке
+            assert writer.games_written == 500 and writer.rows_written == 5000
+
+            reader = ColumnarReader(path)
+            assert reader.rule_ids[0] == "civilian_win" and reader.rules_version
+            rows = pa.Table.from_batches(list(reader.batches())).to_pylist()
+            assert len(rows) == 5000
+            for g in (0, 63, 64, 499):
+                analysis, results = score_game(games[g])
+                seats = rows[g * 10:(g + 1) * 10]
+                assert [r["player"] for r in seats] == [p.name for p in games[g]]
+                assert [r["points"] for r in seats] == [r.total_points for r in results]
+                assert [r["rule_mask"] for r in seats] == [r.rule_mask for r in results]
+                assert [r["won"] for r in seats] == [p.get_team() == analysis.winner for p in games[g]]
+                assert seats[0]["mafia_won"] == (analysis.winner == Team.MAFIA)
+                assert seats[0]["clean_win"] == analysis.clean_civilian_win
+
+            if name.endswith(".parquet"):
+                # Словарь группы строк - только ее игроки, а не все имена файла
+                sizes = [len(batch.column("player").dictionary) for batch in reader.batches()]
+                assert max(sizes) <= 64 * 10 and len(sizes) == 8
+
+            read_back = list(reader.games())
+            assert len(read_back) == 500
+            for original, restored in zip(games, read_back):
+                assert [r.total_points for r in score_game(restored)[1]] == \
+                    [r.total_points for r in score_game(original)[1]]
+            print(f"✅ {name}: {os.path.getsize(path)} байт")
+
+
+def test_archive_export_and_blocks():
+    """Выгрузка бинарного архива совпадает с выгрузкой JSONL; блоки читаются в StatsCube"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "games.jsonl")
+        with open(source, "wb") as f:
+            f.write(_payloads(300, seed=6))
+        archive = os.path.join(tmp, "games.mga")
+        write_archive(archive, _games(300, seed=6))
+
+        from_jsonl = os.path.join(tmp, "a.parquet")
+        from_archive = os.path.join(tmp, "b.parquet")
+        export_file(source, from_jsonl, chunk=100)
+        export_file(archive, from_archive, chunk=100)
+        table_a = pa.Table.from_batches(list(ColumnarReader(from_jsonl).batches()))
+        table_b = pa.Table.from_batches(list(ColumnarReader(from_archive).batches()))
+        assert table_a.to_pylist() == table_b.to_pylist()
+
+        reader = ColumnarReader(from_archive)
+        cube = StatsCube(PlayerRegistry())
+        for block in reader.blocks():
+            cube.add_columns(block.columns, block.player_ids, reader.names)
+        expected = StatsCube.from_games(_games(300, seed=6), PlayerRegistry())
+        assert cube.by_player() == expected.by_player()
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_archive_export_and_blocks()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
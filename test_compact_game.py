@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Тест компактного представления игры
+"""
+import tracemalloc
+
+from models import Player, Role
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from compact_game import CompactGame, MAX_KILL_DAY
+from vectorized_engine import random_columns
+
+
+def _score(game):
+    analyzer = GameAnalyzer(game)
+    analysis = analyzer.analyze()
+    return analysis, RatingCalculator(game, analysis, analyzer).calculate_all()
+
+
+def test_compact_game_scores_like_players():
+    """CompactGame дает тот же анализ и баллы, что и список Player"""
+    print("\n" + "="*60)
+    print("ТЕСТ: CompactGame = List[Player]")
+    print("="*60)
+
+    columns = random_columns(1000, seed=3)
+    for g in range(len(columns)):
+        players = columns.to_players(g)
+        compact = CompactGame.from_players(players)
+
+        analysis, results = _score(players)
+        compact_analysis, compact_results = _score(compact)
+
+        assert compact_analysis == analysis
+        assert [(r.player.name, r.total_points) for r in compact_results] == \
+               [(r.player.name, r.total_points) for r in results]
+        assert [r.breakdowns for r in compact_results] == [r.breakdowns for r in results]
+
+    print("✅ Совпадают все 1000 игр")
+
+
+def test_round_trip():
+    """Упаковка и распаковка сохраняют состав и проверки"""
+    players = [
+        Player("Шериф1", Role.SHERIFF, "0", ["Дон1", "Мафия1", "Мафия2"]),
+        Player("Мирный1", Role.CIVILIAN, "2N"),
+        Player("Дон1", Role.DON, "3D"),
+        Player("Мафия1", Role.MAFIA, "12D"),
+        Player("Мафия2", Role.MAFIA, "1D"),
+    ]
+    assert CompactGame.from_players(players).to_players() == players
+
+
+def test_large_kill_day():
+    """День убийства больше байта (опечатка "300D") хранится как записан"""
+    players = [
+        Player("A", Role.CIVILIAN, "300D"),
+        Player("B", Role.CIVILIAN, "256N"),
+        Player("C", Role.CIVILIAN, "0"),
+        Player("D", Role.MAFIA, "0"),
+        Player("E", Role.SHERIFF, "1N"),
+    ]
+    game = CompactGame.from_players(players)
+    assert game.to_players() == players
+    expected_analysis, expected = _score(players)
+    analysis, results = _score(game)
+    assert expected_analysis.is_guessing and analysis == expected_analysis
+    assert [r.total_points for r in results] == [r.total_points for r in expected]
+
+    players[0].killed_when = f"{MAX_KILL_DAY + 1}D"
+    try:
+        CompactGame.from_players(players)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ожидалась ValueError")
+
+
+def test_memory_per_game():
+    """Компактная игра занимает на порядок меньше памяти"""
+    columns = random_columns(500, seed=5)
+    games = [columns.to_players(g) for g in range(len(columns))]
+
+    tracemalloc.start()
+    as_players = [[Player(p.name, p.role, p.killed_when, list(p.checked_players)) for p in g] for g in games]
+    players_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    as_compact = [CompactGame.from_players(g) for g in games]
+    compact_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Player: {players_size / len(games):.0f} байт/игра, "
+          f"CompactGame: {compact_size / len(games):.0f} байт/игра")
+    assert len(as_players) == len(as_compact)
+    assert compact_size * 10 <= players_size
+
+
+if __name__ == "__main__":
+    test_compact_game_scores_like_players()
+    test_round_trip()
+    test_large_kill_day()
+    test_memory_per_game()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Тесты журнала игрового дня и восстановления сессии
+"""
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from batch_loader import BatchLoader, score_game
+from day_journal import DayJournal, read_journal
+from load_generator import game_payloads
+from scoring_rules import RuleSet, default_rules
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+
+
+def _games(n_games: int, seed: int):
+    source = io.StringIO(b"\n".join(game_payloads(n_games, seed=seed)).decode("utf-8") + "\n")
+    return [g.players for g in BatchLoader(source).games()]
+
+
+def _totals(session):
+    return [(p.name, p.total_points, p.games_played) for p in session.get_all_players()]
+
+
+def test_replay_restores_session():
+    """Восстановленная сессия совпадает с исходной; недописанная строка отбрасывается"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Журнал игрового дня")
+    print("="*60)
+
+    games = _games(301, seed=31)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "day.journal")
+        session = SessionManager(400)
+        with DayJournal(path, sync_interval=0.01) as journal:
+            journal.start_day(400)
+            started = time.perf_counter()
+            for number, players in enumerate(games[:300], 1):
+                _analysis, results = score_game(players)
+                for seat, player in enumerate(players, 1):
+                    journal.log_seat(number, seat, player)
+                journal.log_game(number, results)
+                session.add_game_results(results)
+            per_game = (time.perf_counter() - started) / 300
+            # Незаконченная игра: введены 4 места
+            for seat, player in enumerate(games[300][:4], 1):
+                journal.log_seat(301, seat, player)
+            time.sleep(0.05)
+            assert journal.syncs >= 1  # Фоновый fsync
+
+        # Сбой посреди записи: обрезанная строка с половиной символа UTF-8
+        with open(path, "ab") as f:
+            f.write('{"type":"seat","game":301,"seat":5,"name":"И'.encode("utf-8")[:-1])
+
+        started = time.perf_counter()
+        state = read_journal(path)
+        restored = state.session()
+        replay = time.perf_counter() - started
+
+        assert state.torn and not state.finished
+        assert state.total_games == 400 and state.games_played == 300
+        assert [p.name for p in state.pending] == [p.name for p in games[300][:4]]
+        assert restored.current_game == 300
+        assert _totals(restored) == _totals(session)
+        assert restored.get_best_player().name == session.get_best_player().name
+        # Баллы правлены без смены version - записи журнала пересчитываются
+        data = default_rules().to_dict()
+        for rule in data["rules"]:
+            rule["points"] *= 2
+        doubled = state.session(rules=RuleSet.from_dict(data))
+        assert [(n, points * 2, g) for n, points, g in _totals(session)] == _totals(doubled)
+        print(f"✅ Запись: {per_game * 1e6:.0f} мкс на игру, восстановление 300 игр: {replay * 1000:.1f} мс")
+
+        # Продолжение дописывает журнал с новой строки
+        with DayJournal(path) as journal:
+            _analysis, results = score_game(games[300])
+            journal.log_game(301, results)
+            journal.end_day()
+        state = read_journal(path)
+        assert not state.torn and state.finished and state.games_played == 301 and not state.pending
+
+        # Тот же файл на следующий день: восстанавливается только новый день
+        with DayJournal(path) as journal:
+            journal.start_day(3)
+            _analysis, results = score_game(games[0])
+            journal.log_game(1, results)
+            journal.log_seat(2, 1, games[1][0])
+        state = read_journal(path)
+        assert state.total_games == 3 and state.games_played == 1 and not state.finished
+        assert [p.name for p in state.pending] == [games[1][0].name]
+        assert state.session().current_game == 1
+
+
+def _game_input(names, checks="8,9"):
+    """Ввод одной игры: 6 мирных, Шериф, 2 Мафии, Дон; мафию выгнали днем"""
+    roles = ["1"] * 6 + ["2", "3", "3", "4"]
+    killed = ["0", "1N", "0", "2N", "0", "0", "0", "1D", "2D", "3D"]
+    lines = []
+    for name, role, when in zip(names, roles, killed):
+        lines += [name, role, when]
+    return lines + [checks]
+
+
+def test_main_resume():
+    """main.py --journal прерван посреди игры, --resume дописывает день без повторной записи в журнал сезона"""
+    names_1 = [f"Игрок{i}" for i in range(1, 11)]
+    names_2 = [f"Игрок{i}" for i in range(3, 13)]
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = os.path.join(tmp, "day.journal")
+        ledger = os.path.join(tmp, "season.db")
+        main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+        def run(args, lines):
+            return subprocess.run([sys.executable, main, "--ledger", ledger] + args,
+                                  input="\n".join(lines) + "\n", capture_output=True, text=True,
+                                  encoding="utf-8", timeout=60)
+
+        # Первая игра целиком и 4 места второй, затем ввод обрывается
+        first = run(["--journal", journal], ["2"] + _game_input(names_1) + _game_input(names_2)[:12])
+        assert "--resume" in first.stdout
+        state = read_journal(journal)
+        assert state.games_played == 1 and len(state.pending) == 4
+
+        second = run(["--resume", journal], _game_input(names_2)[12:])
+        assert "Восстановлено игр: 1 из 2" in second.stdout
+        assert "Уже введено из журнала: 4" in second.stdout
+        assert "ИТОГ" in second.stdout.upper() or "РЕЙТИНГ" in second.stdout.upper()
+        assert read_journal(journal).finished
+
+        season = SeasonLedger(ledger)
+        try:
+            assert season.games_count() == 2
+        finally:
+            season.close()
+
+
+if __name__ == "__main__":
+    test_replay_restores_session()
+    test_main_resume()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Тесты бинарного архива игр
+"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from game_analyzer import GameAnalyzer
+from game_archive import ArchiveError, GameArchive, MAX_CHECKS, is_archive, main, write_archive
+from load_generator import game_payloads
+from models import Player, Role
+from rating_calculator import RatingCalculator
+from vectorized_engine import GameColumns, random_columns, score_columns
+
+
+def _games(n_games: int, seed: int):
+    columns = random_columns(n_games, seed=seed)
+    games = [columns.to_players(g) for g in range(len(columns))]
+    for g, players in enumerate(games):
+        # Разные имена в разных играх, чтобы проверить таблицу имен
+        renamed = {p.name: f"{p.name}-{g % 7}" for p in players}
+        for p in players:
+            p.name = renamed[p.name]
+            p.checked_players = [renamed[name] for name in p.checked_players]
+    return games
+
+
+def test_round_trip():
+    """Игры читаются из архива без потерь"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Запись и чтение архива")
+    print("="*60)
+
+    games = _games(500, seed=11)
+    games.append([
+        Player("Иван", Role.CIVILIAN, "0"),
+        Player("Петр", Role.SHERIFF, "2N", ["Сергей", "Незнакомец", "Иван"]),
+        Player("Сергей", Role.DON, "1D"),
+    ])
+    # Дни больше байта хранятся как записаны (угадайка зависит от них)
+    games.append([
+        Player("A", Role.CIVILIAN, "300D"),
+        Player("B", Role.CIVILIAN, "256N"),
+        Player("C", Role.CIVILIAN, "0"),
+        Player("D", Role.MAFIA, "0"),
+        Player("E", Role.SHERIFF, "1N"),
+    ])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.mga")
+        assert write_archive(path, games) == len(games)
+        assert is_archive(path)
+
+        with GameArchive(path) as archive:
+            assert len(archive) == len(games)
+            for g, players in enumerate(games):
+                restored = archive.players(g)
+                assert [(p.name, p.role, p.killed_when) for p in restored] == \
+                    [(p.name, p.role, p.killed_when) for p in players]
+            assert GameAnalyzer(archive[len(games) - 1]).analyze() == GameAnalyzer(games[-1]).analyze()
+            sheriff = next(p for p in archive.players(len(games) - 2) if p.role == Role.SHERIFF)
+            assert sheriff.checked_players == ["Сергей", "Иван"]
+
+            expected = GameColumns.from_games(games)
+            columns = archive.columns()
+            for field in ("role", "kill_day", "kill_phase", "checks"):
+                assert np.array_equal(getattr(columns, field), getattr(expected, field)), field
+            # Роли - представление файла, а не копия
+            assert not columns.role.flags.owndata
+            del columns
+
+    print(f"✅ {len(games)} игр совпадают")
+
+
+def test_scoring_over_archive():
+    """Анализатор и векторизованный подсчет работают прямо по архиву"""
+    games = _games(300, seed=4)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.mga")
+        write_archive(path, games)
+        with GameArchive(path) as archive:
+            expected = score_columns(GameColumns.from_games(games)).points
+            points = np.concatenate([scores.points for _, scores in archive.score_chunks(chunk=64)])
+            assert np.array_equal(points, expected)
+
+            game = archive[5]
+            analyzer = GameAnalyzer(game)
+            results = RatingCalculator(game, analyzer.analyze(), analyzer).calculate_all()
+            assert [r.total_points for r in results] == expected[5, :len(game)].tolist()
+
+
+def test_many_names():
+    """Архив с именами сверх 65536 читается целиком"""
+    columns = random_columns(6600, seed=9)
+    games = []
+    for g in range(len(columns)):
+        players = columns.to_players(g)
+        renamed = {p.name: f"{p.name}-{g}" for p in players}
+        for p in players:
+            p.name = renamed[p.name]
+            p.checked_players = [renamed[name] for name in p.checked_players]
+        games.append(players)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.mga")
+        write_archive(path, games)
+        with GameArchive(path) as archive:
+            assert len(archive.names) > 0x10000
+            imported = list(archive.imported_games())
+        assert len(imported) == len(games)
+        assert imported[-1].players == games[-1]
+
+
+def test_bad_file():
+    """Чужой или недописанный файл - ArchiveError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"game": 1, "players": []}\n' * 3)
+        assert not is_archive(path)
+        try:
+            GameArchive(path)
+        except ArchiveError:
+            pass
+        else:
+            raise AssertionError("ожидалась ArchiveError")
+
+        archive_path = os.path.join(tmp, "games.mga")
+        write_archive(archive_path, _games(10, seed=1))
+        with open(archive_path, "r+b") as f:
+            f.truncate(200)
+        try:
+            GameArchive(archive_path)
+        except ArchiveError:
+            pass
+        else:
+            raise AssertionError("ожидалась ArchiveError")
+
+
+def test_pack_skips_unpackable_game():
+    """Игра с проверками сверх MAX_CHECKS пропускается, остальные упаковываются"""
+    records = [json.loads(payload) for payload in game_payloads(3, seed=2)]
+    sheriff = next(p for p in records[1]["players"] if p["role"] == "Шериф")
+    others = [p["name"] for p in records[1]["players"] if p is not sheriff]
+    sheriff["checks"] = (others * 2)[:MAX_CHECKS + 1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "games.jsonl")
+        with open(source, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        target = os.path.join(tmp, "games.mga")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main(["pack", source, target])
+        assert "Упаковано игр: 2" in out.getvalue()
+        assert "строка 2: не упакована" in out.getvalue()
+        with GameArchive(target) as archive:
+            assert len(archive) == 2
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_scoring_over_archive()
+    test_many_names()
+    test_bad_file()
+    test_pack_skips_unpackable_game()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
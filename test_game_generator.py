@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Тест генератора синтетических игр
+"""
+from collections import Counter
+
+from models import Role, Team
+from game_generator import GameGenerator
+from game_analyzer import GameAnalyzer
+
+
+def test_generated_games_are_valid():
+    """Составы корректные, игра заканчивается ровно при победе одной из команд"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Генератор игр")
+    print("="*60)
+
+    outcomes = Counter()
+    for players in GameGenerator(seed=1).games(2000):
+        roles = Counter(p.role for p in players)
+        assert len(players) == 10 and len({p.name for p in players}) == 10
+        assert roles[Role.SHERIFF] == 1 and roles[Role.DON] == 1 and roles[Role.MAFIA] == 2
+
+        analysis = GameAnalyzer(players).analyze()
+        alive = [p for p in players if p.is_alive()]
+        mafia = sum(1 for p in alive if p.get_team() == Team.MAFIA)
+        assert mafia == 0 or len(alive) - mafia <= mafia
+
+        sheriff = next(p for p in players if p.role == Role.SHERIFF)
+        assert len(set(sheriff.checked_players)) == len(sheriff.checked_players)
+
+        outcomes[analysis.winner] += 1
+        outcomes["guessing"] += analysis.is_guessing
+
+    print(f"✅ {dict(outcomes)}")
+    assert outcomes[Team.CIVILIANS] > 500 and outcomes[Team.MAFIA] > 500
+    assert outcomes["guessing"] > 0
+
+
+def test_seed_is_deterministic():
+    """Одинаковый seed - одинаковые игры"""
+    assert list(GameGenerator(seed=7).games(50)) == list(GameGenerator(seed=7).games(50))
+    assert list(GameGenerator(seed=7).games(50)) != list(GameGenerator(seed=8).games(50))
+
+
+if __name__ == "__main__":
+    test_generated_games_are_valid()
+    test_seed_is_deterministic()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Тесты пакетной проверки архива
+"""
+import io
+import json
+import os
+import tempfile
+
+from batch_loader import BatchLoader
+from game_archive import write_archive
+from game_validator import validate_file, validate_games
+from load_generator import game_payloads
+
+
+def _seat(name, role, killed_when="0", checks=None):
+    seat = {"name": name, "role": role, "killed_when": killed_when}
+    if checks:
+        seat["checks"] = checks
+    return seat
+
+
+def _valid_game():
+    """Мирные выгнали всю мафию: 1D, 2D, 3D; ночью убиты двое мирных"""
+    return {"game": "ok", "winner": "Мирные", "players": [
+        _seat("Иван", "Мирный"),
+        _seat("Мария", "Мирный", "1N"),
+        _seat("Петр", "Шериф", "0", [4, 5]),
+        _seat("Алексей", "Дон", "1D"),
+        _seat("Сергей", "Мафия", "2D"),
+        _seat("Ольга", "Мирный", "2N"),
+        _seat("Николай", "Мирный"),
+        _seat("Дмитрий", "Мафия", "3D"),
+        _seat("Анна", "Мирный"),
+        _seat("Елена", "Мирный"),
+    ]}
+
+
+def _games(records):
+    source = io.StringIO("\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n")
+    return BatchLoader(source, strict=False).games()
+
+
+def _codes(report, game_id):
+    return {issue.code for issue in report.issues if issue.game_id == game_id}
+
+
+def test_detects_errors():
+    """Каждая ошибка находится и попадает в отчет со своим кодом"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Пакетная проверка архива")
+    print("="*60)
+
+    def variant(game_id, change):
+        record = _valid_game()
+        record["game"] = game_id
+        change(record["players"], record)
+        return record
+
+    def set_seat(i, **fields):
+        return lambda players, _record: players[i].update(fields)
+
+    records = [
+        _valid_game(),
+        variant("roles", set_seat(3, role="Мафия")),                  # нет Дона, 3 Мафии
+        variant("two_sheriffs", set_seat(0, role="Шериф")),
+        variant("double_vote", set_seat(4, killed_when="1D")),
+        variant("double_kill", set_seat(5, killed_when="1N")),
+        variant("after_end", set_seat(9, killed_when="4N")),           # мирные уже победили на 3D
+        variant("unfinished", set_seat(7, killed_when="0")),
+        variant("check_self", set_seat(2, checks=[3])),
+        variant("check_bad_seat", set_seat(2, checks=[4, 11])),
+        variant("check_twice", set_seat(2, checks=[4, 4])),
+        variant("check_civilian", set_seat(0, checks=[4])),
+        variant("winner", lambda _players, record: record.update(winner="Мафия")),
+        variant("winner_text", lambda _players, record: record.update(winner="ничья")),
+        variant("nine", lambda players, _record: players.pop(0)),
+    ]
+    report = validate_games(_games(records), chunk=4)
+
+    assert report.games_checked == len(records)
+    assert _codes(report, "ok") == set()
+    assert _codes(report, "roles") == {"don_count", "mafia_count"}
+    assert _codes(report, "two_sheriffs") == {"sheriff_count"}
+    assert _codes(report, "double_vote") == {"double_vote"}
+    assert _codes(report, "double_kill") == {"double_kill"}
+    assert _codes(report, "after_end") == {"kill_after_end"}
+    assert _codes(report, "unfinished") == {"unfinished"}
+    assert _codes(report, "check_self") == {"check_self"}
+    assert _codes(report, "check_bad_seat") == {"check_unknown"}
+    assert _codes(report, "check_twice") == {"check_repeated"}
+    assert _codes(report, "check_civilian") == {"check_not_sheriff"}
+    assert _codes(report, "winner") == {"winner_mismatch"}
+    assert _codes(report, "winner_text") == {"unknown_winner"}
+    assert _codes(report, "nine") == {"seat_count"}
+    # Предупреждение не считается ошибкой игры
+    assert report.games_with_errors == len(records) - 2
+    assert not report.ok
+
+    issue = next(i for i in report.issues if i.code == "winner_mismatch")
+    assert issue.line == 12 and issue.game == 12 and "Мафия" in issue.message
+    assert report.to_dict()["counts"]["winner_mismatch"] == 1
+    print(report.format_summary())
+
+
+def test_generated_archive_is_clean():
+    """Корректные игры генератора проходят проверку, в том числе из бинарного архива"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.jsonl")
+        with open(path, "wb") as f:
+            f.write(b"\n".join(game_payloads(500, seed=9)) + b"\n")
+        report = validate_file(path, chunk=128)
+        assert report.games_checked == 500
+        assert report.games_with_errors == 0, report.issues[:5]
+        assert report.ok
+
+        with open(path, encoding="utf-8") as f:
+            games = [g.players for g in BatchLoader(f).games()]
+        archive_path = os.path.join(tmp, "games.mga")
+        write_archive(archive_path, games)
+        assert validate_file(archive_path, chunk=128).ok
+
+
+if __name__ == "__main__":
+    test_detects_errors()
+    test_generated_archive_is_clean()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Тест замеров этапов конвейера
+"""
+import json
+
+from batch_loader import score_game
+from game_analyzer import GameAnalyzer
+from game_generator import GameGenerator
+from instrumentation import Metrics
+from session_manager import SessionManager
+
+
+def test_metrics_collect_and_restore():
+    """Включенные замеры считают вызовы, выключенные возвращают исходные методы"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Замеры этапов")
+    print("="*60)
+
+    original = GameAnalyzer.__dict__["analyze"]
+    registry = Metrics()
+    registry.enable()
+    try:
+        assert GameAnalyzer.__dict__["analyze"] is not original
+        session = SessionManager(20)
+        for players in GameGenerator(seed=5).games(20):
+            analysis, results = score_game(players)
+            session.add_game_results(results, analysis)
+    finally:
+        registry.disable()
+
+    assert GameAnalyzer.__dict__["analyze"] is original
+    assert registry.timers["analyzer.analyze"].calls == 20
+    assert registry.timers["analyzer.check_guessing"].calls == 20
+    assert registry.timers["calculator.calculate_all"].calls == 20
+    assert registry.timers["session.add_game_results"].calls == 20
+    assert registry.counters["games_analyzed"] == 20
+    assert registry.counters["ratings_results"] == 200
+    print(registry.summary_table())
+
+    # Выключенные замеры ничего не копят
+    score_game(GameGenerator(seed=6).generate())
+    registry.count("games_analyzed")
+    assert registry.timers["analyzer.analyze"].calls == 20
+    assert registry.counters["games_analyzed"] == 20
+
+    data = json.loads(registry.to_json())
+    assert data["timers"]["analyzer.analyze"]["calls"] == 20
+    prom = registry.to_prometheus()
+    assert 'mafia_stage_seconds_count{stage="analyzer.analyze"} 20' in prom
+    assert "mafia_games_analyzed_total 20" in prom
+
+    registry.reset()
+    assert registry.timers["analyzer.analyze"].calls == 0 and not registry.counters
+    print("✅ Замеры собраны, методы восстановлены")
+
+
+if __name__ == "__main__":
+    test_metrics_collect_and_restore()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Тест таблицы лидеров: порядок совпадает с полной сортировкой
+"""
+import random
+
+from leaderboard import IndexableSkipList
+from session_manager import PlayerStats, SessionManager
+from models import Player, RatingResult, Role
+
+
+def _sorted_reference(stats):
+    players = list(stats)
+    players.sort(key=lambda p: (p.total_points, p.games_played), reverse=True)
+    return players
+
+
+def _best_reference(stats):
+    qualified = [p for p in stats if p.games_played >= 3]
+    qualified.sort(key=lambda p: p.total_points, reverse=True)
+    return qualified[0] if qualified else None
+
+
+def test_skiplist_rank_and_index():
+    """Вставка, удаление, индекс и место элемента"""
+    skiplist = IndexableSkipList(seed=1)
+    values = list(range(0, 400, 2))
+    random.Random(2).shuffle(values)
+    for v in values:
+        skiplist.insert(v, str(v))
+    for v in values[:50]:
+        skiplist.remove(v)
+
+    expected = sorted(values[50:])
+    assert [k for k, _ in skiplist] == expected
+    assert [skiplist[i][0] for i in range(len(expected))] == expected
+    assert all(skiplist.rank(v) == i for i, v in enumerate(expected))
+
+
+def test_session_order_matches_sort():
+    """SessionManager отдает тот же порядок и лучшего игрока, что и сортировка"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Таблица лидеров")
+    print("="*60)
+
+    rng = random.Random(5)
+    names = [f"Игрок{i}" for i in range(40)]
+    session = SessionManager(0)
+
+    for game in range(200):
+        results = []
+        for name in rng.sample(names, 10):
+            result = RatingResult(player=Player(name, Role.CIVILIAN))
+            result.add_points("Баллы", rng.randint(-3, 6))
+            results.append(result)
+        session.add_game_results(results)
+
+        stats = list(session.player_stats.values())
+        reference = _sorted_reference(stats)
+        assert session.get_all_players() == reference
+        assert session.get_best_player() is _best_reference(stats)
+
+    top = session.get_top_players(5)
+    assert top == reference[:5]
+    assert all(session.get_player_rank(p.name) == i for i, p in enumerate(reference, 1))
+    print(f"✅ Порядок совпадает, лидер: {top[0].name} ({top[0].total_points})")
+
+
+def test_best_player_requires_three_games():
+    """Без игроков с 3+ играми лучшего нет"""
+    session = SessionManager(0)
+    result = RatingResult(player=Player("Иван", Role.CIVILIAN))
+    result.add_points("Победа за Мирного", 4)
+    session.add_game_results([result])
+    assert session.get_best_player() is None
+    assert isinstance(session.get_all_players()[0], PlayerStats)
+
+
+if __name__ == "__main__":
+    test_skiplist_rank_and_index()
+    test_session_order_matches_sort()
+    test_best_player_requires_three_games()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Тест игры из потока событий
+"""
+from game_analyzer import GameAnalyzer
+from game_generator import GameGenerator
+from live_game import EventType, GameEvent, GameEventError, LiveGame
+from models import Role, Team
+from rating_calculator import RatingCalculator
+from vectorized_engine import random_columns
+
+
+ROSTER = [("Игрок1", Role.CIVILIAN), ("Игрок2", Role.CIVILIAN), ("Игрок3", Role.CIVILIAN),
+          ("Игрок4", Role.CIVILIAN), ("Игрок5", Role.CIVILIAN), ("Игрок6", Role.CIVILIAN),
+          ("Игрок7", Role.SHERIFF), ("Игрок8", Role.MAFIA), ("Игрок9", Role.MAFIA), ("Игрок10", Role.DON)]
+
+
+def test_live_state_during_game():
+    """Состояние обновляется на каждом событии, угадайка - при 3 живых"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Игра из событий")
+    print("="*60)
+
+    game = LiveGame(ROSTER)
+    game.vote_out(1, "Игрок8")
+    game.sheriff_check(1, "Игрок9")
+    game.don_check(1, "Игрок7")
+    game.night_kill(1, "Игрок1")
+    state = game.state()
+    assert (state.alive_civilians, state.alive_mafia, state.winner) == (6, 2, None)
+    assert state.clean_win_possible and not state.dry_win_possible and state.black_checks == 1
+
+    game.vote_out(2, "Игрок2")
+    game.night_kill(2, "Игрок3")
+    assert not game.state().clean_win_possible
+
+    game.vote_out(3, "Игрок9")
+    game.night_kill(3, "Игрок4")
+    assert not game.state().guessing_next_vote  # Живы: 5, 6, 7, 10
+    game.night_kill(4, "Игрок5")
+    assert game.state().guessing_next_vote
+    game.vote_out(5, "Игрок10")
+    assert game.finished and game.winner == Team.CIVILIANS
+
+    analysis = game.analysis()
+    assert analysis.is_guessing and analysis.guessing_players == ["Игрок6", "Игрок7", "Игрок10"]
+    assert analysis == GameAnalyzer(game.players).analyze()
+    assert game.don_checks == ["Игрок7"]
+    print("✅ Состояние и итоговый анализ верны")
+
+
+def test_invalid_events():
+    """Событие в прошлом, двойное убийство и неизвестный игрок отклоняются"""
+    game = LiveGame(ROSTER)
+    game.night_kill(2, "Игрок1")
+    for event in (GameEvent(EventType.VOTE_OUT, 2, "Игрок2"),
+                  GameEvent(EventType.NIGHT_KILL, 3, "Игрок1"),
+                  GameEvent(EventType.VOTE_OUT, 3, "Никто")):
+        try:
+            game.apply(event)
+        except GameEventError:
+            continue
+        raise AssertionError(f"событие принято: {event}")
+    assert len(game.events) == 1
+
+    log = [e.to_dict() for e in game.events]
+    assert LiveGame.from_events(ROSTER, log).analysis() == game.analysis()
+
+
+def test_matches_game_analyzer():
+    """Анализ и баллы совпадают с GameAnalyzer на сгенерированных и случайных играх"""
+    columns = random_columns(1000, seed=13)
+    games = list(GameGenerator(seed=13).games(1000)) + [columns.to_players(g) for g in range(len(columns))]
+    for players in games:
+        live = LiveGame.from_players(players)
+        analyzer = GameAnalyzer(players)
+        analysis = analyzer.analyze()
+        assert live.analysis() == analysis
+        expected = RatingCalculator(players, analysis, analyzer).calculate_all()
+        assert [r.breakdowns for r in live.score()] == [r.breakdowns for r in expected]
+    print(f"✅ {len(games)} игр совпадают с GameAnalyzer")
+
+
+if __name__ == "__main__":
+    test_live_state_during_game()
+    test_invalid_events()
+    test_matches_game_analyzer()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
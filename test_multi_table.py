@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тесты сводной таблицы нескольких столов
+"""
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_loader import BatchLoader, score_game
+from load_generator import game_payloads
+from multi_table import MultiTableSession, score_table
+from session_manager import SessionManager
+
+
+TABLES = 4
+
+
+def _tables(n_games: int, seed: int):
+    source = io.StringIO(b"\n".join(game_payloads(n_games, seed=seed)).decode("utf-8") + "\n")
+    games = [g.players for g in BatchLoader(source).games()]
+    return [games[t::TABLES] for t in range(TABLES)]
+
+
+def _totals(players):
+    return {p.name: (p.total_points, p.games_played) for p in players}
+
+
+def _sequential(tables):
+    session = SessionManager(0)
+    for games in tables:
+        for players in games:
+            analysis, results = score_game(players)
+            session.add_game_results(results, analysis)
+    return session
+
+
+def test_threads():
+    """Столы в потоках: суммы совпадают с последовательным подсчетом"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Несколько столов в потоках")
+    print("="*60)
+
+    tables = _tables(400, seed=3)
+    multi = MultiTableSession()
+    multi.start_compaction(interval=0.001)
+
+    def play(table_id, games):
+        for players in games:
+            analysis, results = score_game(players)
+            multi.add_game_results(table_id, results, analysis)
+
+    threads = [threading.Thread(target=play, args=(f"стол {t + 1}", games)) for t, games in enumerate(tables)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    multi.close()
+
+    expected = _sequential(tables)
+    assert multi.current_game == 400
+    assert multi.games_by_table == {f"стол {t + 1}": 100 for t in range(TABLES)}
+    assert _totals(multi.get_all_players()) == _totals(expected.get_all_players())
+    best, expected_best = multi.get_best_player(), expected.get_best_player()
+    assert (best.total_points, best.games_played) == (expected_best.total_points, expected_best.games_played)
+    points = [p.total_points for p in multi.get_all_players()]
+    assert points == sorted(points, reverse=True)
+    print(f"✅ Лучший игрок: {best.name} ({best.total_points})")
+
+
+def test_processes():
+    """Столы в процессах присылают приращения - итог тот же"""
+    tables = _tables(200, seed=8)
+    multi = MultiTableSession()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(score_table, f"стол {t + 1}", games) for t, games in enumerate(tables)]
+        for future in futures:
+            multi.apply_delta(future.result())
+
+    # Приращения между слияниями не теряются и не удваиваются
+    shard = multi.table("стол 1")
+    extra = tables[0][:2]
+    for players in extra:
+        analysis, results = score_game(players)
+        shard.add_game_results(results, analysis)
+        multi.refresh()
+
+    expected = _sequential(tables + [extra])
+    assert multi.current_game == 202
+    assert _totals(multi.get_all_players()) == _totals(expected.get_all_players())
+    assert multi.refresh() == 0
+
+
+if __name__ == "__main__":
+    test_threads()
+    test_processes()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
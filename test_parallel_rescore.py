@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Тест параллельного пересчета: результат не зависит от числа процессов
+"""
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+
+from batch_loader import BatchLoader, score_games
+from main import run_import
+from parallel_rescore import rescore_games, rescore_jsonl
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+from vectorized_engine import random_columns
+
+
+def _write_archive(path, count, seed):
+    rng = random.Random(seed)
+    names = [f"Игрок{i}" for i in range(30)]
+    columns = random_columns(count, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for g in range(count):
+            players = columns.to_players(g)
+            seat_names = rng.sample(names, len(players))
+            rename = dict(zip((p.name for p in players), seat_names))
+            seats = [{"name": rename[p.name], "role": p.role.value, "killed_when": p.killed_when,
+                      "checks": [rename[c] for c in p.checked_players]} for p in players]
+            f.write(json.dumps({"game": g, "players": seats}, ensure_ascii=False) + "\n")
+            if g % 97 == 0:
+                f.write("{битая строка\n")
+
+
+def _snapshot(session):
+    return [(p.name, p.total_points, p.games_played, p.game_results) for p in session.get_all_players()]
+
+
+def test_parallel_matches_sequential():
+    """Таблица одинакова при 1, 2 и 3 процессах и совпадает с последовательной"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Параллельный пересчет")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive.jsonl")
+        _write_archive(path, 600, seed=4)
+
+        sequential = SessionManager(0)
+        with open(path, encoding="utf-8") as f:
+            loader = BatchLoader(f)
+            games = []
+            for game, analysis, results in score_games(loader.games()):
+                sequential.add_game_results(results, analysis)
+                games.append(game.players)
+        expected = _snapshot(sequential)
+
+        for workers in (1, 2, 3):
+            session, issues = rescore_jsonl(path, workers, shard_size=70)
+            assert _snapshot(session) == expected
+            assert session.current_game == sequential.current_game
+            assert [i.line for i in issues] == [i.line for i in loader.issues]
+            assert session.get_best_player().name == sequential.get_best_player().name
+
+        assert _snapshot(rescore_games(games, workers=2, shard_size=50)) == expected
+
+    print(f"✅ Совпадает: {sequential.current_game} игр, {len(loader.issues)} ошибок разбора")
+
+
+def test_workers_ignored_warning():
+    """--workers с журналом сезона не дает параллельного пересчета - об этом предупреждают"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive.jsonl")
+        _write_archive(path, 20, seed=2)
+        outputs = []
+        for ledger in (None, SeasonLedger()):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                run_import(path, workers=2, ledger=ledger)
+            outputs.append(out.getvalue())
+        assert "--workers не используется" not in outputs[0]
+        assert "--workers не используется (--ledger)" in outputs[1]
+
+
+if __name__ == "__main__":
+    test_parallel_matches_sequential()
+    test_workers_ignored_warning()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Тест реестра игроков
+"""
+import threading
+
+from batch_loader import score_game
+from game_generator import GameGenerator
+from player_registry import PlayerRegistry
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+from skill_rating import SkillRating
+
+
+def test_registry_ids_and_aliases():
+    """Номера выдаются подряд, псевдонимы ведут к основному имени"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Реестр игроков")
+    print("="*60)
+
+    registry = PlayerRegistry()
+    assert [registry.intern(n) for n in ("Иван", "Петр", "Иван")] == [0, 1, 0]
+    registry.add_alias("Ваня", "Иван")
+    assert registry.resolve("Ваня") == 0 and registry.canonical("Ваня") == "Иван"
+    assert registry.find("Никто") is None and len(registry) == 2
+    print("✅ Номера и псевдонимы")
+
+
+def test_intern_threads():
+    """Потоки, добавляющие разные новые имена, получают разные номера"""
+    registry = PlayerRegistry()
+    barrier = threading.Barrier(8)
+
+    def worker(t):
+        barrier.wait()
+        for i in range(2000):
+            registry.intern(f"Игрок{t}-{i}")
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(registry) == 8 * 2000 == len(set(registry.ids.values()))
+    assert all(registry.names[pid] == name for name, pid in registry.ids.items())
+
+
+def test_session_merges_aliases():
+    """Результаты под псевдонимом засчитываются основному игроку - в сессии, рейтинге силы и журнале сезона"""
+    games = [score_game(players) for players in GameGenerator(seed=19, player_pool=12).games(30)]
+
+    plain_registry = PlayerRegistry()
+    plain = SessionManager(30, SeasonLedger(registry=plain_registry), SkillRating(registry=plain_registry),
+                           registry=plain_registry)
+    for analysis, results in games:
+        plain.add_game_results(results, analysis)
+
+    registry = PlayerRegistry()
+    registry.add_alias("Первый", "Игрок1")
+    aliased = SessionManager(30, SeasonLedger(registry=registry), SkillRating(registry=registry),
+                             registry=registry)
+    for analysis, results in games:
+        for r in results:
+            if r.player.name == "Игрок1":
+                r.player.name = "Первый"
+        aliased.add_game_results(results, analysis)
+
+    expected = [(p.name, p.total_points, p.games_played) for p in plain.get_all_players()]
+    assert [(p.name, p.total_points, p.games_played) for p in aliased.get_all_players()] == expected
+    assert aliased.get_player_rank("Первый") == aliased.get_player_rank("Игрок1")
+    assert list(aliased.player_stats) == list(plain.player_stats)
+    assert "Первый" not in [p.name for p in aliased.skill.top()]
+    assert aliased.skill.get("Первый") == plain.skill.get("Игрок1")
+    season = plain.ledger.seasons()[0]
+    assert aliased.ledger.season_standings(season) == plain.ledger.season_standings(season)
+    print("✅ Псевдонимы объединены в сессии")
+
+
+if __name__ == "__main__":
+    test_registry_ids_and_aliases()
+    test_intern_threads()
+    test_session_merges_aliases()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
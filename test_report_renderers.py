@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Тест отчетов в разных форматах
+"""
+import contextlib
+import csv
+import io
+import json
+
+from batch_loader import score_game
+from game_generator import GameGenerator
+from output_formatter import OutputFormatter
+from report_renderers import RENDERERS, Renderer, render_report
+from session_manager import SessionManager
+from session_output import SessionOutputFormatter
+
+
+def _season(count: int):
+    session = SessionManager(count)
+    games = []
+    for players in GameGenerator(seed=11).games(count):
+        analysis, results = score_game(players)
+        session.add_game_results(results, analysis)
+        games.append((results, analysis))
+    return games, session
+
+
+def test_text_matches_console_output():
+    """Текстовый отчет совпадает с выводом на экран"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Отчеты")
+    print("="*60)
+
+    games, session = _season(5)
+    screen = io.StringIO()
+    with contextlib.redirect_stdout(screen):
+        for number, (results, analysis) in enumerate(games, 1):
+            SessionOutputFormatter().format_game_separator(number, 5)
+            OutputFormatter().print_results(results, analysis)
+        SessionOutputFormatter().format_final_rating(session)
+
+    report = render_report(games, session, "text")
+    assert report == screen.getvalue().replace(" из 5\n", "\n")
+    print("✅ Текст совпадает с выводом на экран")
+
+
+def test_structured_formats():
+    """JSON, CSV и HTML содержат все игры и итоговую таблицу"""
+    games, session = _season(8)
+    players = session.get_all_players()
+
+    data = json.loads(render_report(games, session, "json"))
+    assert len(data["games"]) == 8 and data["total_games"] == 8
+    assert [r["name"] for r in data["standings"]] == [p.name for p in players]
+    assert data["games"][0]["players"][0]["total_points"] == games[0][0][0].total_points
+    assert json.loads(render_report([], None, "json")) == {"games": []}
+
+    rows = list(csv.DictReader(io.StringIO(render_report(games, session, "csv"))))
+    assert sum(r["section"] == "game" for r in rows) == 80
+    assert [r["name"] for r in rows if r["section"] == "total"] == [p.name for p in players]
+
+    page = render_report(games, session, "html")
+    assert page.startswith("<!DOCTYPE html>") and page.endswith("</html>\n")
+    assert page.count("<h2>Игра ") == 8
+    print("✅ JSON, CSV и HTML собраны")
+
+
+def test_renderer_must_implement_game_and_standings():
+    """Рендерер без game() или standings() не создается"""
+    class GamesOnly(Renderer):
+        def game(self, number, results, analysis):
+            return ""
+
+    for cls in (Renderer, GamesOnly):
+        try:
+            cls()
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"{cls.__name__} создан без standings()")
+    for cls in RENDERERS.values():
+        cls()
+    print("✅ Неполный рендерер отклонен")
+
+
+if __name__ == "__main__":
+    test_text_matches_console_output()
+    test_structured_formats()
+    test_renderer_must_implement_game_and_standings()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Тесты компактного хранения результатов (маска правил и итог)
+"""
+import io
+
+from batch_loader import BatchLoader, score_game
+from load_generator import game_payloads
+from models import Player, RatingResult, Role
+from player_registry import PlayerRegistry
+from result_log import ResultLog
+from scoring_rules import RuleSet, default_rules
+
+
+def _games(n_games: int, seed: int):
+    source = io.StringIO(b"\n".join(game_payloads(n_games, seed=seed)).decode("utf-8") + "\n")
+    return [g.players for g in BatchLoader(source).games()]
+
+
+def test_mask_expands_to_breakdowns():
+    """Маска разворачивается в ту же детализацию, итог - сумма ее баллов"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Маска правил и журнал результатов")
+    print("="*60)
+
+    rules = default_rules()
+    log = ResultLog(rules, PlayerRegistry())
+    scored = [score_game(players)[1] for players in _games(300, seed=17)]
+    for results in scored:
+        log.add_game(results)
+        for result in results:
+            assert result.total_points == sum(b.points for b in result.breakdowns)
+            assert result.total_points == rules.mask_points(result.rule_mask)
+            assert result.breakdown_count == len(result.breakdowns)
+
+    assert log.games == 300 and len(log) == 3000
+    for game in (0, 150, 299):
+        assert log.game_results(game) == [(r.player.name, r.total_points, r.breakdowns) for r in scored[game]]
+    # Место: номер игрока, маска (правил меньше 32) и итог
+    assert log.nbytes <= len(log) * 10 + log.games * 4
+    print(f"✅ {len(log)} мест, {log.nbytes / len(log):.1f} байт на место")
+
+
+def test_manual_points_and_other_rules():
+    """Баллы вне правил и чужой набор правил в журнал не пишутся"""
+    result = RatingResult(player=Player("Иван", Role.CIVILIAN))
+    result.add_points("Бонус судьи", 2)
+    result.add_points("Пусто", 0)
+    assert result.total_points == 2 and result.rule_mask == 0
+    assert [(b.description, b.points) for b in result.breakdowns] == [("Бонус судьи", 2)]
+
+    log = ResultLog(registry=PlayerRegistry())
+    for bad in ([result], [RatingResult(Player("Петр", Role.DON), 1, 5, RuleSet.from_dict(default_rules().to_dict()))]):
+        try:
+            log.add_game(bad)
+            assert False, "ожидалась ошибка"
+        except ValueError:
+            pass
+    assert log.games == 0 and len(log) == 0
+
+
+if __name__ == "__main__":
+    test_mask_expands_to_breakdowns()
+    test_manual_points_and_other_rules()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
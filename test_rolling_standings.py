@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Тесты таблиц за период (накопительные суммы по дням)
+"""
+import io
+import random
+from datetime import date, timedelta
+
+from batch_loader import BatchLoader, score_game
+from load_generator import game_payloads
+from models import Role
+from rolling_standings import RollingStandings
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+
+
+START = date(2026, 9, 1)
+
+
+def _dated_games(n_games: int, seed: int, backfill: float = 0.1):
+    """Игры по дням, часть - задним числом (добавляются позже своего дня)"""
+    source = io.StringIO(b"\n".join(game_payloads(n_games, seed=seed)).decode("utf-8") + "\n")
+    rng = random.Random(seed)
+    games = []
+    for i, imported in enumerate(BatchLoader(source).games()):
+        analysis, results = score_game(imported.players)
+        day = START + timedelta(days=i * 60 // n_games)
+        if rng.random() < backfill:
+            day -= timedelta(days=rng.randint(1, 10))
+        games.append((results, analysis, day))
+    return games
+
+
+def _replay(games, start, end):
+    """Таблица периода пересчетом игр по порядку дней - для сверки"""
+    session = SessionManager(0)
+    for results, analysis, day in sorted(games, key=lambda game: game[2]):
+        if start <= day <= end:
+            session.add_game_results(results, analysis)
+    return session
+
+
+def test_windows_match_replay():
+    """Таблица и лучший игрок за любой период совпадают с пересчетом"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Таблицы за период")
+    print("="*60)
+
+    games = _dated_games(600, seed=12)
+    rolling = RollingStandings()
+    for results, analysis, day in games:
+        rolling.add_game(results, analysis, day)
+
+    windows = [
+        rolling.week(date(2026, 9, 16)),
+        rolling.month(2026, 9),
+        rolling.month(2026, 10),
+        rolling.last_game_days(30),
+        (START - timedelta(days=30), START + timedelta(days=100)),
+        (date(2026, 9, 10), date(2026, 9, 10)),
+    ]
+    for start, end in windows:
+        expected = _replay(games, start, end)
+        rows = rolling.standings(start, end)
+        assert [(r.player, r.total_points, r.games_played) for r in rows] == \
+            [(p.name, p.total_points, p.games_played) for p in expected.get_all_players()], (start, end)
+        best, expected_best = rolling.best_player(start, end), expected.get_best_player()
+        assert (best.player if best else None) == (expected_best.name if expected_best else None)
+        for row in rows:
+            assert sum(row.role_games.values()) == row.games_played
+            assert row.wins <= row.games_played
+
+    top = rolling.standings(*rolling.month(2026, 9), limit=5)
+    assert len(top) == 5
+    print(f"✅ {len(windows)} периодов, лидер сентября: {top[0].player} ({top[0].total_points})")
+
+
+def test_periods_and_ledger():
+    """Границы периодов и построение по журналу сезона"""
+    assert RollingStandings.week(date(2026, 10, 18)) == (date(2026, 10, 12), date(2026, 10, 18))
+    assert RollingStandings.month(2026, 12) == (date(2026, 12, 1), date(2026, 12, 31))
+    assert RollingStandings.month(2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+
+    games = _dated_games(200, seed=4, backfill=0)
+    ledger = SeasonLedger()
+    rolling = RollingStandings()
+    for results, analysis, day in games:
+        ledger.commit_game(results, analysis, game_date=day)
+        rolling.add_game(results, analysis, day)
+    from_ledger = RollingStandings.from_ledger(ledger)
+    ledger.close()
+
+    start, end = rolling.last_game_days(7)
+    assert end == games[-1][2]
+    assert len([d for d in rolling.game_days if start.toordinal() <= d]) == 7
+    assert from_ledger.standings(start, end) == rolling.standings(start, end)
+    assert rolling.last_game_days(3, until=START - timedelta(days=1)) == (None, START - timedelta(days=1))
+    sheriff_games = sum(r.role_games.get(Role.SHERIFF, 0) for r in rolling.standings())
+    assert sheriff_games == len(games)
+
+
+if __name__ == "__main__":
+    test_windows_match_replay()
+    test_periods_and_ledger()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
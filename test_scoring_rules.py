@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Тест декларативных правил начисления баллов
+"""
+from models import Player, Role
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from scoring_rules import RuleSet, RuleSetError, default_rules
+from vectorized_engine import GameColumns, score_columns
+
+
+def _game():
+    return [
+        Player("Шериф1", Role.SHERIFF, "0", ["Дон1", "Мафия1", "Мафия2"]),
+        Player("Мирный1", Role.CIVILIAN, "2N"),
+        Player("Мирный2", Role.CIVILIAN, "0"),
+        Player("Мирный3", Role.CIVILIAN, "1N"),
+        Player("Дон1", Role.DON, "3D"),
+        Player("Мафия1", Role.MAFIA, "2D"),
+        Player("Мафия2", Role.MAFIA, "1D"),
+    ]
+
+
+def _breakdowns(players, rules=None):
+    analyzer = GameAnalyzer(players)
+    analysis = analyzer.analyze()
+    results = RatingCalculator(players, analysis, analyzer, rules).calculate_all()
+    return {r.player.name: [(b.description, b.points) for b in r.breakdowns] for r in results}
+
+
+def test_default_rules_breakdown():
+    """Таблица по умолчанию дает привычную детализацию"""
+    breakdowns = _breakdowns(_game())
+    assert breakdowns["Шериф1"] == [
+        ("Победа за Мирного", 4),
+        ("Победа за Шерифа", 3),
+        ("Не покидал стола", 2),
+        ("Победа в угадайке", 2),
+        ("3 черные проверки", 3),
+    ]
+    assert breakdowns["Дон1"] == [("Поражение за Дона", -3)]
+    assert default_rules().version == "2"
+
+
+def test_modified_rule_set():
+    """Измененные правила применяются и в калькуляторе, и в векторизованном движке"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Измененные правила")
+    print("="*60)
+
+    data = default_rules().to_dict()
+    for rule in data["rules"]:
+        if rule["id"] == "sheriff_alive":
+            rule["points"] = 5
+            rule["description"] = "Шериф дожил до конца"
+
+    rules = RuleSet.from_dict(data)
+    players = _game()
+    breakdowns = _breakdowns(players, rules)
+    assert ("Шериф дожил до конца", 5) in breakdowns["Шериф1"]
+
+    scores = score_columns(GameColumns.from_games([players]), rules)
+    assert scores.points[0, 0] == 4 + 3 + 5 + 2 + 3
+    print(f"✅ Шериф1: {breakdowns['Шериф1']}")
+
+
+def test_empty_killed_when():
+    """Пустой killed_when - игрок жив, расчет не падает"""
+    players = _game()
+    players[2] = Player("Мирный2", Role.CIVILIAN, "")
+    breakdowns = _breakdowns(players)
+    assert breakdowns["Мирный2"] == _breakdowns(_game())["Мирный2"]
+
+
+def test_invalid_rules():
+    """Неизвестное условие - ошибка компиляции"""
+    data = {"rules": [{"id": "x", "description": "x", "points": 1, "roles": ["Мирный"],
+                       "when": {"won": True, "lucky": True}}]}
+    try:
+        RuleSet.from_dict(data)
+    except RuleSetError:
+        return
+    raise AssertionError("ожидалась RuleSetError")
+
+
+if __name__ == "__main__":
+    test_default_rules_breakdown()
+    test_modified_rule_set()
+    test_empty_killed_when()
+    test_invalid_rules()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
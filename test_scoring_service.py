@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Тест сервиса подсчета
+"""
+import asyncio
+import json
+
+from batch_loader import parse_game_record, score_game
+from load_generator import game_payloads, run_load
+from scoring_service import ScoringService
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+
+
+async def _request(port: int, method: str, path: str, body: bytes = b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, payload = response.split(b"\r\n\r\n", 1)
+    return int(head.split(b" ")[1]), json.loads(payload)
+
+
+async def _scenario():
+    payloads = game_payloads(300, seed=21)
+    service = ScoringService(batch_window=0.005)
+    await service.start("127.0.0.1", 0)
+    try:
+        report = await run_load("127.0.0.1", service.port, concurrency=20, payloads=payloads)
+        standings = await _request(service.port, "GET", "/standings?limit=5")
+        bad = await _request(service.port, "POST", "/games", b'{"players": []}')
+        missing = await _request(service.port, "GET", "/nothing")
+    finally:
+        await service.close()
+    return payloads, service, report, standings, bad, missing
+
+
+def test_service_scores_and_batches():
+    """Сервис считает все игры, собирает их в пачки и отвечает на ошибки"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Сервис подсчета")
+    print("="*60)
+
+    payloads, service, report, standings, bad, missing = asyncio.run(_scenario())
+    print(f"✅ {report['requests']} игр, {service.batches} пачек, p99 {report['p99_ms']:.1f} мс")
+    assert report["requests"] == 300 and report["errors"] == 0
+    assert service.games_scored == 300 and service.batches < 300
+
+    # Суммы игроков не зависят от порядка прихода игр
+    expected = SessionManager(300)
+    for body in payloads:
+        analysis, results = score_game(parse_game_record(json.loads(body)))
+        expected.add_game_results(results, analysis)
+    totals = {p.name: (p.total_points, p.games_played) for p in service.session.get_all_players()}
+    assert totals == {p.name: (p.total_points, p.games_played) for p in expected.get_all_players()}
+
+    status, data = standings
+    assert status == 200 and data["total_games"] == 300 and len(data["standings"]) == 5
+    assert bad[0] == 400 and "игроков" in bad[1]["error"]
+    assert missing[0] == 404
+
+
+class _FailingLedger(SeasonLedger):
+    """Журнал, отказывающий на второй записи"""
+
+    def commit_game(self, results, analysis=None, game_date=None, season=None):
+        self.calls = getattr(self, "calls", 0) + 1
+        if self.calls == 2:
+            raise RuntimeError("диск переполнен")
+        return super().commit_game(results, analysis, game_date, season)
+
+
+async def _error_scenario():
+    payloads = game_payloads(3, seed=4)
+    ledger = _FailingLedger(check_same_thread=False)
+    service = ScoringService(SessionManager(0, ledger), batch_window=0.0)
+    await service.start("127.0.0.1", 0)
+    try:
+        responses = [
+            await _request(service.port, "GET", "/standings?limit=-1"),
+            await _request(service.port, "POST", "/games", b"\xff"),
+        ]
+        for body in payloads:
+            responses.append(await _request(service.port, "POST", "/games", body))
+    finally:
+        await service.close()
+    return service, ledger, responses
+
+
+def test_errors_answered():
+    """Ошибки запроса - 400, сбой журнала - 500 только у своей игры, сервис продолжает работать"""
+    service, ledger, responses = asyncio.run(_error_scenario())
+    assert [status for status, _ in responses] == [400, 400, 200, 500, 200]
+    assert responses[3][1]["error"] == "внутренняя ошибка сервиса"
+    assert service.games_scored == 2 and ledger.games_count() == 2
+    assert service.session.ledger is ledger and service.session.current_game == 2
+
+    # Журнал, привязанный к своему потоку, отклоняется сразу
+    try:
+        ScoringService(SessionManager(0, SeasonLedger()))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ожидалась ValueError")
+
+
+if __name__ == "__main__":
+    test_service_scores_and_batches()
+    test_errors_answered()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Тесты обработчика NDJSON (main.py --worker)
+"""
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+
+from load_generator import game_payloads
+from scoring_worker import ScoringWorker
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+
+
+def test_stream():
+    """Одна строка ответа на строку запроса, таблица копится между играми"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Обработчик NDJSON через поток")
+    print("="*60)
+
+    payloads = game_payloads(20, seed=2)
+    requests = b"\n".join(payloads) + b"\n\n" + b"{not json}\n" + \
+        b'{"game": "x", "players": []}\n' + b'{"command": "standings", "limit": 3}\n' + b'{"command": "stats"}\n'
+    output = io.BytesIO()
+    worker = ScoringWorker()
+    assert worker.serve_stream(io.BytesIO(requests), output) == 24
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(lines) == 24
+    assert [line["game"] for line in lines[:20]] == list(range(1, 21))
+    assert "error" in lines[20] and "error" in lines[21]
+    standings = lines[22]
+    assert standings["total_games"] == 20 and len(standings["standings"]) == 3
+    assert standings["standings"][0]["name"] == worker.session.get_all_players()[0].name
+    assert lines[23] == {"lines": 24, "errors": 2, "games_scored": 20,
+                         "players": len(worker.session.player_ids)}
+    print(f"✅ {len(lines)} ответов")
+
+
+class _FailingLedger(SeasonLedger):
+    """Журнал, отказывающий на второй записи"""
+
+    def commit_game(self, results, analysis=None, game_date=None, season=None):
+        self.calls = getattr(self, "calls", 0) + 1
+        if self.calls == 2:
+            raise OSError("диск переполнен")
+        return super().commit_game(results, analysis, game_date, season)
+
+
+def test_unix_socket():
+    """Несколько соединений к одному обработчику делят сессию и журнал сезона"""
+    # Журнал пишется из потоков соединений, как в main.py --worker SOCKET --ledger
+    ledger = _FailingLedger(check_same_thread=False)
+    worker = ScoringWorker(SessionManager(0, ledger))
+    responses = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "worker.sock")
+        server = worker.unix_server(path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for payload in game_payloads(3, seed=5):
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(path)
+                    stream = sock.makefile("rwb")
+                    stream.write(payload + b"\n")
+                    stream.flush()
+                    responses.append(json.loads(stream.readline()))
+                    stream.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+    # Игра, не записанная в журнал, не попадает и в сессию
+    assert "players" in responses[0] and "error" in responses[1] and responses[2]["game"] == 2
+    assert worker.session.current_game == 2 and ledger.games_count() == 2
+    assert worker.errors == 1
+
+
+if __name__ == "__main__":
+    test_stream()
+    test_unix_socket()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
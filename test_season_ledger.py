@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Тест журнала сезона (SQLite)
+"""
+import json
+import os
+import random
+import tempfile
+from datetime import date
+
+from batch_loader import score_game
+from load_generator import game_payloads
+from main import run_import
+from session_manager import SessionManager
+from season_ledger import SeasonLedger
+from vectorized_engine import random_columns
+
+
+def _games(count, seed):
+    rng = random.Random(seed)
+    names = [f"Игрок{i}" for i in range(25)]
+    columns = random_columns(count, seed)
+    for g in range(count):
+        players = columns.to_players(g)
+        for player, name in zip(players, rng.sample(names, len(players))):
+            player.name = name
+        analysis, results = score_game(players)
+        yield results, analysis
+
+
+def test_standings_match_session():
+    """Таблица сезона совпадает с итогом SessionManager и переживает перезапуск"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Журнал сезона")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "season.db")
+        ledger = SeasonLedger(path)
+        session = SessionManager(0, ledger)
+
+        games = list(_games(60, seed=11))
+        for results, analysis in games[:40]:
+            session.add_game_results(results, analysis)
+        ledger.close()
+
+        # Второй день - новый процесс, тот же файл
+        ledger = SeasonLedger(path)
+        session.ledger = ledger
+        for results, analysis in games[40:]:
+            session.add_game_results(results, analysis)
+
+        season = str(date.today().year)
+        standings = ledger.season_standings(season)
+        expected = session.get_all_players()
+
+        assert ledger.games_count(season) == 60
+        assert [(r.player, r.total_points, r.games_played) for r in standings] == \
+               [(p.name, p.total_points, p.games_played) for p in expected]
+        assert ledger.best_player(season).player == session.get_best_player().name
+        assert [r.player for r in ledger.season_standings(season, limit=5)] == \
+               [r.player for r in standings[:5]]
+        ledger.close()
+
+    print("✅ Таблица сезона совпадает")
+
+
+def test_import_keeps_game_dates():
+    """Игры архива ложатся в журнал под своей датой, без даты - под --date"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Даты импортированных игр")
+    print("="*60)
+
+    dates = ["2024-11-30", "2025-01-04", None, "2025-01-04"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for payload, day in zip(game_payloads(len(dates), seed=8), dates):
+                record = json.loads(payload)
+                if day is not None:
+                    record["date"] = day
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        ledger = SeasonLedger()
+        run_import(path, ledger=ledger, game_date=date(2025, 1, 2))
+        stored = [row[0] for row in ledger.conn.execute("SELECT game_date FROM games ORDER BY id")]
+        assert stored == ["2024-11-30", "2025-01-04", "2025-01-02", "2025-01-04"]
+        assert ledger.seasons() == ["2024", "2025"]
+        assert ledger.games_count("2025") == 3
+        ledger.close()
+
+    print("✅ Даты сохранены")
+
+
+if __name__ == "__main__":
+    test_standings_match_session()
+    test_import_keeps_game_dates()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
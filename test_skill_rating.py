@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Тест долгосрочного рейтинга силы
+"""
+import os
+import tempfile
+
+from batch_loader import score_game
+from game_generator import GameGenerator
+from models import ROLE_CODES, Team
+from season_ledger import SeasonLedger
+from session_manager import SessionManager
+from skill_rating import SkillRating
+
+
+def test_skill_updates_and_persists():
+    """Рейтинг обновляется по играм, сохраняется и продолжается в новый день"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Рейтинг силы")
+    print("="*60)
+
+    games = [score_game(players) for players in GameGenerator(seed=17, player_pool=40).games(400)]
+
+    whole = SkillRating()
+    for analysis, results in games:
+        whole.update(results, analysis)
+    assert whole.games == 400 and len(whole) == 40
+    assert sum(p.games for p in whole.top()) == 4000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skill.json")
+        day1 = SkillRating.load(path)
+        for analysis, results in games[:200]:
+            day1.update(results, analysis)
+        day1.save(path)
+
+        day2 = SkillRating.load(path)
+        session = SessionManager(200, skill=day2)
+        for analysis, results in games[200:]:
+            session.add_game_results(results, analysis)
+
+    assert day2.games == 400
+    assert abs(day2.mafia_advantage - whole.mafia_advantage) < 1e-9
+    assert all(abs(day2.rating(p.name) - p.rating) < 1e-9 for p in whole.top())
+    print(f"✅ Лучший: {whole.top(1)[0]}")
+
+
+def test_recompute_matches_incremental():
+    """Пересчет истории (в том числе из журнала сезона) совпадает с пошаговыми обновлениями"""
+    games = [score_game(players) for players in GameGenerator(seed=18, player_pool=30).games(150)]
+    incremental = SkillRating()
+    ledger = SeasonLedger()
+    for analysis, results in games:
+        incremental.update(results, analysis)
+        ledger.commit_game(results, analysis)
+
+    history = [([r.player.name for r in results], [ROLE_CODES[r.player.role] for r in results],
+                analysis.winner == Team.MAFIA) for analysis, results in games]
+    for recomputed in (SkillRating(), SkillRating()):
+        recomputed.update_game(["Лишний"] * 10, [0] * 6 + [1, 2, 2, 3], True)  # Сбрасывается пересчетом
+        assert recomputed.recompute(history) == 150
+        assert [(p.name, p.rating, p.wins) for p in recomputed.top()] == \
+               [(p.name, p.rating, p.wins) for p in incremental.top()]
+
+    from_ledger = SkillRating()
+    assert from_ledger.recompute_from_ledger(ledger) == 150
+    assert [(p.name, p.rating) for p in from_ledger.top()] == [(p.name, p.rating) for p in incremental.top()]
+
+    # Сильная мафия против слабых мирных - ожидаемая победа мафии выше
+    top, bottom = incremental.top(3), incremental.top()[-7:]
+    names = [p.name for p in bottom] + [p.name for p in top]
+    roles = [r.player.role for r in games[0][1]]
+    roles = sorted(roles, key=lambda role: ROLE_CODES[role] >= 2)
+    assert incremental.expected_mafia_win(names, roles) > 0.5
+
+
+if __name__ == "__main__":
+    test_skill_updates_and_persists()
+    test_recompute_matches_incremental()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
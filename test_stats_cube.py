@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Тесты куба статистики игроков
+"""
+import io
+import os
+import tempfile
+
+from batch_loader import BatchLoader, score_game
+from game_archive import GameArchive, write_archive
+from game_analyzer import GameAnalyzer
+from load_generator import game_payloads
+from models import Role, Team, PHASE_DAY, PHASE_NIGHT
+from player_registry import PlayerRegistry
+from session_manager import SessionManager
+from stats_cube import LAST_DAY, StatsCube
+
+
+def _games(n_games: int, seed: int):
+    source = io.StringIO(b"\n".join(game_payloads(n_games, seed=seed)).decode("utf-8") + "\n")
+    return [g.players for g in BatchLoader(source).games()]
+
+
+def _seats(games):
+    """Все места с исходом - для сверки полным проходом"""
+    for players in games:
+        analysis, results = score_game(players)
+        analyzer = GameAnalyzer(players)
+        for result in results:
+            p = result.player
+            yield p, result.total_points, p.get_team() == analysis.winner, analysis, analyzer.get_sheriff_checks(p)
+
+
+def _scan(games, name, condition):
+    games_count = wins = points = black = red = 0
+    for p, seat_points, won, analysis, (b, r) in _seats(games):
+        if p.name == name and condition(p, won, analysis):
+            games_count += 1
+            wins += won
+            points += seat_points
+            black += b
+            red += r
+    return games_count, wins, points, black, red
+
+
+def _row(stats):
+    return stats.games, stats.wins, stats.points, stats.black_checks, stats.red_checks
+
+
+def test_queries_match_scan():
+    """Срезы куба совпадают с полным проходом по играм"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Куб статистики игроков")
+    print("="*60)
+
+    games = _games(400, seed=21)
+    registry = PlayerRegistry()
+    cube = StatsCube(registry, capacity=4)  # Рост массива при новых игроках
+    session = SessionManager(0, registry=registry, cube=cube)
+    for players in games:
+        analysis, results = score_game(players)
+        session.add_game_results(results, analysis)
+
+    queries = [
+        ({}, lambda p, won, a: True),
+        ({"role": Role.DON}, lambda p, won, a: p.role == Role.DON),
+        ({"role": Role.SHERIFF, "phase": PHASE_DAY, "killed_day": 1},
+         lambda p, won, a: p.role == Role.SHERIFF and p.killed_by_vote() and p.get_kill_day() == 1),
+        ({"team": Team.CIVILIANS, "phase": PHASE_NIGHT, "killed_day": LAST_DAY},
+         lambda p, won, a: p.get_team() == Team.CIVILIANS and p.killed_at_night() and p.get_kill_day() >= 3),
+        ({"won": False, "left_early": True},
+         lambda p, won, a: not won and p.killed_by_vote() and p.get_kill_day() in (1, 2)),
+        ({"clean_win": True}, lambda p, won, a: a.clean_civilian_win),
+        ({"dry_win": True, "alive": True}, lambda p, won, a: a.dry_mafia_win and p.is_alive()),
+        ({"guessing": True, "role": [Role.MAFIA, Role.DON]},
+         lambda p, won, a: p.role in (Role.MAFIA, Role.DON) and a.is_guessing and p.name in a.guessing_players),
+    ]
+    names = [p.name for p in session.get_all_players()[:5]]
+    for filters, condition in queries:
+        for name in names:
+            assert _row(cube.player(name, **filters)) == _scan(games, name, condition), (name, filters)
+
+    # Итоги по всем ролям совпадают с таблицей сессии
+    for stats in session.get_all_players():
+        row = cube.player(stats.name)
+        assert (row.games, row.points) == (stats.games_played, stats.total_points)
+    assert cube.total().games == 400 * 10
+    assert cube.total(role=Role.SHERIFF).games == 400
+    assert cube.games == 400
+
+    dons = cube.top("win_rate", limit=3, min_games=5, role=Role.DON)
+    assert len(dons) == 3 and dons[0].win_rate() >= dons[-1].win_rate()
+    assert all(row.games >= 5 for row in dons)
+    sheriffs = cube.by_player(role=Role.SHERIFF)
+    assert sum(row.games for row in sheriffs) == 400
+    assert cube.player("Никто").games == 0
+    print(f"✅ Лучший Дон по победам: {dons[0].player} ({dons[0].win_rate():.0%} из {dons[0].games})")
+
+
+def test_columns_match_games():
+    """Куб по бинарному архиву совпадает с кубом по результатам игр"""
+    games = _games(300, seed=5)
+    by_games = StatsCube.from_games(games, PlayerRegistry())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.mga")
+        write_archive(path, games)
+        with GameArchive(path) as archive:
+            by_columns = StatsCube.from_archive(archive, PlayerRegistry(), chunk=64)
+
+    assert by_columns.games == by_games.games
+    assert [by_columns.registry.name(pid) for pid in by_columns.player_ids] == \
+        [by_games.registry.name(pid) for pid in by_games.player_ids]
+    assert by_columns.by_player() == by_games.by_player()
+    for filters in ({"role": Role.SHERIFF}, {"won": True, "guessing": True}, {"phase": PHASE_DAY, "killed_day": 2}):
+        assert by_columns.by_player(**filters) == by_games.by_player(**filters)
+
+
+if __name__ == "__main__":
+    test_queries_match_scan()
+    test_columns_match_games()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
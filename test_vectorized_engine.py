@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Сверка векторизованного движка с RatingCalculator
+"""
+from models import Player, Role, Team
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from vectorized_engine import GameColumns, random_columns, score_columns
+
+
+def _score(players):
+    analyzer = GameAnalyzer(players)
+    analysis = analyzer.analyze()
+    return analysis, RatingCalculator(players, analysis, analyzer).calculate_all()
+
+
+def test_random_games_match_calculator():
+    """Баллы и флаги совпадают на случайных играх"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Векторизованный движок = RatingCalculator")
+    print("="*60)
+
+    columns = random_columns(3000, seed=7)
+    scores = score_columns(columns)
+
+    for g in range(len(columns)):
+        analysis, results = _score(columns.to_players(g))
+        assert [r.total_points for r in results] == scores.points[g].tolist()
+        assert [r.rule_mask for r in results] == scores.rule_mask[g].tolist()
+        assert (analysis.winner == Team.MAFIA) == scores.mafia_won[g]
+        assert analysis.is_guessing == scores.is_guessing[g]
+        assert analysis.clean_civilian_win == scores.clean_civilian_win[g]
+        assert analysis.dry_mafia_win == scores.dry_mafia_win[g]
+
+    print(f"✅ Совпадают все {len(columns)} игр")
+
+
+def test_short_roster_from_players():
+    """Неполный стол дополняется пустыми местами"""
+    players = [
+        Player("Иван", Role.CIVILIAN, "0"),
+        Player("Мария", Role.CIVILIAN, "2N"),
+        Player("Петр", Role.SHERIFF, "0", ["Алексей", "Сергей", "Ольга"]),
+        Player("Алексей", Role.DON, "2D"),
+        Player("Сергей", Role.MAFIA, "1D"),
+        Player("Ольга", Role.CIVILIAN, "1N"),
+        Player("Николай", Role.CIVILIAN, "0"),
+    ]
+    scores = score_columns(GameColumns.from_games([players]))
+    _, results = _score(players)
+    assert scores.points[0, :len(players)].tolist() == [r.total_points for r in results]
+    assert scores.points[0, len(players):].tolist() == [0, 0, 0]
+
+
+if __name__ == "__main__":
+    test_random_games_match_calculator()
+    test_short_roster_from_players()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Тесты пересчета «что если»: сверка с полным пересчетом RatingCalculator
+"""
+import gc
+import random
+
+from game_analyzer import GameAnalyzer
+from rating_calculator import RatingCalculator
+from scoring_rules import RuleSetError, default_rules
+from session_manager import SessionManager
+from vectorized_engine import random_columns
+from what_if import WhatIfIndex, apply_delta
+
+
+NAMES = [f"Игрок{i}" for i in range(40)]
+
+
+def _archive(n_games: int, seed: int):
+    """Случайные игры со случайными именами из небольшого клуба"""
+    columns = random_columns(n_games, seed=seed)
+    rng = random.Random(seed)
+    games = []
+    for g in range(len(columns)):
+        players = columns.to_players(g)
+        for p, name in zip(players, rng.sample(NAMES, len(players))):
+            p.name = name
+        games.append(players)
+    return games
+
+
+def _full_standings(games, rules):
+    """Таблица по правилам rules - пересчетом всех игр"""
+    session = SessionManager(len(games))
+    for players in games:
+        analyzer = GameAnalyzer(players)
+        analysis = analyzer.analyze()
+        session.add_game_results(RatingCalculator(players, analysis, analyzer, rules).calculate_all())
+    return [(s.name, s.total_points, s.games_played) for s in session.get_all_players()]
+
+
+def test_matches_full_rescore():
+    """Таблица «что если» совпадает с полным пересчетом"""
+    print("\n" + "="*60)
+    print("ТЕСТ: Пересчет «что если» = полный пересчет")
+    print("="*60)
+
+    games = _archive(400, seed=3)
+    index = WhatIfIndex.from_games(games)
+    base = default_rules()
+    delta = {
+        "points": {"don_alive": 4, "black_checks": 5},
+        "remove": ["guessing_civilians"],
+        "change": {"red_checks": {"when": {"min_red_checks": 2}}},
+        "add": [{"id": "sheriff_two_black", "description": "2 черные проверки", "points": 1,
+                 "roles": ["Шериф"], "when": {"min_black_checks": 2}}],
+    }
+    new = apply_delta(base, delta)
+    result = index.what_if(new, base)
+
+    expected_old = _full_standings(games, base)
+    expected_new = _full_standings(games, new)
+    assert [(r.player, r.old_points) for r in sorted(result.standings(), key=lambda r: r.old_rank)] == \
+        [(name, points) for name, points, _ in expected_old]
+    assert [(r.player, r.new_points, r.games_played) for r in result.standings()] == expected_new
+    assert 0 < result.seats_recomputed < 400 * 10
+
+    changes = result.changes()
+    assert changes and all(c.points_delta or c.rank_delta for c in changes)
+    print(f"✅ {len(changes)} изменений, пересчитано {result.seats_recomputed} мест из 4000")
+
+
+def test_no_change():
+    """Те же правила - ничего не пересчитывается"""
+    games = _archive(50, seed=5)
+    index = WhatIfIndex.from_games(games)
+    result = index.what_if(apply_delta(default_rules(), {}))
+    assert result.seats_recomputed == 0
+    assert result.changes() == []
+
+
+def test_points_not_reused_between_rule_sets():
+    """Баллы по временным наборам правил не путаются (адреса освободившихся объектов переиспользуются)"""
+    games = _archive(100, seed=8)
+    index = WhatIfIndex.from_games(games)
+    for bonus in range(40):
+        rules = apply_delta(default_rules(), {"points": {"don_alive": bonus}})
+        expected = WhatIfIndex.from_games(games).points(rules)
+        assert (index.points(rules) == expected).all(), bonus
+        del rules
+        gc.collect()  # Освободившийся адрес может достаться следующему набору
+
+
+def test_unknown_rule():
+    """Ссылка на несуществующее правило - ошибка"""
+    try:
+        apply_delta(default_rules(), {"points": {"no_such_rule": 1}})
+    except RuleSetError:
+        pass
+    else:
+        raise AssertionError("ожидалась RuleSetError")
+
+
+if __name__ == "__main__":
+    test_matches_full_rescore()
+    test_no_change()
+    test_points_not_reused_between_rule_sets()
+    test_unknown_rule()
+    print("\n" + "="*60)
+    print("ТЕСТЫ ЗАВЕРШЕНЫ")
+    print("="*60 + "\n")
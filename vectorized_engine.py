@@ -0,0 +1,214 @@
+"""
+Векторизованный подсчет рейтинга - оценивает сразу весь архив игр на NumPy
+
+Игры хранятся по колонкам: матрицы (число_игр, места) с кодом роли, днем
+и фазой убийства и числом проверок Шерифа по каждому месту. Победитель,
+чистая победа, победа в сухую и угадайка считаются операциями над
+массивами, баллы мест берутся из той же скомпилированной таблицы правил,
+что и в RatingCalculator.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from models import (
+    Player, Role, ROLE_CODES, ROLES_BY_CODE, NO_ROLE,
+    PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT,
+)
+from scoring_rules import FLAG_BITS, RuleSet, default_rules
+
+SEATS = 10
+
+CIVILIAN = ROLE_CODES[Role.CIVILIAN]
+SHERIFF = ROLE_CODES[Role.SHERIFF]
+MAFIA = ROLE_CODES[Role.MAFIA]
+DON = ROLE_CODES[Role.DON]
+
+
+@dataclass
+class GameColumns:
+    """Колоночное представление набора игр"""
+    role: np.ndarray         # int8 (n, seats): код роли, NO_ROLE - пустое место
+    kill_day: np.ndarray     # int16 (n, seats): день убийства, 0 - жив
+    kill_phase: np.ndarray   # int8 (n, seats): PHASE_*
+    checks: np.ndarray       # int8 (n, seats): сколько раз Шериф проверил место
+
+    def __len__(self) -> int:
+        return self.role.shape[0]
+
+    @classmethod
+    def empty(cls, n_games: int, seats: int = SEATS) -> "GameColumns":
+        """Создать колонки для n_games пустых игр"""
+        return cls(
+            role=np.full((n_games, seats), NO_ROLE, dtype=np.int8),
+            kill_day=np.zeros((n_games, seats), dtype=np.int16),
+            kill_phase=np.zeros((n_games, seats), dtype=np.int8),
+            checks=np.zeros((n_games, seats), dtype=np.int8),
+        )
+
+    @classmethod
+    def from_games(cls, games: Iterable[List[Player]], seats: int = SEATS) -> "GameColumns":
+        """Собрать колонки из списков игроков"""
+        games = list(games)
+        columns = cls.empty(len(games), seats)
+
+        for g, players in enumerate(games):
+            seat_by_name = {p.name: i for i, p in enumerate(players)}
+            for i, p in enumerate(players):
+                columns.role[g, i] = ROLE_CODES[p.role]
+                columns.kill_day[g, i] = p.get_kill_day()
+                columns.kill_phase[g, i] = p.get_kill_phase()
+                if p.role == Role.SHERIFF:
+                    for checked_name in p.checked_players:
+                        seat = seat_by_name.get(checked_name.strip())
+                        if seat is not None:
+                            columns.checks[g, seat] += 1
+
+        return columns
+
+    def to_players(self, game: int, names: Optional[Sequence[str]] = None) -> List[Player]:
+        """Восстановить список игроков одной игры (names - имена по местам, по умолчанию "ИгрокN")"""
+        if names is None:
+            names = [f"Игрок{i + 1}" for i in range(self.role.shape[1])]
+        players = []
+        checked = []
+        for i, code in enumerate(self.role[game]):
+            if code == NO_ROLE:
+                continue
+            phase = int(self.kill_phase[game, i])
+            if phase == PHASE_ALIVE:
+                killed_when = "0"
+            else:
+                killed_when = f"{int(self.kill_day[game, i])}{'D' if phase == PHASE_DAY else 'N'}"
+            players.append(Player(names[i], ROLES_BY_CODE[int(code)], killed_when))
+            checked.extend([names[i]] * int(self.checks[game, i]))
+
+        for p in players:
+            if p.role == Role.SHERIFF:
+                p.checked_players = list(checked)
+        return players
+
+
+@dataclass
+class VectorizedScores:
+    """Результаты векторизованного подсчета"""
+    mafia_won: np.ndarray           # bool (n,)
+    is_guessing: np.ndarray         # bool (n,)
+    clean_civilian_win: np.ndarray  # bool (n,)
+    dry_mafia_win: np.ndarray       # bool (n,)
+    guessing_seats: np.ndarray      # bool (n, seats)
+    points: Optional[np.ndarray]    # int16 (n, seats), None - баллы не считались
+    rule_mask: Optional[np.ndarray] = None  # uint32/uint64 (n, seats): биты сработавших правил
+
+
+@dataclass
+class SeatKeys:
+    """Индексы ячеек таблицы правил и число проверок по местам"""
+    analysis: VectorizedScores    # Анализ игр (points еще не заполнены)
+    present: np.ndarray           # bool (n, seats)
+    key: np.ndarray               # int16 (n, seats): индекс ячейки таблицы
+    black: np.ndarray             # int (n, seats): черные проверки (только у Шерифа)
+    red: np.ndarray               # int (n, seats): красные проверки (только у Шерифа)
+
+
+def seat_keys(columns: GameColumns) -> SeatKeys:
+    """Проанализировать все игры и вычислить индекс ячейки таблицы для каждого места"""
+    role = columns.role
+    day = columns.kill_day
+    phase = columns.kill_phase
+
+    present = role != NO_ROLE
+    mafia = (role == MAFIA) | (role == DON)
+    civilian = present & ~mafia
+    alive = present & (phase == PHASE_ALIVE)
+    voted = present & (phase == PHASE_DAY)
+
+    # Победитель: мафии не осталось → мирные, мирных ≤ мафии → мафия
+    alive_mafia = np.count_nonzero(alive & mafia, axis=1)
+    alive_civilians = np.count_nonzero(alive & civilian, axis=1)
+    mafia_won = (alive_mafia > 0) & (alive_civilians <= alive_mafia)
+
+    # Угадайка: ровно 3 игрока перед последним голосованием
+    last_vote_day = np.where(voted, day, 0).max(axis=1)
+    before_last_vote = alive | (present & ~alive & (day > 0) & (day >= last_vote_day[:, None]))
+    is_guessing = (last_vote_day > 0) & (np.count_nonzero(before_last_vote, axis=1) == 3)
+    guessing_seats = before_last_vote & is_guessing[:, None]
+
+    clean = (~mafia_won
+             & np.all(~mafia | voted, axis=1)
+             & ~np.any(civilian & voted, axis=1))
+    dry = mafia_won & np.all(~mafia | alive, axis=1)
+
+    won = np.where(mafia, mafia_won[:, None], ~mafia_won[:, None])
+    left_early = voted & ((day == 1) | (day == 2))
+
+    # Индекс ячейки скомпилированной таблицы правил для каждого места
+    key = ((np.maximum(role, 0).astype(np.int16) << FLAG_BITS)
+           | (won << 5) | (alive << 4) | (clean[:, None] << 3) | (dry[:, None] << 2)
+           | (guessing_seats << 1) | left_early)
+
+    # Проверки Шерифа
+    is_sheriff = role == SHERIFF
+    black = np.where(is_sheriff, (columns.checks * mafia).sum(axis=1)[:, None], 0)
+    red = np.where(is_sheriff, (columns.checks * civilian).sum(axis=1)[:, None], 0)
+
+    analysis = VectorizedScores(
+        mafia_won=mafia_won,
+        is_guessing=is_guessing,
+        clean_civilian_win=clean,
+        dry_mafia_win=dry,
+        guessing_seats=guessing_seats,
+        points=None,
+    )
+    return SeatKeys(analysis, present, key, black, red)
+
+
+def score_columns(columns: GameColumns, rules: Optional[RuleSet] = None) -> VectorizedScores:
+    """Рассчитать анализ и баллы для всех игр за один проход"""
+    rules = rules or default_rules()
+    seats = seat_keys(columns)
+    present, key = seats.present, seats.key
+
+    totals = np.array([entry.points for entry in rules.table], dtype=np.int16)
+    points = np.where(present, totals[key], 0).astype(np.int16)
+    # Маска правил - как RatingResult.rule_mask
+    mask_type = np.uint32 if len(rules.rules) <= 32 else np.uint64
+    masks = np.array([entry.mask for entry in rules.table], dtype=mask_type)
+    rule_mask = np.where(present, masks[key], 0).astype(mask_type)
+
+    # Проверки Шерифа (начисляются всегда)
+    for bit, rule in enumerate(rules.rules):
+        if not rule.is_check_rule:
+            continue
+        applies = np.array([rule in entry.check_rules for entry in rules.table])
+        fired = (present & applies[key]
+                 & (seats.black >= rule.min_black_checks) & (seats.red >= rule.min_red_checks))
+        points += fired * np.int16(rule.points)
+        if rule.points:
+            rule_mask |= fired * mask_type(1 << bit)
+
+    seats.analysis.points = points
+    seats.analysis.rule_mask = rule_mask
+    return seats.analysis
+
+
+def random_columns(n_games: int, seed: int = 0) -> GameColumns:
+    """
+    Случайные игры для бенчмарков и сверки с RatingCalculator
+
+    Составы корректные (1 Шериф, 1 Дон, 2 Мафии), моменты убийства и
+    проверки - случайные, чтобы покрыть все ветки правил.
+    """
+    rng = np.random.default_rng(seed)
+    base = np.array([CIVILIAN] * 6 + [SHERIFF, MAFIA, MAFIA, DON], dtype=np.int8)
+    columns = GameColumns.empty(n_games)
+
+    columns.role[:] = rng.permuted(np.broadcast_to(base, (n_games, SEATS)), axis=1)
+    columns.kill_phase[:] = rng.choice(
+        np.array([PHASE_ALIVE, PHASE_DAY, PHASE_NIGHT], dtype=np.int8),
+        size=(n_games, SEATS), p=[0.4, 0.3, 0.3])
+    columns.kill_day[:] = np.where(columns.kill_phase != PHASE_ALIVE,
+                                   rng.integers(1, 5, size=(n_games, SEATS)), 0)
+    columns.checks[:] = rng.random((n_games, SEATS)) < 0.3
+    return columns
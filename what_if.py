@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+«Что если» - пересчет архива по измененным правилам
+
+Баллы места зависят только от ячейки таблицы правил (роль и флаги места) и
+числа черных/красных проверок Шерифа. Индекс архива один раз запоминает,
+сколько раз каждый игрок попадал в каждую такую комбинацию («признак»
+места). Изменение правил меняет баллы лишь части признаков, поэтому
+пересчитываются только места с этими признаками:
+
+    новые баллы игрока = старые + Σ (изменение баллов признака × число мест)
+
+Изменение правил задается так же, как файл правил, только отличиями:
+
+    {"points": {"don_alive": 2},            - новые баллы правила
+     "remove": ["guessing_civilians"],       - убрать правило
+     "change": {"dry_win": {"roles": ["Мафия"]}},  - поменять поля правила
+     "add": [{"id": ..., "description": ..., "points": ..., "roles": [...], "when": {...}}]}
+
+    python3 what_if.py games.jsonl --delta '{"points": {"don_alive": 2}}'
+"""
+import argparse
+import json
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Player
+from scoring_rules import RuleSet, RuleSetError, TABLE_SIZE, default_rules, load_rules
+from vectorized_engine import GameColumns, seat_keys
+
+
+MAX_CHECKS = 10  # Больше проверок за игру не бывает: счетчики выше - то же, что 10
+_CHECK_BASE = MAX_CHECKS + 1
+FEATURES = TABLE_SIZE * _CHECK_BASE * _CHECK_BASE
+
+
+def feature_points(rules: RuleSet) -> np.ndarray:
+    """Баллы места для каждого признака (ячейка таблицы, черные, красные проверки)"""
+    checks = np.arange(_CHECK_BASE)
+    points = np.array([entry.points for entry in rules.table], dtype=np.int32)
+    points = np.broadcast_to(points[:, None, None], (TABLE_SIZE, _CHECK_BASE, _CHECK_BASE)).copy()
+    for rule in rules.rules:
+        if not rule.is_check_rule:
+            continue
+        applies = np.array([rule in entry.check_rules for entry in rules.table])
+        passed = (checks[:, None] >= rule.min_black_checks) & (checks[None, :] >= rule.min_red_checks)
+        points += (applies[:, None, None] & passed[None, :, :]) * rule.points
+    return points.reshape(FEATURES)
+
+
+def apply_delta(rules: RuleSet, delta: dict) -> RuleSet:
+    """
+    Правила после изменения delta
+
+    Raises:
+        RuleSetError: если delta ссылается на несуществующее правило
+    """
+    data = rules.to_dict()
+    by_id = {raw["id"]: raw for raw in data["rules"]}
+
+    def existing(rule_id: str) -> dict:
+        if rule_id not in by_id:
+            raise RuleSetError(f"нет правила {rule_id}")
+        return by_id[rule_id]
+
+    for rule_id, points in delta.get("points", {}).items():
+        existing(rule_id)["points"] = int(points)
+    for rule_id, fields in delta.get("change", {}).items():
+        existing(rule_id).update(fields)
+    removed = set(delta.get("remove", []))
+    for rule_id in removed:
+        existing(rule_id)
+
+    data["rules"] = [raw for raw in data["rules"] if raw["id"] not in removed] + list(delta.get("add", []))
+    data["version"] = f"{data['version']}+what-if"
+    return RuleSet.from_dict(data)
+
+
+@dataclass
+class StandingChange:
+    """Изменение строки таблицы"""
+    player: str
+    games_played: int
+    old_points: int
+    new_points: int
+    old_rank: int
+    new_rank: int
+
+    @property
+    def points_delta(self) -> int:
+        return self.new_points - self.old_points
+
+    @property
+    def rank_delta(self) -> int:
+        """На сколько мест поднялся игрок (отрицательное - опустился)"""
+        return self.old_rank - self.new_rank
+
+
+class WhatIfResult:
+    """Таблица архива по текущим и по измененным правилам"""
+
+    def __init__(self, names: Sequence[str], games: np.ndarray, first_seen: np.ndarray,
+                 old_points: np.ndarray, new_points: np.ndarray, seats_recomputed: int, features_changed: int):
+        self.names = names
+        self.games = games
+        self.old_points = old_points
+        self.new_points = new_points
+        self.seats_recomputed = seats_recomputed
+        self.features_changed = features_changed
+        self.old_rank = _ranks(old_points, games, first_seen)
+        self.new_rank = _ranks(new_points, games, first_seen)
+
+    def _row(self, i: int) -> StandingChange:
+        return StandingChange(self.names[i], int(self.games[i]), int(self.old_points[i]),
+                              int(self.new_points[i]), int(self.old_rank[i]), int(self.new_rank[i]))
+
+    def standings(self, limit: Optional[int] = None) -> List[StandingChange]:
+        """Таблица по новым правилам (первые limit мест)"""
+        order = np.argsort(self.new_rank)
+        if limit is not None:
+            order = order[:limit]
+        return [self._row(i) for i in order]
+
+    def changes(self) -> List[StandingChange]:
+        """Игроки, у которых изменились баллы или место - по новой таблице"""
+        changed = np.flatnonzero((self.old_points != self.new_points) | (self.old_rank != self.new_rank))
+        return [self._row(i) for i in changed[np.argsort(self.new_rank[changed])]]
+
+
+def _ranks(points: np.ndarray, games: np.ndarray, first_seen: np.ndarray) -> np.ndarray:
+    """Места (с 1): по баллам, затем по числу игр, при равенстве - кто раньше появился"""
+    order = np.lexsort((first_seen, -games, -points))
+    ranks = np.empty(len(points), dtype=np.int64)
+    ranks[order] = np.arange(1, len(points) + 1)
+    return ranks
+
+
+class WhatIfIndex:
+    """Признаки мест архива по игрокам - для быстрого пересчета по новым правилам"""
+
+    def __init__(self, names: List[str], games: np.ndarray, first_seen: np.ndarray,
+                 pair_player: np.ndarray, pair_feature: np.ndarray, pair_count: np.ndarray, games_total: int):
+        self.names = names
+        self.games = games
+        self.first_seen = first_seen
+        self.games_total = games_total
+        # Пары (игрок, признак) с числом мест, упорядоченные по признаку
+        order = np.argsort(pair_feature, kind="stable")
+        self.pair_player = pair_player[order]
+        self.pair_feature = pair_feature[order]
+        self.pair_count = pair_count[order]
+        self.feature_offsets = np.searchsorted(self.pair_feature, np.arange(FEATURES + 1))
+        # Баллы по последним правилам; ссылка на сами правила (а не id) не дает
+        # спутать их с новым набором, созданным по освободившемуся адресу
+        self._points_cache: Optional[Tuple[RuleSet, np.ndarray]] = None
+
+    @classmethod
+    def from_columns(cls, columns: GameColumns, player_ids: np.ndarray, names: Sequence[str]) -> "WhatIfIndex":
+        """
+        Построить индекс по колонкам архива
+
+        Args:
+            player_ids: int (n, seats) - номер игрока места в names
+        """
+        seats = seat_keys(columns)
+        present = seats.present
+        feature = (seats.key.astype(np.int64) * _CHECK_BASE + np.minimum(seats.black, MAX_CHECKS)) * _CHECK_BASE \
+            + np.minimum(seats.red, MAX_CHECKS)
+        pids = player_ids[present]
+        features = feature[present]
+
+        # Плотные номера игроков в порядке появления - как в SessionManager
+        unique, first_index, local = np.unique(pids, return_index=True, return_inverse=True)
+        appearance = np.argsort(first_index, kind="stable")
+        remap = np.empty(len(unique), dtype=np.int64)
+        remap[appearance] = np.arange(len(unique))
+        local = remap[local]
+
+        codes, counts = np.unique(local * FEATURES + features, return_counts=True)
+        return cls(
+            names=[names[int(pid)] for pid in unique[appearance]],
+            games=np.bincount(local, minlength=len(unique)),
+            first_seen=np.arange(len(unique)),
+            pair_player=codes // FEATURES,
+            pair_feature=codes % FEATURES,
+            pair_count=counts,
+            games_total=len(columns),
+        )
+
+    @classmethod
+    def from_games(cls, games: Iterable[List[Player]]) -> "WhatIfIndex":
+        """Построить индекс по играм (спискам игроков)"""
+        games = list(games)
+        columns = GameColumns.from_games(games)
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+        player_ids = np.full(columns.role.shape, -1, dtype=np.int64)
+        for g, players in enumerate(games):
+            for seat, p in enumerate(players):
+                pid = ids.get(p.name)
+                if pid is None:
+                    pid = ids[p.name] = len(names)
+                    names.append(p.name)
+                player_ids[g, seat] = pid
+        return cls.from_columns(columns, player_ids, names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def points(self, rules: Optional[RuleSet] = None) -> np.ndarray:
+        """Баллы всех игроков по правилам rules (полный пересчет по индексу)"""
+        rules = rules or default_rules()
+        if self._points_cache is not None and self._points_cache[0] is rules:
+            return self._points_cache[1]
+        weights = feature_points(rules)[self.pair_feature] * self.pair_count
+        points = np.bincount(self.pair_player, weights=weights, minlength=len(self.names)).astype(np.int64)
+        self._points_cache = (rules, points)
+        return points
+
+    def what_if(self, new_rules: RuleSet, base_rules: Optional[RuleSet] = None) -> WhatIfResult:
+        """Таблица по новым правилам: пересчитываются только места с изменившимися признаками"""
+        base_rules = base_rules or default_rules()
+        old_points = self.points(base_rules)
+        delta = feature_points(new_rules) - feature_points(base_rules)
+        changed = np.flatnonzero(delta)
+
+        offsets = self.feature_offsets
+        rows = np.concatenate([np.arange(offsets[f], offsets[f + 1]) for f in changed]) \
+            if len(changed) else np.empty(0, dtype=np.int64)
+        counts = self.pair_count[rows]
+        new_points = old_points + np.bincount(self.pair_player[rows],
+                                              weights=delta[self.pair_feature[rows]] * counts,
+                                              minlength=len(self.names)).astype(np.int64)
+        return WhatIfResult(self.names, self.games, self.first_seen, old_points, new_points,
+                            int(counts.sum()), int(len(changed)))
+
+
+def main(argv=None):
+    from batch_loader import BatchLoader
+    from game_archive import GameArchive, is_archive
+
+    parser = argparse.ArgumentParser(description="Пересчет архива по измененным правилам")
+    parser.add_argument("archive", help="архив игр (JSONL, CSV или бинарный архив)")
+    parser.add_argument("--delta", required=True,
+                        help="изменение правил: JSON-строка или файл")
+    parser.add_argument("--rules", help="текущие правила (по умолчанию scoring_rules.json)")
+    parser.add_argument("--top", type=int, default=20, help="сколько строк изменений показать")
+    args = parser.parse_args(argv)
+
+    if args.delta.lstrip().startswith("{"):
+        delta = json.loads(args.delta)
+    else:
+        with open(args.delta, encoding="utf-8") as f:
+            delta = json.load(f)
+    base = load_rules(args.rules) if args.rules else default_rules()
+    new = apply_delta(base, delta)
+
+    if is_archive(args.archive):
+        with GameArchive(args.archive) as archive:
+            index = WhatIfIndex.from_columns(archive.columns(), archive.player_ids(), archive.names)
+    else:
+        with open(args.archive, encoding="utf-8", newline="") as f:
+            loader = BatchLoader(f, BatchLoader.detect_format(args.archive))
+            index = WhatIfIndex.from_games(game.players for game in loader.games())
+
+    result = index.what_if(new, base)
+    changes = result.changes()
+    print(f"Игр: {index.games_total}, игроков: {len(index)}")
+    print(f"Изменилось признаков мест: {result.features_changed}, пересчитано мест: {result.seats_recomputed}")
+    print(f"Изменилась строка у {len(changes)} игроков")
+    print()
+    print(f"{'Место':>5} {'Было':>5} {'Игрок':<20} {'Игры':>5} {'Баллы':>7} {'Было':>7} {'Изм.':>6}")
+    print("-" * 60)
+    for row in changes[:args.top]:
+        print(f"{row.new_rank:>5} {row.old_rank:>5} {row.player:<20} {row.games_played:>5} "
+              f"{row.new_points:>7} {row.old_points:>7} {row.points_delta:>+6}")
+
+
+if __name__ == "__main__":
+    main()